@@ -0,0 +1,57 @@
+from typing import AsyncGenerator, AsyncIterator, Type
+from uuid import UUID
+
+from neomodel import AsyncStructuredNode
+from strawberry import type, subscription, Info
+
+from src.app.activity.activity_service import ActivityService, get_activity_service
+from src.app.arg_framework.claim.claim import Claim
+from src.app.arg_framework.claim.claim_schema import ClaimType
+from src.app.arg_framework.duplicates.duplicate_loader import DuplicateLoader
+from src.app.arg_framework.evidence.evidence import Evidence
+from src.app.arg_framework.evidence.evidence_schema import EvidenceType
+from src.app.arg_framework.premise.premise import Premise
+from src.app.arg_framework.premise.premise_schema import PremiseType
+from src.app.arg_framework.question.question import Question
+from src.app.arg_framework.question.question_schema import QuestionType
+from src.app.townsquare.townsquare_repository import TownsquareRepository
+from src.infra.db.identity_map import begin_identity_map
+from src.infra.db.relationship_loader import RelationshipLoader
+
+activity_service: ActivityService = get_activity_service()
+townsquare_repository: TownsquareRepository = TownsquareRepository.get_repository()
+
+
+async def _follow(info: Info, townsquare_id: UUID,
+                  node_class: Type[AsyncStructuredNode]) -> AsyncIterator[AsyncStructuredNode]:
+    await townsquare_repository.get(townsquare_id)
+
+    async for node in activity_service.follow(townsquare_id, node_class):
+        # A subscription outlives a request: every event resolves its nested fields with fresh request-scoped caches
+        begin_identity_map()
+        info.context.relationship_loader = RelationshipLoader()
+        info.context.duplicate_loader = DuplicateLoader()
+        yield node
+
+
+@type
+class Subscription:
+    @subscription
+    async def new_questions(self, info: Info, townsquare_id: UUID) -> AsyncGenerator[QuestionType, None]:
+        async for question_node in _follow(info, townsquare_id, Question):
+            yield QuestionType.from_node(question_node)
+
+    @subscription
+    async def new_claims(self, info: Info, townsquare_id: UUID) -> AsyncGenerator[ClaimType, None]:
+        async for claim_node in _follow(info, townsquare_id, Claim):
+            yield ClaimType.from_node(claim_node)
+
+    @subscription
+    async def new_premises(self, info: Info, townsquare_id: UUID) -> AsyncGenerator[PremiseType, None]:
+        async for premise_node in _follow(info, townsquare_id, Premise):
+            yield PremiseType.from_node(premise_node)
+
+    @subscription
+    async def new_evidence(self, info: Info, townsquare_id: UUID) -> AsyncGenerator[EvidenceType, None]:
+        async for evidence_node in _follow(info, townsquare_id, Evidence):
+            yield EvidenceType.from_node(evidence_node)
@@ -0,0 +1,19 @@
+from typing import List
+
+from neomodel import adb, AsyncStructuredNode
+
+from src.app.townsquare.townsquare_scope import townsquare_ids
+
+
+class ActivityRepository:
+    @staticmethod
+    async def get_townsquare_ids(node: AsyncStructuredNode) -> List[str]:
+        label: str = type(node).__label__
+        results, meta = await adb.cypher_query(f"MATCH (n:{label} {{uid: $uid}}) "
+                                               f"UNWIND {townsquare_ids(label)} AS townsquare_id "
+                                               f"RETURN DISTINCT townsquare_id", {"uid": node.uid})
+        return [row[0] for row in results]
+
+
+def get_activity_repository() -> ActivityRepository:
+    return ActivityRepository()
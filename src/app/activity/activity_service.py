@@ -0,0 +1,45 @@
+import logging
+from typing import AsyncIterator, List, Type
+from uuid import UUID
+
+from neomodel import AsyncStructuredNode
+
+from src.app.activity.activity_repository import ActivityRepository, get_activity_repository
+from src.infra.events.event_broker import EventBroker, get_event_broker
+
+
+def activity_topic(townsquare_id: UUID | str, node_class: Type[AsyncStructuredNode]) -> str:
+    townsquare_uid: str = townsquare_id.hex if isinstance(townsquare_id, UUID) else townsquare_id
+    return f"townsquare:{townsquare_uid}:{node_class.__label__}"
+
+
+class ActivityService:
+    def __init__(self, activity_repository: ActivityRepository, event_broker: EventBroker):
+        self.activity_repository: ActivityRepository = activity_repository
+        self.event_broker: EventBroker = event_broker
+
+    async def publish_created(self, node: AsyncStructuredNode) -> None:
+        """
+        Announce a committed node to the subscribers of every Townsquare it belongs to. Failures are logged, the
+        write that created the node has already succeeded.
+        """
+        if not self.event_broker.subscriber_count():
+            return
+
+        try:
+            townsquare_ids: List[str] = await self.activity_repository.get_townsquare_ids(node)
+            for townsquare_id in townsquare_ids:
+                self.event_broker.publish(activity_topic(townsquare_id, type(node)), node)
+        except Exception as e:
+            logging.error(f"Error publishing the creation of {type(node).__name__} '{node.uid}': {str(e)}")
+
+    async def follow(self, townsquare_id: UUID,
+                     node_class: Type[AsyncStructuredNode]) -> AsyncIterator[AsyncStructuredNode]:
+        """The nodes of a class created in a Townsquare from now on, until the consumer stops iterating"""
+        async with self.event_broker.subscribe(activity_topic(townsquare_id, node_class)) as events:
+            async for node in events:
+                yield node
+
+
+def get_activity_service() -> ActivityService:
+    return ActivityService(get_activity_repository(), get_event_broker())
@@ -0,0 +1,345 @@
+import logging
+from dataclasses import dataclass, field
+from typing import Iterable
+
+from src.app.arg_framework.acceptability.acceptability_label import AcceptabilityLabel, DETERMINED_LABELS
+
+IN, OUT, UNDEC = AcceptabilityLabel.IN, AcceptabilityLabel.OUT, AcceptabilityLabel.UNDEC
+
+# Bounds of the exact preferred semantics, beyond them the grounded labels are used. MAX_SEARCH_STEPS caps the
+# subsets visited per component, which keeps a component in the low milliseconds whatever its shape.
+MAX_SCC_SIZE: int = 16
+MAX_LABELLINGS: int = 64
+MAX_SEARCH_STEPS: int = 20_000
+
+DEFAULT_BASE_SCORE: float = 0.5
+SCORE_TOLERANCE: float = 1e-6
+MAX_SCORE_ITERATIONS: int = 100
+
+
+@dataclass
+class Acceptability:
+    grounded: AcceptabilityLabel | None
+    preferred: AcceptabilityLabel | None
+    score: float | None
+
+
+@dataclass
+class ArgumentGraph:
+    """
+    The claims to (re)evaluate and the stored acceptability of the claims outside of them that attack or support them.
+
+    The evaluated claims have to be closed under attack and support: every claim they attack or support is evaluated
+    as well. The context must hold a determined grounded and preferred label and a score for each outside attacker and
+    a score for each outside supporter.
+    """
+    attackers: dict[str, set[str]] = field(default_factory=dict)
+    supporters: dict[str, set[str]] = field(default_factory=dict)
+    base_scores: dict[str, float] = field(default_factory=dict)
+    context: dict[str, Acceptability] = field(default_factory=dict)
+
+    def add_claim(self, uid: str, base_score: float = DEFAULT_BASE_SCORE) -> None:
+        self.attackers.setdefault(uid, set())
+        self.supporters.setdefault(uid, set())
+        self.base_scores[uid] = base_score
+
+    @property
+    def claims(self) -> list[str]:
+        return list(self.attackers)
+
+
+def base_score(premises: Iterable[tuple[int, int]]) -> float:
+    """
+    Intrinsic strength of a claim: the mean strength of its premises, each estimated from the number of supporting and
+    countering evidence with Laplace smoothing
+
+    :param premises: (supporting evidence, countering evidence) per premise
+    """
+    strengths: list[float] = [(1 + supporting) / (2 + supporting + countering) for supporting, countering in premises]
+    return sum(strengths) / len(strengths) if strengths else DEFAULT_BASE_SCORE
+
+
+def strongly_connected_components(graph: ArgumentGraph, supports: bool = True) -> list[list[str]]:
+    """
+    Tarjan's algorithm on the edges between the evaluated claims
+
+    :param supports: follow support edges as well as attack edges. The labels only depend on attacks, so they are
+                     decomposed along the finer attack-only components, the scores need both.
+    :return: the components in topological order, attackers (and supporters) before the claims they target
+    """
+    successors: dict[str, list[str]] = {claim: [] for claim in graph.attackers}
+    for claim in graph.attackers:
+        for source in graph.attackers[claim] | graph.supporters[claim] if supports else graph.attackers[claim]:
+            if source in successors:
+                successors[source].append(claim)
+
+    index: dict[str, int] = {}
+    lowlink: dict[str, int] = {}
+    stack: list[str] = []
+    on_stack: set[str] = set()
+    components: list[list[str]] = []
+
+    for root in successors:
+        if root in index:
+            continue
+
+        index[root] = lowlink[root] = len(index)
+        stack.append(root)
+        on_stack.add(root)
+        work: list[tuple[str, Iterable[str]]] = [(root, iter(successors[root]))]
+
+        while work:
+            node, children = work[-1]
+            for child in children:
+                if child not in index:
+                    index[child] = lowlink[child] = len(index)
+                    stack.append(child)
+                    on_stack.add(child)
+                    work.append((child, iter(successors[child])))
+                    break
+                if child in on_stack:
+                    lowlink[node] = min(lowlink[node], index[child])
+            else:
+                work.pop()
+                if work:
+                    parent: str = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+                if lowlink[node] == index[node]:
+                    component: list[str] = []
+                    while True:
+                        member: str = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(component)
+
+    components.reverse()
+    return components
+
+
+def grounded_labels(graph: ArgumentGraph, components: list[list[str]]) -> dict[str, AcceptabilityLabel]:
+    """The grounded labelling, computed component by component since upstream labels are final"""
+    labels: dict[str, AcceptabilityLabel] = {}
+
+    def label(claim: str) -> AcceptabilityLabel | None:
+        return labels[claim] if claim in labels else (
+            graph.context[claim].grounded if claim in graph.context else None)
+
+    for component in components:
+        undecided: set[str] = set(component)
+        changed: bool = True
+
+        while changed:
+            changed = False
+            for claim in list(undecided):
+                attackers: set[str] = graph.attackers[claim]
+                if any(label(attacker) == IN for attacker in attackers):
+                    labels[claim] = OUT
+                elif all(label(attacker) == OUT for attacker in attackers):
+                    labels[claim] = IN
+                else:
+                    continue
+                undecided.discard(claim)
+                changed = True
+
+        for claim in undecided:
+            labels[claim] = UNDEC
+
+    return labels
+
+
+def _conditioned_preferred(graph: ArgumentGraph, component: list[str],
+                           external: dict[str, AcceptabilityLabel]) -> list[dict[str, AcceptabilityLabel]] | None:
+    """
+    Preferred labellings of one strongly connected component given fixed labels of its outside attackers
+
+    :return: the labellings or None if the component is too large to enumerate or exceeds MAX_SEARCH_STEPS
+    """
+    members: set[str] = set(component)
+    forced_out: set[str] = {
+        claim for claim in component if any(external.get(attacker) == IN for attacker in graph.attackers[claim])
+    }
+    # Claims attacked from outside by anything but OUT claims can never be IN
+    eligible: list[str] = [
+        claim for claim in component
+        if claim not in forced_out and all(external[attacker] == OUT
+                                           for attacker in graph.attackers[claim] - members)
+    ]
+    if len(eligible) > MAX_SCC_SIZE:
+        return None
+
+    internal_attackers: dict[str, set[str]] = {claim: graph.attackers[claim] & members for claim in component}
+    attacked_by: dict[str, set[str]] = {claim: set() for claim in component}
+    for claim, attackers in internal_attackers.items():
+        for attacker in attackers:
+            attacked_by[attacker].add(claim)
+
+    def conflicts(claim: str, chosen: list[str]) -> bool:
+        return claim in internal_attackers[claim] or any(
+            claim in internal_attackers[other] or other in internal_attackers[claim] for other in chosen)
+
+    def admissible(chosen: list[str]) -> bool:
+        defeated: set[str] = forced_out.union(*(attacked_by[claim] for claim in chosen))
+        return all(internal_attackers[claim] <= defeated for claim in chosen)
+
+    # Enumerate the conflict-free subsets of the eligible claims and keep the maximal admissible ones
+    admissible_sets: list[frozenset[str]] = []
+    steps: int = 0
+
+    def search(position: int, chosen: list[str]) -> bool:
+        """:return: False once the step budget is spent"""
+        nonlocal steps
+        steps += 1
+        if steps > MAX_SEARCH_STEPS:
+            return False
+        if position == len(eligible):
+            if admissible(chosen):
+                admissible_sets.append(frozenset(chosen))
+            return True
+        claim: str = eligible[position]
+        if not conflicts(claim, chosen) and not search(position + 1, chosen + [claim]):
+            return False
+        return search(position + 1, chosen)
+
+    if not search(0, []):
+        return None
+
+    preferred: list[frozenset[str]] = []
+    for candidate in sorted(admissible_sets, key=len, reverse=True):
+        if not any(candidate <= extension for extension in preferred):
+            preferred.append(candidate)
+
+    labellings: list[dict[str, AcceptabilityLabel]] = []
+    for extension in preferred:
+        defeated: set[str] = forced_out.union(*(attacked_by[claim] for claim in extension))
+        labellings.append({claim: IN if claim in extension else OUT if claim in defeated else UNDEC
+                           for claim in component})
+    return labellings
+
+
+def preferred_labels(graph: ArgumentGraph, components: list[list[str]],
+                     grounded: dict[str, AcceptabilityLabel]) -> dict[str, AcceptabilityLabel]:
+    """
+    Skeptical and credulous status under preferred semantics.
+
+    Preferred semantics is decomposable along strongly connected components: the preferred labellings are the
+    combinations of the preferred labellings of each component conditioned on the labels of its outside attackers.
+    The combinations are expanded in topological order; past MAX_LABELLINGS combinations, MAX_SCC_SIZE eligible claims
+    in a component or MAX_SEARCH_STEPS for one the remaining components fall back to their grounded labels.
+
+    :param components: the attack-only components, see strongly_connected_components
+    """
+    partials: list[dict[str, AcceptabilityLabel]] = [{}]
+    evaluated: list[str] = []
+    remaining: int = 0
+
+    for position, component in enumerate(components):
+        members: set[str] = set(component)
+        outside: list[str] = sorted({attacker for claim in component for attacker in graph.attackers[claim] - members})
+        cache: dict[tuple, list[dict[str, AcceptabilityLabel]] | None] = {}
+        expanded: list[dict[str, AcceptabilityLabel]] | None = []
+
+        for partial in partials:
+            external: dict[str, AcceptabilityLabel] = {
+                attacker: partial[attacker] if attacker in partial else graph.context[attacker].preferred
+                for attacker in outside
+            }
+            key: tuple = tuple(external[attacker] for attacker in outside)
+            if key not in cache:
+                cache[key] = _conditioned_preferred(graph, component, external)
+
+            labellings: list[dict[str, AcceptabilityLabel]] | None = cache[key]
+            if labellings is None:
+                expanded = None
+                break
+            if len(labellings) == 1:
+                partial.update(labellings[0])
+                expanded.append(partial)
+            else:
+                expanded.extend({**partial, **labelling} for labelling in labellings)
+
+        if expanded is None or len(expanded) > MAX_LABELLINGS:
+            logging.warning(f"Preferred semantics too expensive for {len(component)} claims, "
+                            f"using grounded labels for the remaining {len(components) - position} components")
+            remaining = position
+            break
+
+        partials = expanded
+        evaluated.extend(component)
+        remaining = position + 1
+
+    labels: dict[str, AcceptabilityLabel] = {}
+    for claim in evaluated:
+        claim_labels: set[AcceptabilityLabel] = {partial[claim] for partial in partials}
+        if len(claim_labels) == 1:
+            labels[claim] = claim_labels.pop()
+        else:
+            labels[claim] = AcceptabilityLabel.CREDULOUS if IN in claim_labels else AcceptabilityLabel.UNDETERMINED
+
+    for component in components[remaining:]:
+        for claim in component:
+            labels[claim] = grounded[claim]
+
+    return labels
+
+
+def _aggregate(strengths: list[float]) -> float:
+    product: float = 1.0
+    for strength in strengths:
+        product *= 1.0 - strength
+    return 1.0 - product
+
+
+def support_scores(graph: ArgumentGraph, components: list[list[str]]) -> dict[str, float]:
+    """
+    Gradual acceptability with DF-QuAD: attackers lower and supporters raise the base score of a claim. Cyclic
+    components are iterated to a fixed point.
+    """
+    scores: dict[str, float] = {}
+
+    def score(claim: str) -> float:
+        if claim in scores:
+            return scores[claim]
+        stored: Acceptability | None = graph.context.get(claim)
+        return stored.score if stored and stored.score is not None else DEFAULT_BASE_SCORE
+
+    for component in components:
+        for claim in component:
+            scores[claim] = graph.base_scores[claim]
+
+        for _ in range(MAX_SCORE_ITERATIONS):
+            delta: float = 0.0
+            for claim in component:
+                base: float = graph.base_scores[claim]
+                attack: float = _aggregate([score(attacker) for attacker in graph.attackers[claim]])
+                support: float = _aggregate([score(supporter) for supporter in graph.supporters[claim]])
+
+                if attack >= support:
+                    updated: float = base - base * (attack - support)
+                else:
+                    updated = base + (1.0 - base) * (support - attack)
+
+                delta = max(delta, abs(updated - scores[claim]))
+                scores[claim] = updated
+            if delta < SCORE_TOLERANCE:
+                break
+
+    return scores
+
+
+def evaluate(graph: ArgumentGraph) -> dict[str, Acceptability]:
+    """CPU-bound for large regions, run it off the event loop"""
+    attack_components: list[list[str]] = strongly_connected_components(graph, supports=False)
+    grounded: dict[str, AcceptabilityLabel] = grounded_labels(graph, attack_components)
+    preferred: dict[str, AcceptabilityLabel] = preferred_labels(graph, attack_components, grounded)
+    scores: dict[str, float] = support_scores(graph, strongly_connected_components(graph))
+
+    return {claim: Acceptability(grounded=grounded[claim], preferred=preferred[claim], score=scores[claim])
+            for claim in graph.claims}
+
+
+def is_determined(acceptability: Acceptability | None) -> bool:
+    """Whether a stored acceptability can serve as fixed context for the claims it attacks"""
+    return (acceptability is not None and acceptability.grounded in DETERMINED_LABELS
+            and acceptability.preferred in DETERMINED_LABELS and acceptability.score is not None)
@@ -0,0 +1,19 @@
+from enum import Enum
+
+from strawberry import enum
+
+
+class AcceptabilityLabel(Enum):
+    IN = "IN"
+    OUT = "OUT"
+    UNDEC = "UNDEC"
+    # Preferred semantics only: IN in some but not all preferred labellings
+    CREDULOUS = "CREDULOUS"
+    # Preferred semantics only: never IN, but OUT or UNDEC depending on the preferred labelling
+    UNDETERMINED = "UNDETERMINED"
+
+
+DETERMINED_LABELS: frozenset[AcceptabilityLabel] = frozenset(
+    {AcceptabilityLabel.IN, AcceptabilityLabel.OUT, AcceptabilityLabel.UNDEC})
+
+AcceptabilityLabelSchema = enum(AcceptabilityLabel)
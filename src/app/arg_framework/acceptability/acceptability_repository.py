@@ -0,0 +1,118 @@
+from typing import Iterable, List
+from uuid import UUID
+
+from neomodel import adb
+
+from src.app.arg_framework.acceptability.acceptability import (Acceptability, ArgumentGraph, base_score,
+                                                               is_determined)
+from src.app.arg_framework.acceptability.acceptability_label import AcceptabilityLabel
+from src.infra.db.graph_repository_interface import IGraphRepository
+
+
+def _label(value: str | None) -> AcceptabilityLabel | None:
+    return AcceptabilityLabel(value) if value else None
+
+
+class AcceptabilityRepository:
+    async def load_region(self, claim_ids: Iterable[UUID | str]) -> ArgumentGraph:
+        """
+        Load the claims whose acceptability depends on the given claims, that is everything downstream of them along
+        ATTACKS and SUPPORTS, together with the stored acceptability of the claims attacking or supporting the region.
+
+        Outside claims without a usable stored acceptability (new or never evaluated) are pulled into the region, with
+        their own downstream closure, until the whole context is determined.
+        """
+        seeds: set[str] = {claim_id.hex if isinstance(claim_id, UUID) else claim_id for claim_id in claim_ids}
+        graph: ArgumentGraph = ArgumentGraph()
+
+        while seeds:
+            region: set[str] = await self._downstream(seeds) - set(graph.attackers)
+            seeds = set()
+
+            for uid, attackers, supporters, premises in await self._fetch(region):
+                graph.add_claim(uid, base_score(premises))
+
+                for attacker, grounded, preferred, score in attackers:
+                    graph.attackers[uid].add(attacker)
+                    graph.context[attacker] = Acceptability(_label(grounded), _label(preferred), score)
+                for supporter, grounded, preferred, score in supporters:
+                    graph.supporters[uid].add(supporter)
+                    graph.context[supporter] = Acceptability(_label(grounded), _label(preferred), score)
+
+            for claim in graph.attackers:
+                seeds.update(attacker for attacker in graph.attackers[claim]
+                             if attacker not in graph.attackers and not is_determined(graph.context[attacker]))
+                seeds.update(supporter for supporter in graph.supporters[claim]
+                             if supporter not in graph.attackers and graph.context[supporter].score is None)
+
+        for claim in graph.attackers:
+            graph.context.pop(claim, None)
+        return graph
+
+    @staticmethod
+    async def _downstream(seeds: set[str]) -> set[str]:
+        """Breadth-first closure of the existing seed claims along ATTACKS and SUPPORTS, one query per frontier"""
+        results, meta = await adb.cypher_query("MATCH (c:Claim) WHERE c.uid IN $uids RETURN c.uid",
+                                               {"uids": list(seeds)})
+        closure: set[str] = {row[0] for row in results}
+        frontier: set[str] = set(closure)
+
+        while frontier:
+            results, meta = await adb.cypher_query(
+                "MATCH (c:Claim)-[:ATTACKS|SUPPORTS]->(d:Claim) WHERE c.uid IN $uids RETURN DISTINCT d.uid",
+                {"uids": list(frontier)})
+            frontier = {row[0] for row in results} - closure
+            closure |= frontier
+
+        return closure
+
+    @staticmethod
+    async def _fetch(claim_ids: set[str]) -> List[list]:
+        if not claim_ids:
+            return []
+
+        results, meta = await adb.cypher_query(
+            "UNWIND $uids AS uid "
+            "MATCH (c:Claim {uid: uid}) "
+            "RETURN c.uid, "
+            "[(a:Claim)-[:ATTACKS]->(c) | [a.uid, a.grounded_label, a.preferred_label, a.acceptability_score]], "
+            "[(s:Claim)-[:SUPPORTS]->(c) | [s.uid, s.grounded_label, s.preferred_label, s.acceptability_score]], "
+            "[(c)-[:HAS_PREMISE]->(p:Premise) | "
+            "[size([(p)<-[:SUPPORTS]-(e:Evidence) | e]), size([(p)<-[:COUNTERS]-(e:Evidence) | e])]]",
+            {"uids": list(claim_ids)})
+        return results
+
+    async def save(self, results: dict[str, Acceptability]) -> None:
+        rows: list[dict] = [{"uid": uid, "grounded": acceptability.grounded.value,
+                             "preferred": acceptability.preferred.value, "score": acceptability.score}
+                            for uid, acceptability in results.items()]
+        if not rows:
+            return
+
+        await adb.cypher_query(
+            "UNWIND $rows AS row "
+            "MATCH (c:Claim {uid: row.uid}) "
+            "SET c.grounded_label = row.grounded, c.preferred_label = row.preferred, "
+            "c.acceptability_score = row.score",
+            {"rows": rows})
+        IGraphRepository.invalidate(*results)
+
+    async def get_claims_of_premises(self, premise_ids: Iterable[UUID | str]) -> List[str]:
+        results, meta = await adb.cypher_query(
+            "MATCH (c:Claim)-[:HAS_PREMISE]->(p:Premise) WHERE p.uid IN $uids RETURN DISTINCT c.uid",
+            {"uids": [premise_id.hex if isinstance(premise_id, UUID) else premise_id for premise_id in premise_ids]})
+        return [row[0] for row in results]
+
+    async def get_dependants(self, claim_id: UUID | str) -> List[str]:
+        results, meta = await adb.cypher_query(
+            "MATCH (c:Claim {uid: $uid})-[:ATTACKS|SUPPORTS]->(d:Claim) RETURN DISTINCT d.uid",
+            {"uid": claim_id.hex if isinstance(claim_id, UUID) else claim_id})
+        return [row[0] for row in results]
+
+    async def get_all_claim_ids(self) -> List[str]:
+        results, meta = await adb.cypher_query("MATCH (c:Claim) RETURN c.uid")
+        return [row[0] for row in results]
+
+
+def get_acceptability_repository() -> AcceptabilityRepository:
+    return AcceptabilityRepository()
@@ -0,0 +1,54 @@
+import asyncio
+import logging
+from typing import Iterable, List
+from uuid import UUID
+
+from neomodel import AsyncStructuredNode
+
+from src.app.arg_framework.acceptability.acceptability import Acceptability, ArgumentGraph, evaluate
+from src.app.arg_framework.acceptability.acceptability_repository import (AcceptabilityRepository,
+                                                                          get_acceptability_repository)
+
+
+class AcceptabilityService:
+    def __init__(self, acceptability_repository: AcceptabilityRepository):
+        self.acceptability_repository: AcceptabilityRepository = acceptability_repository
+
+    async def update(self, claim_ids: Iterable[UUID | str]) -> dict[str, Acceptability]:
+        """
+        Recompute the acceptability of the given claims and of every claim downstream of them after an attack, support,
+        premise or evidence of theirs changed
+
+        :param claim_ids: the claims whose own inputs changed, unknown or deleted claims are skipped
+        """
+        graph: ArgumentGraph = await self.acceptability_repository.load_region(claim_ids)
+        # The enumeration of the preferred semantics must not block the other requests
+        results: dict[str, Acceptability] = await asyncio.get_running_loop().run_in_executor(None, evaluate, graph)
+
+        await self.acceptability_repository.save(results)
+        logging.debug(f"Acceptability of {len(results)} claims recomputed")
+        return results
+
+    async def update_for_premises(self, premise_ids: Iterable[UUID | str]) -> dict[str, Acceptability]:
+        return await self.update(await self.acceptability_repository.get_claims_of_premises(premise_ids))
+
+    async def recompute_all(self) -> dict[str, Acceptability]:
+        return await self.update(await self.acceptability_repository.get_all_claim_ids())
+
+    async def get_dependants(self, claim_id: UUID | str) -> List[str]:
+        """The claims a claim attacks or supports, to be updated once the claim itself is gone"""
+        return await self.acceptability_repository.get_dependants(claim_id)
+
+    @staticmethod
+    def apply(node: AsyncStructuredNode, results: dict[str, Acceptability]) -> AsyncStructuredNode:
+        """Copy freshly computed acceptability onto an already loaded node"""
+        acceptability: Acceptability | None = results.get(node.uid)
+        if acceptability:
+            node.grounded_label = acceptability.grounded.value
+            node.preferred_label = acceptability.preferred.value
+            node.acceptability_score = acceptability.score
+        return node
+
+
+def get_acceptability_service() -> AcceptabilityService:
+    return AcceptabilityService(get_acceptability_repository())
@@ -0,0 +1,30 @@
+from uuid import UUID
+
+from strawberry import type, mutation, field, Info
+
+from src.app.arg_framework.bulk_import.bulk_import_schema import BulkImportIn, BulkImportResultType, \
+    ImportedNodeType
+from src.app.arg_framework.bulk_import.bulk_import_service import BulkImportService, get_bulk_import_service
+
+bulk_import_service: BulkImportService = get_bulk_import_service()
+
+
+@type
+class BulkImportMutations:
+    @mutation
+    async def import_graph(self, info: Info, graph: BulkImportIn) -> BulkImportResultType:
+        uid: UUID = await info.context.uid()
+
+        uids, relationships = await bulk_import_service.import_graph(author_id=uid, **vars(graph))
+
+        return BulkImportResultType(
+            nodes=[ImportedNodeType(temp_id=temp_id, uid=UUID(node_uid)) for temp_id, node_uid in uids.items()],
+            relationships=relationships
+        )
+
+
+@type
+class Mutation:
+    @field
+    async def bulk_import(self) -> BulkImportMutations:
+        return BulkImportMutations()
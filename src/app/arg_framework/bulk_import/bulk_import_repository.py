@@ -0,0 +1,84 @@
+import logging
+from typing import List, Type
+from uuid import UUID
+
+from neo4j.exceptions import ConstraintError
+from neomodel import AsyncStructuredNode, adb
+
+from src.infra.db.batch_writer import BatchWriter, DEFAULT_CHUNK_SIZE
+from src.infra.db.counters import counted_relationships, recount
+from src.infra.db.db_types import ADDRESSABLE_LABEL
+from src.infra.db.graph_repository_interface import IGraphRepository
+
+
+class BulkImportRepository:
+    def __init__(self, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        self.chunk_size: int = chunk_size
+
+    @staticmethod
+    async def get_existing(node_ids: List[UUID]) -> dict[str, AsyncStructuredNode]:
+        return await IGraphRepository.query_nodes_many(node_ids)
+
+    @staticmethod
+    async def get_taken(node_class: Type[AsyncStructuredNode], entity_property: str, values: List[str]) -> List[str]:
+        """:return: the values of a unique property that existing nodes already have"""
+        if not values:
+            return []
+
+        results, meta = await adb.cypher_query(f"UNWIND $values AS value "
+                                               f"MATCH (n:{node_class.__label__} {{{entity_property}: value}}) "
+                                               f"RETURN DISTINCT value", {"values": values})
+        return [row[0] for row in results]
+
+    async def create_nodes(self, nodes: dict[Type[AsyncStructuredNode], List[AsyncStructuredNode]]) -> int:
+        batch_writer: BatchWriter = BatchWriter(self.chunk_size)
+        created: int = 0
+        try:
+            for node_class, class_nodes in nodes.items():
+                created += await batch_writer.create_nodes(node_class, class_nodes)
+                logging.info(f"Imported {len(class_nodes)} {node_class.__label__} nodes")
+
+            IGraphRepository.invalidate_lists(*nodes)
+            return created
+
+        except ConstraintError as e:
+            logging.error(f"Import aborted after {created} nodes: {str(e)}")
+            raise ValueError(f"Import aborted, a node already exists: {str(e)}") from e
+
+    async def delete_nodes(self, node_classes: List[Type[AsyncStructuredNode]], uids: List[str]) -> int:
+        """
+        Remove the nodes of a failed import with their relationships, the chunks written before the failure are
+        already committed
+
+        :return: the number of deleted nodes
+        """
+        batch_writer: BatchWriter = BatchWriter(self.chunk_size)
+        deleted: int = await batch_writer.write(f"UNWIND $rows AS uid "
+                                                f"MATCH (n:{ADDRESSABLE_LABEL} {{uid: uid}}) "
+                                                f"DETACH DELETE n "
+                                                f"RETURN count(*)", uids)
+        IGraphRepository.invalidate(*uids)
+        IGraphRepository.invalidate_lists(*node_classes)
+        return deleted
+
+    async def create_relationships(self, relationships: dict[tuple[Type[AsyncStructuredNode], str],
+                                                             List[tuple[str, str]]]) -> int:
+        batch_writer: BatchWriter = BatchWriter(self.chunk_size)
+        created: int = 0
+        counted_classes: set[Type[AsyncStructuredNode]] = set()
+        counted_targets: set[str] = set()
+
+        for (node_class, relationship), pairs in relationships.items():
+            created += await batch_writer.create_relationships(node_class, relationship, pairs)
+            if relationship in counted_relationships(node_class):
+                counted_classes.add(node_class)
+                counted_targets.update(target for _, target in pairs)
+
+        # The batch writer bypasses the counters, existing targets count the imported nodes afterwards
+        await recount(counted_classes, counted_targets)
+        IGraphRepository.invalidate(*counted_targets)
+        return created
+
+
+def get_bulk_import_repository() -> BulkImportRepository:
+    return BulkImportRepository()
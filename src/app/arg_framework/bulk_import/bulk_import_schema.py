@@ -0,0 +1,80 @@
+from typing import List
+from uuid import UUID
+
+from strawberry import type, input, enum
+
+from src.app.arg_framework.address_relationship import AddressRelationshipSchema
+from src.app.arg_framework.evidence.evidence import EvidenceTypeEnum
+
+
+# Nodes are referenced by the temporary id of a node in the same import or by the uid of an existing node
+
+@input(name="BulkQuestion")
+class BulkQuestionIn:
+    temp_id: str
+    question: str
+    description: str | None = None
+    townsquare_id: UUID | None = None
+    addressed_node: str | None = None
+
+
+@input(name="BulkClaim")
+class BulkClaimIn:
+    temp_id: str
+    content: str
+
+
+@input(name="BulkPremise")
+class BulkPremiseIn:
+    temp_id: str
+    content: str
+
+
+@input(name="BulkEvidence")
+class BulkEvidenceIn:
+    temp_id: str
+    content: str
+    source: str
+
+
+@input(name="BulkClaimRelationship")
+class BulkClaimRelationshipIn:
+    claim: str
+    target_node: str
+    relationship_type: AddressRelationshipSchema
+
+
+@input(name="BulkPremiseClaim")
+class BulkPremiseClaimIn:
+    premise: str
+    claim: str
+
+
+@input(name="BulkEvidencePremise")
+class BulkEvidencePremiseIn:
+    evidence: str
+    premise: str
+    evidence_type: enum(EvidenceTypeEnum)
+
+
+@input(name="BulkImport")
+class BulkImportIn:
+    questions: List[BulkQuestionIn] | None = None
+    claims: List[BulkClaimIn] | None = None
+    premises: List[BulkPremiseIn] | None = None
+    evidence: List[BulkEvidenceIn] | None = None
+    claim_relationships: List[BulkClaimRelationshipIn] | None = None
+    premise_claims: List[BulkPremiseClaimIn] | None = None
+    evidence_premises: List[BulkEvidencePremiseIn] | None = None
+
+
+@type(name="ImportedNode")
+class ImportedNodeType:
+    temp_id: str
+    uid: UUID
+
+
+@type(name="BulkImportResult")
+class BulkImportResultType:
+    nodes: List[ImportedNodeType]
+    relationships: int
@@ -0,0 +1,224 @@
+import logging
+from datetime import datetime
+from typing import List, Type
+from uuid import UUID
+
+from neomodel import AsyncStructuredNode
+
+from src.app.arg_framework.acceptability.acceptability_service import AcceptabilityService, get_acceptability_service
+from src.app.arg_framework.bulk_import.bulk_import_repository import BulkImportRepository, \
+    get_bulk_import_repository
+from src.app.arg_framework.claim.claim import Claim
+from src.app.arg_framework.claim.claim_repository import ClaimRepository
+from src.app.arg_framework.claim.claim_service import CLAIM_RELATIONSHIPS
+from src.app.arg_framework.duplicates.duplicate_service import DuplicateService, get_duplicate_service
+from src.app.arg_framework.evidence.evidence import Evidence
+from src.app.arg_framework.evidence.evidence_repository import EvidenceRepository
+from src.app.arg_framework.evidence.evidence_service import EVIDENCE_RELATIONSHIPS
+from src.app.arg_framework.premise.premise import Premise
+from src.app.arg_framework.premise.premise_repository import PremiseRepository
+from src.app.arg_framework.question.question import Question
+from src.app.arg_framework.question.question_repository import QuestionRepository
+from src.app.arg_framework.similar_questions.similar_question_service import (SimilarQuestionService,
+                                                                              get_similar_question_service)
+from src.infra.db.relationship_loader import build_relationship_pattern
+
+MAX_IMPORT_NODES: int = 10_000
+
+
+def _unique_properties(database_constraints: dict) -> tuple[str, ...]:
+    return tuple(entity_property for entity_property, constraints in database_constraints["node"].items()
+                 if entity_property != "uid" and "unique" in constraints)
+
+
+# Properties with a unique constraint per importable class, checked before anything is written
+UNIQUE_PROPERTIES: dict[Type[AsyncStructuredNode], tuple[str, ...]] = {
+    Question: _unique_properties(QuestionRepository.database_constraints),
+    Claim:    _unique_properties(ClaimRepository.database_constraints),
+    Premise:  _unique_properties(PremiseRepository.database_constraints),
+    Evidence: _unique_properties(EvidenceRepository.database_constraints),
+}
+
+
+class ImportGraph:
+    """New nodes keyed by their temporary id and the relationships between new and existing nodes"""
+
+    def __init__(self):
+        self.nodes: dict[str, AsyncStructuredNode] = {}
+        self.existing: dict[str, set[Type[AsyncStructuredNode]]] = {}
+        self.relationships: dict[tuple[Type[AsyncStructuredNode], str], List[tuple[str, str]]] = {}
+
+    def add_node(self, temp_id: str, node: AsyncStructuredNode) -> None:
+        if temp_id in self.nodes:
+            raise ValueError(f"Duplicate temporary ID '{temp_id}'")
+        self.nodes[temp_id] = node
+
+    def connect(self, node_class: Type[AsyncStructuredNode], source: str, relationship: str, target: str) -> None:
+        """
+        :param node_class: the neomodel class that declares the relationship
+        :param source: temporary id or uid of the source node
+        :param relationship: the attribute name of the relationship on the node class
+        :param target: temporary id or uid of the target node
+        :raises ValueError
+        """
+        _, target_class = build_relationship_pattern(node_class, relationship)
+        pair: tuple[str, str] = (self.__resolve(source, node_class), self.__resolve(target, target_class))
+        self.relationships.setdefault((node_class, relationship), []).append(pair)
+
+    def __resolve(self, reference: str, node_class: Type[AsyncStructuredNode]) -> str:
+        if reference in self.nodes:
+            node: AsyncStructuredNode = self.nodes[reference]
+            if not isinstance(node, node_class):
+                raise ValueError(f"'{reference}' is not a {node_class.__name__}")
+            return node.uid
+
+        try:
+            uid: str = UUID(reference).hex
+        except ValueError as e:
+            raise ValueError(f"'{reference}' is neither a temporary ID nor a node ID") from e
+
+        self.existing.setdefault(uid, set()).add(node_class)
+        return uid
+
+
+class BulkImportService:
+    def __init__(self, bulk_import_repository: BulkImportRepository, acceptability_service: AcceptabilityService,
+                 duplicate_service: DuplicateService, similar_question_service: SimilarQuestionService):
+        self.bulk_import_repository: BulkImportRepository = bulk_import_repository
+        self.acceptability_service: AcceptabilityService = acceptability_service
+        self.duplicate_service: DuplicateService = duplicate_service
+        self.similar_question_service: SimilarQuestionService = similar_question_service
+
+    async def import_graph(self, author_id: UUID, questions: List = None, claims: List = None, premises: List = None,
+                           evidence: List = None, claim_relationships: List = None, premise_claims: List = None,
+                           evidence_premises: List = None) -> tuple[dict[str, str], int]:
+        """
+        Validate a graph of new nodes and write it with chunked UNWIND statements.
+
+        The chunks are committed one by one, so the unique properties are checked up front and the created nodes are
+        deleted again if a write fails anyway, e.g. because a concurrent write took a unique value.
+
+        :param author_id: the author of every new node
+        :raises ValueError: if the graph is invalid, references nodes that do not exist or repeats a unique property
+        :return: the uid of every temporary id and the number of created relationships
+        """
+        graph: ImportGraph = ImportGraph()
+        created_at: datetime = datetime.now()
+
+        for question in questions or []:
+            if not question.townsquare_id and not question.addressed_node:
+                raise ValueError(f"Question '{question.temp_id}' needs to address a node or a townsquare")
+            graph.add_node(question.temp_id, Question(created_at=created_at, question=question.question,
+                                                      description=question.description))
+        for claim in claims or []:
+            graph.add_node(claim.temp_id, Claim(created_at=created_at, content=claim.content))
+        for premise in premises or []:
+            graph.add_node(premise.temp_id, Premise(created_at=created_at, content=premise.content))
+        for single_evidence in evidence or []:
+            graph.add_node(single_evidence.temp_id, Evidence(created_at=created_at, content=single_evidence.content,
+                                                             source=single_evidence.source))
+
+        if not graph.nodes:
+            raise ValueError("Nothing to import")
+        if len(graph.nodes) > MAX_IMPORT_NODES:
+            raise ValueError(f"An import is limited to {MAX_IMPORT_NODES} nodes")
+
+        for temp_id, node in graph.nodes.items():
+            graph.connect(type(node), temp_id, "author", author_id.hex)
+        for question in questions or []:
+            if question.townsquare_id:
+                graph.connect(Question, question.temp_id, "townsquare", question.townsquare_id.hex)
+            if question.addressed_node:
+                graph.connect(Question, question.temp_id, "questions", question.addressed_node)
+        for relationship in claim_relationships or []:
+            graph.connect(Claim, relationship.claim, CLAIM_RELATIONSHIPS[relationship.relationship_type],
+                          relationship.target_node)
+        for relationship in premise_claims or []:
+            graph.connect(Premise, relationship.premise, "claims", relationship.claim)
+        for relationship in evidence_premises or []:
+            graph.connect(Evidence, relationship.evidence, EVIDENCE_RELATIONSHIPS[relationship.evidence_type],
+                          relationship.premise)
+
+        await self.__check_existing(graph.existing)
+
+        nodes: dict[Type[AsyncStructuredNode], List[AsyncStructuredNode]] = {}
+        for node in graph.nodes.values():
+            nodes.setdefault(type(node), []).append(node)
+        await self.__check_unique(nodes)
+
+        try:
+            await self.bulk_import_repository.create_nodes(nodes)
+            relationships: int = await self.bulk_import_repository.create_relationships(graph.relationships)
+        except Exception:
+            await self.bulk_import_repository.delete_nodes(list(nodes), [node.uid for node in graph.nodes.values()])
+            raise
+
+        for claim in nodes.get(Claim, []):
+            self.duplicate_service.add(claim.uid, claim.content)
+        if Question in nodes:
+            self.similar_question_service.clear()
+        await self.__update_acceptability(nodes, graph.relationships)
+
+        return {temp_id: node.uid for temp_id, node in graph.nodes.items()}, relationships
+
+    async def __update_acceptability(self, nodes: dict[Type[AsyncStructuredNode], List[AsyncStructuredNode]],
+                                     relationships: dict[tuple[Type[AsyncStructuredNode], str],
+                                                         List[tuple[str, str]]]) -> None:
+        """
+        Label the imported claims and relabel the existing claims they attack or support, the claims that got
+        premises and the claims of the premises that got evidence
+        """
+        claim_ids: set[str] = {claim.uid for claim in nodes.get(Claim, [])}
+        for relationship in ("counters", "supports"):
+            claim_ids.update(target for _, target in relationships.get((Claim, relationship), []))
+        claim_ids.update(claim for _, claim in relationships.get((Premise, "claims"), []))
+        premise_ids: set[str] = {premise for relationship in set(EVIDENCE_RELATIONSHIPS.values())
+                                 for _, premise in relationships.get((Evidence, relationship), [])}
+
+        # The import is committed at this point, a failure leaves labels for 'recompute-acceptability' to fix
+        try:
+            if claim_ids:
+                await self.acceptability_service.update(claim_ids)
+            if premise_ids:
+                await self.acceptability_service.update_for_premises(premise_ids)
+        except Exception as e:
+            logging.error(f"Acceptability of the import not updated: {str(e)}")
+
+    async def __check_unique(self, nodes: dict[Type[AsyncStructuredNode], List[AsyncStructuredNode]]) -> None:
+        """:raises ValueError: if a unique property repeats within the import or is taken by an existing node"""
+        for node_class, class_nodes in nodes.items():
+            for entity_property in UNIQUE_PROPERTIES.get(node_class, ()):
+                values: List[str] = [getattr(node, entity_property) for node in class_nodes
+                                     if getattr(node, entity_property) is not None]
+
+                seen: set[str] = set()
+                for value in values:
+                    if value in seen:
+                        raise ValueError(f"Two imported {node_class.__label__} nodes have the {entity_property} "
+                                         f"'{value}'")
+                    seen.add(value)
+
+                taken: List[str] = await self.bulk_import_repository.get_taken(node_class, entity_property, values)
+                if taken:
+                    raise ValueError(f"A {node_class.__label__} with the {entity_property} '{taken[0]}' already "
+                                     f"exists")
+
+    async def __check_existing(self, existing: dict[str, set[Type[AsyncStructuredNode]]]) -> None:
+        if not existing:
+            return
+
+        try:
+            nodes: dict[str, AsyncStructuredNode] = await self.bulk_import_repository.get_existing(
+                [UUID(uid) for uid in existing])
+        except LookupError as e:
+            raise ValueError(str(e)) from e
+
+        for uid, node_classes in existing.items():
+            for node_class in node_classes:
+                if not isinstance(nodes[uid], node_class):
+                    raise ValueError(f"The node with ID '{UUID(uid)}' is not a {node_class.__name__}")
+
+
+def get_bulk_import_service() -> BulkImportService:
+    return BulkImportService(get_bulk_import_repository(), get_acceptability_service(), get_duplicate_service(),
+                             get_similar_question_service())
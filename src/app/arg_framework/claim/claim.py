@@ -1,10 +1,19 @@
-from neomodel import StringProperty, AsyncRelationshipTo, AsyncOne, AsyncRelationshipFrom
+from neomodel import StringProperty, AsyncRelationshipTo, AsyncOne, AsyncRelationshipFrom, FloatProperty, \
+    IntegerProperty
 
 from src.app.base_node import BaseNode
 
 
 class Claim(BaseNode):
     content = StringProperty(required=True)
+    # Maintained by the AcceptabilityService whenever the argumentation around the Claim changes
+    grounded_label = StringProperty()
+    preferred_label = StringProperty()
+    acceptability_score = FloatProperty()
+    support_count = IntegerProperty(default=0)
+    counter_count = IntegerProperty(default=0)
+    premise_count = IntegerProperty(default=0)
+
     author = AsyncRelationshipTo('src.app.user.user.User', 'AUTHORED_BY', cardinality=AsyncOne)
 
     counters = AsyncRelationshipTo('src.app.arg_framework.claim.claim.Claim', 'ATTACKS')
@@ -16,3 +25,8 @@ class Claim(BaseNode):
     questioned_by = AsyncRelationshipFrom('src.app.arg_framework.question.question.Question', 'QUESTIONS')
 
     premises = AsyncRelationshipTo('src.app.arg_framework.premise.premise.Premise', 'HAS_PREMISE')
+
+    # Counter property on the target of each relationship, maintained by IGraphRepository.connect_counted
+    counted_relationships = {"counters": "counter_count", "supports": "support_count", "answers": "answer_count"}
+    # Properties of the full-text index searched by the SearchService
+    fulltext_properties = ("content",)
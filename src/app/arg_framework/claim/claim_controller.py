@@ -2,10 +2,14 @@ from typing import List
 from uuid import UUID
 
 from strawberry import type, mutation, field, Info
+from strawberry.types.nodes import Selection
 
 from src.app.arg_framework.claim.claim import Claim
 from src.app.arg_framework.claim.claim_schema import ClaimType, ClaimIn, ClaimUpdateIn, ClaimUpdateRelationshipIn
 from src.app.arg_framework.claim.claim_service import ClaimService, get_claim_service
+from src.app.connection import Connection, ListFilterIn
+from src.infra.db.pagination import PageQuery, Page
+from src.infra.db.query_planner import QueryPlanner, PlannedNodes
 
 claim_service: ClaimService = get_claim_service()
 
@@ -13,13 +17,18 @@ claim_service: ClaimService = get_claim_service()
 @type
 class ClaimQueries:
     @field
-    async def all_claims(self) -> List[ClaimType]:
-        claim_nodes: List[Claim] = await claim_service.get_all_claims()
-        return [ClaimType.from_node(claim_node) for claim_node in claim_nodes]
+    async def all_claims(self, info: Info, first: int = 20, after: str | None = None,
+                         filters: ListFilterIn | None = None) -> Connection[ClaimType]:
+        selections: List[Selection] = QueryPlanner.selections(info, "edges", "node")
+        page: Page = await claim_service.get_claims_page(selections, PageQuery(first=first, after=after),
+                                                         **vars(filters or ListFilterIn()))
+        return Connection.from_nodes(info.context.relationship_loader.prime(page.planned), page.has_next_page,
+                                     ClaimType.from_node)
 
     @field
-    async def claim_by_id(self, claim_id: UUID) -> ClaimType:
-        claim_node: Claim = await claim_service.get_claim(claim_id)
+    async def claim_by_id(self, info: Info, claim_id: UUID) -> ClaimType:
+        planned: PlannedNodes = await claim_service.get_claim_planned(claim_id, QueryPlanner.selections(info))
+        claim_node: Claim = info.context.relationship_loader.prime(planned)[0]
         return ClaimType.from_node(claim_node)
 
 
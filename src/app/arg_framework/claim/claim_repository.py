@@ -4,29 +4,38 @@ from uuid import UUID
 
 from neomodel import adb
 from neomodel.exceptions import UniqueProperty, DoesNotExist
+from strawberry.types.nodes import Selection
 
 from src.app.arg_framework.claim.claim import Claim
-from src.app.user.user import User
+from src.app.townsquare.townsquare_scope import townsquare_scope
 from src.infra.db.crud_repository_interface import ICRUDRepository
 from src.infra.db.db_types import GraphDataTypes as types
 from src.infra.db.graph_repository_interface import IGraphRepository
+from src.infra.db.pagination import PageQuery, Page
+from src.infra.db.query_planner import QueryPlanner, PlannedNodes
 
 
 class ClaimRepository(IGraphRepository, ICRUDRepository):
-    async def create(self, new_claim: Claim, author: User) -> Claim:
+    townsquare_scope: str = townsquare_scope("Claim")
+    author_relationship: str = "AUTHORED_BY"
+    database_constraints: dict = {
+        "node": {
+            "uid":     ("unique", "required", types.STRING),
+            "content": ("unique", "required", types.STRING)
+        },
+        "indexes": [("created_at", "uid")],
+        "fulltext": Claim.fulltext_properties,
+    }
+
+    async def create(self, new_claim: Claim, relationships: List[tuple[str, UUID]]) -> Claim:
         try:
-            new_claim = await new_claim.save()
-            await new_claim.author.connect(author)
-            return new_claim
+            return await self.create_connected(new_claim, relationships)
 
         except UniqueProperty:
             raise ValueError(f"Claim '{new_claim}' already exists")
 
     async def get(self, claim_id: UUID) -> Claim:
-        if type(claim_id) is UUID:
-            claim_id = claim_id.hex
-
-        claim: Claim | None = await Claim.nodes.get_or_none(uid=claim_id)
+        claim: Claim | None = await self.get_node(Claim, claim_id)
         if not claim:
             raise LookupError(f"The Claim with ID '{claim_id}' not found in the Database")
         return claim
@@ -34,18 +43,25 @@ class ClaimRepository(IGraphRepository, ICRUDRepository):
     async def get_all(self) -> List[Claim]:
         return await Claim.nodes.all()
 
+    async def get_planned(self, claim_id: UUID, selections: List[Selection]) -> PlannedNodes:
+        planned: PlannedNodes = await QueryPlanner(Claim).fetch(selections, where="WHERE n.uid = $uid",
+                                                                params={"uid": claim_id.hex})
+        if not planned.nodes:
+            raise LookupError(f"The Claim with ID '{claim_id}' not found in the Database")
+        return planned
+
+    async def get_page(self, selections: List[Selection], page: PageQuery, **filters) -> Page:
+        return await self.paginate(Claim, selections, page, **filters)
+
     async def update(self, claim_id: UUID, **kwargs) -> Claim:
         try:
-            claim: Claim = await self.get(claim_id)
+            claim, previous = await self.update_properties(Claim, claim_id, kwargs)
+            for key, old_value in previous.items():
+                logging.info(f"Updating {key}: '{old_value}' --> '{kwargs[key]}'")
 
-            for key, value in kwargs.items():
-                if value is not None:
-                    old_value = getattr(claim, key)
-                    setattr(claim, key, value)
-                    logging.info(f"Updating {key}: '{old_value}' --> '{value}'")
-
-            async with adb.transaction:
-                return await claim.save()
+            self.invalidate(claim_id)
+            self.write_through(claim)
+            return claim
 
         except DoesNotExist as e:
             logging.error(f"The Claim with ID '{claim_id}' not found in the Database: {str(e)}")
@@ -59,24 +75,19 @@ class ClaimRepository(IGraphRepository, ICRUDRepository):
 
     async def delete(self, claim_id: UUID) -> str:
         try:
-            claim: Claim = await self.get(claim_id)
             async with adb.transaction:
+                claim: Claim = await self.get_for_write(Claim, claim_id)
+                await self.release_counters(claim)
                 await claim.delete()
-                return f"Claim with ID '{claim_id}' successfully deleted"
+
+            self.invalidate(claim_id)
+            self.invalidate_lists(Claim)
+            return f"Claim with ID '{claim_id}' successfully deleted"
 
         except DoesNotExist:
             logging.error(f"The Claim with ID '{claim_id}' not found in the Database")
             raise LookupError(f"The Claim with ID '{claim_id}' not found in the Database")
 
-    async def add_database_constraints(self, label: str, constraints: dict = None):
-        constraints: dict = {
-            "node": {
-                "uid":     ("unique", "required", types.STRING),
-                "content": ("unique", "required", types.STRING)
-            }
-        }
-        await super().add_database_constraints(label, constraints)
-
 
 def get_claim_repository() -> ClaimRepository:
     return ClaimRepository()
@@ -1,8 +1,9 @@
 from typing import TYPE_CHECKING, Annotated, List
 from uuid import UUID
 
-from strawberry import type, input, lazy, Private, field
+from strawberry import type, input, lazy, Private, field, Info
 
+from src.app.arg_framework.acceptability.acceptability_label import AcceptabilityLabel, AcceptabilityLabelSchema
 from src.app.arg_framework.address_relationship import AddressRelationshipSchema
 from src.app.arg_framework.claim.claim import Claim
 from src.app.base_node import BaseNodeType, MetaType
@@ -18,33 +19,44 @@ class RelationshipsType:
     node_instance: Private[Claim]
 
     @field
-    async def counters(self) -> List[Annotated["ClaimType", lazy("src.app.arg_framework.claim.claim_schema")]]:
-        return [ClaimType.from_node(claim_node) for claim_node in await self.node_instance.counters.all()]
+    async def counters(self, info: Info) -> List[
+        Annotated["ClaimType", lazy("src.app.arg_framework.claim.claim_schema")]]:
+        return [ClaimType.from_node(claim_node) for claim_node in
+                await info.context.relationship_loader.load(self.node_instance, "counters")]
 
     @field
-    async def supports(self) -> List[Annotated["ClaimType", lazy("src.app.arg_framework.claim.claim_schema")]]:
-        return [ClaimType.from_node(claim_node) for claim_node in await self.node_instance.supports.all()]
+    async def supports(self, info: Info) -> List[
+        Annotated["ClaimType", lazy("src.app.arg_framework.claim.claim_schema")]]:
+        return [ClaimType.from_node(claim_node) for claim_node in
+                await info.context.relationship_loader.load(self.node_instance, "supports")]
 
     @field
-    async def answers(self) -> List[Annotated["QuestionType", lazy("src.app.arg_framework.question.question_schema")]]:
+    async def answers(self, info: Info) -> List[
+        Annotated["QuestionType", lazy("src.app.arg_framework.question.question_schema")]]:
         from src.app.arg_framework.question.question_schema import QuestionType
 
-        return [QuestionType.from_node(question_node) for question_node in await self.node_instance.answers.all()]
+        return [QuestionType.from_node(question_node) for question_node in
+                await info.context.relationship_loader.load(self.node_instance, "answers")]
 
     @field
-    async def countered_by(self) -> List[Annotated["ClaimType", lazy("src.app.arg_framework.claim.claim_schema")]]:
-        return [ClaimType.from_node(claim_node) for claim_node in await self.node_instance.countered_by.all()]
+    async def countered_by(self, info: Info) -> List[
+        Annotated["ClaimType", lazy("src.app.arg_framework.claim.claim_schema")]]:
+        return [ClaimType.from_node(claim_node) for claim_node in
+                await info.context.relationship_loader.load(self.node_instance, "countered_by")]
 
     @field
-    async def supported_by(self) -> List[Annotated["ClaimType", lazy("src.app.arg_framework.claim.claim_schema")]]:
-        return [ClaimType.from_node(claim_node) for claim_node in await self.node_instance.supported_by.all()]
+    async def supported_by(self, info: Info) -> List[
+        Annotated["ClaimType", lazy("src.app.arg_framework.claim.claim_schema")]]:
+        return [ClaimType.from_node(claim_node) for claim_node in
+                await info.context.relationship_loader.load(self.node_instance, "supported_by")]
 
     @field
-    async def questioned_by(self) -> List[
+    async def questioned_by(self, info: Info) -> List[
         Annotated["QuestionType", lazy("src.app.arg_framework.question.question_schema")]]:
         from src.app.arg_framework.question.question_schema import QuestionType
 
-        return [QuestionType.from_node(question_node) for question_node in await self.node_instance.questioned_by.all()]
+        return [QuestionType.from_node(question_node) for question_node in
+                await info.context.relationship_loader.load(self.node_instance, "questioned_by")]
 
 
 @type(name="Claim")
@@ -52,23 +64,37 @@ class ClaimType(BaseNodeType):
     node_instance: Private[Claim]
 
     content: str
+    grounded_label: AcceptabilityLabelSchema | None = None
+    preferred_label: AcceptabilityLabelSchema | None = None
+    acceptability_score: float | None = None
+    support_count: int = 0
+    counter_count: int = 0
+    premise_count: int = 0
 
     @field
-    async def author(self) -> Annotated["UserType", lazy("src.app.user.user_schema")]:
+    async def author(self, info: Info) -> Annotated["UserType", lazy("src.app.user.user_schema")]:
         from src.app.user.user_schema import UserType
 
-        return UserType.from_node(await self.node_instance.author.single())
+        return UserType.from_node(await info.context.relationship_loader.load_single(self.node_instance, "author"))
 
     @field
-    async def premises(self) -> List[Annotated["PremiseType", lazy("src.app.arg_framework.premise.premise_schema")]]:
+    async def premises(self, info: Info) -> List[
+        Annotated["PremiseType", lazy("src.app.arg_framework.premise.premise_schema")]]:
         from src.app.arg_framework.premise.premise_schema import PremiseType
 
-        return [PremiseType.from_node(premise_node) for premise_node in await self.node_instance.premises.all()]
+        return [PremiseType.from_node(premise_node) for premise_node in
+                await info.context.relationship_loader.load(self.node_instance, "premises")]
 
     @field
     async def relationships(self) -> RelationshipsType:
         return RelationshipsType(node_instance=self.node_instance)
 
+    @field
+    async def possible_duplicates(self, info: Info, limit: int = 5) -> List["PossibleDuplicateType"]:
+        duplicates: List[tuple[Claim, float]] = await info.context.duplicate_loader.load(self.node_instance, limit)
+        return [PossibleDuplicateType(similarity=similarity, claim=ClaimType.from_node(claim_node))
+                for claim_node, similarity in duplicates]
+
     @classmethod
     def from_node(cls, node: Claim) -> "ClaimType":
         return ClaimType(
@@ -76,9 +102,21 @@ class ClaimType(BaseNodeType):
 
             meta=MetaType(uid=node.uid, created_at=node.created_at),
             content=node.content,
+            grounded_label=AcceptabilityLabel(node.grounded_label) if node.grounded_label else None,
+            preferred_label=AcceptabilityLabel(node.preferred_label) if node.preferred_label else None,
+            acceptability_score=node.acceptability_score,
+            support_count=node.support_count or 0,
+            counter_count=node.counter_count or 0,
+            premise_count=node.premise_count or 0,
         )
 
 
+@type(name="PossibleDuplicate")
+class PossibleDuplicateType:
+    similarity: float
+    claim: ClaimType
+
+
 @input(name="ClaimRelationship")
 class ClaimRelationshipIn:
     target_node_id: UUID
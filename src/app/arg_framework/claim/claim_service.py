@@ -4,47 +4,79 @@ from typing import List
 from uuid import UUID
 
 from neomodel import AsyncStructuredNode, adb
+from strawberry.types.nodes import Selection
 
 from src.app.arg_framework.IAddressable import IAddressable
+from src.app.activity.activity_service import ActivityService, get_activity_service
 from src.app.arg_framework.IOwnable import IOwnable
+from src.app.arg_framework.acceptability.acceptability_service import AcceptabilityService, get_acceptability_service
 from src.app.arg_framework.address_relationship import AddressRelationship
 from src.app.arg_framework.claim.claim import Claim
 from src.app.arg_framework.claim.claim_repository import ClaimRepository, get_claim_repository
+from src.app.arg_framework.duplicates.duplicate_service import DuplicateService, get_duplicate_service
 from src.app.arg_framework.question.question import Question
 from src.app.user.user import User
 from src.app.user.user_repository import UserRepository
+from src.infra.db.pagination import PageQuery, Page
+from src.infra.db.query_planner import PlannedNodes
+
+# Claim relationship attribute for each way a Claim can address another node
+CLAIM_RELATIONSHIPS: dict[AddressRelationship, str] = {
+    AddressRelationship.ATTACKS:  "counters",
+    AddressRelationship.SUPPORTS: "supports",
+    AddressRelationship.ANSWERS:  "answers",
+}
 
 
 class ClaimService(IOwnable, IAddressable):
-    def __init__(self, claim_repository: ClaimRepository, user_repository: UserRepository):
+    def __init__(self, claim_repository: ClaimRepository, user_repository: UserRepository,
+                 acceptability_service: AcceptabilityService, activity_service: ActivityService,
+                 duplicate_service: DuplicateService):
         self.claim_repository: ClaimRepository = claim_repository
         self.user_repository: UserRepository = user_repository
+        self.acceptability_service: AcceptabilityService = acceptability_service
+        self.activity_service: ActivityService = activity_service
+        self.duplicate_service: DuplicateService = duplicate_service
 
     async def create_claim(self, content: str, author_id: UUID, relationships: dict) -> Claim:
         async with adb.transaction:
             try:
                 new_claim: Claim = Claim(created_at=datetime.now(), content=content)
-                author: User = await self.user_repository.get(author_id)
-                new_claim: Claim = await self.claim_repository.create(new_claim, author)
+                targets: List[tuple[str, UUID]] = [("author", author_id)]
 
                 for addressed_node_id, relationship_type in relationships.items():
-                    await self.address_node(new_claim, addressed_node_id, relationship_type)
+                    if relationship_type not in CLAIM_RELATIONSHIPS:
+                        raise ValueError("Invalid relationship type")
+                    targets.append((CLAIM_RELATIONSHIPS[relationship_type], addressed_node_id))
 
-                return new_claim
+                new_claim = await self.claim_repository.create(new_claim, targets)
+                self.acceptability_service.apply(new_claim, await self.acceptability_service.update([new_claim.uid]))
 
             except LookupError as e:
-                raise ValueError(f"Node not found") from e
+                raise ValueError(f"Node not found: {str(e)}") from e
             except ValueError as e:
                 raise e
 
+        self.duplicate_service.add(new_claim.uid, new_claim.content)
+        await self.activity_service.publish_created(new_claim)
+        return new_claim
+
     async def get_claim(self, claim_id: UUID) -> Claim:
         return await self.claim_repository.get(claim_id)
 
     async def get_all_claims(self) -> List[Claim]:
         return await self.claim_repository.get_all()
 
+    async def get_claim_planned(self, claim_id: UUID, selections: List[Selection]) -> PlannedNodes:
+        return await self.claim_repository.get_planned(claim_id, selections)
+
+    async def get_claims_page(self, selections: List[Selection], page: PageQuery, **filters) -> Page:
+        return await self.claim_repository.get_page(selections, page, **filters)
+
     async def update_claim(self, claim_id: UUID, **kwargs) -> Claim:
-        return await self.claim_repository.update(claim_id, **kwargs)
+        claim: Claim = await self.claim_repository.update(claim_id, **kwargs)
+        self.duplicate_service.add(claim.uid, claim.content)
+        return claim
 
     async def update_claim_relationship(self, claim: Claim,
                                         target_node_id: UUID, relationship_type: AddressRelationship) -> Claim:
@@ -55,7 +87,12 @@ class ClaimService(IOwnable, IAddressable):
         return claim
 
     async def delete_claim(self, claim_id: UUID) -> str:
-        return await self.claim_repository.delete(claim_id)
+        dependants: List[str] = await self.acceptability_service.get_dependants(claim_id)
+        message: str = await self.claim_repository.delete(claim_id)
+        self.duplicate_service.remove(claim_id.hex)
+
+        await self.acceptability_service.update(dependants)
+        return message
 
     async def check_ownership(self, user_id: UUID, claim_id: UUID) -> bool:
         claim: Claim = await self.get_claim(claim_id)
@@ -74,15 +111,14 @@ class ClaimService(IOwnable, IAddressable):
 
         target_node: AsyncStructuredNode = await self.claim_repository.query_nodes(target_node_id)
 
-        if relationship_type == AddressRelationship.ATTACKS:
-            await source_node.counters.connect(target_node)
-        elif relationship_type == AddressRelationship.SUPPORTS:
-            await source_node.supports.connect(target_node)
-        elif relationship_type == AddressRelationship.ANSWERS:
-            await source_node.answers.connect(target_node)
-        else:
+        if relationship_type not in CLAIM_RELATIONSHIPS:
             raise ValueError("Invalid relationship type")
+        if not await self.claim_repository.connect_counted(source_node, CLAIM_RELATIONSHIPS[relationship_type],
+                                                           target_node_id):
+            raise ValueError(f"A Claim can not {relationship_type.name.lower()} a {target_node.__class__.__name__}")
 
+        if relationship_type in (AddressRelationship.ATTACKS, AddressRelationship.SUPPORTS):
+            await self.acceptability_service.update([target_node.uid])
         return source_node
 
     async def disconnect_node(self, source_node: UUID, target_node_id: UUID) -> Claim:
@@ -90,19 +126,23 @@ class ClaimService(IOwnable, IAddressable):
         target_node: AsyncStructuredNode = await self.claim_repository.query_nodes(target_node_id)
 
         if target_node.__class__ == Question:
-            await claim.answers.disconnect(target_node)
-
-        elif target_node.__class__ == Claim and target_node in await claim.supports.all():
-            await claim.supports.disconnect(target_node)
-
-        elif target_node.__class__ == Claim and target_node in await claim.counters.all():
-            await claim.counters.disconnect(target_node)
+            relationships: List[str] = ["answers"]
+        elif target_node.__class__ == Claim:
+            relationships = ["supports", "counters"]
+        else:
+            relationships = []
 
+        for relationship in relationships:
+            if await self.claim_repository.disconnect_counted(claim, relationship, target_node_id):
+                break
         else:
             raise ValueError("Relationship between the source node and target node not found or invalid")
 
+        if target_node.__class__ == Claim:
+            await self.acceptability_service.update([target_node.uid])
         return claim
 
 
 def get_claim_service() -> ClaimService:
-    return ClaimService(get_claim_repository(), UserRepository())
+    return ClaimService(get_claim_repository(), UserRepository(), get_acceptability_service(), get_activity_service(),
+                        get_duplicate_service())
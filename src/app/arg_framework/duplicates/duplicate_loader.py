@@ -0,0 +1,39 @@
+from typing import List
+
+from strawberry.dataloader import DataLoader
+
+from src.app.arg_framework.claim.claim import Claim
+from src.app.arg_framework.duplicates.duplicate_service import DuplicateService, get_duplicate_service
+from src.app.arg_framework.duplicates.minhash import Match
+from src.infra.db.node_record import NodeRecord
+
+
+class DuplicateLoader:
+    """
+    Request-scoped batching of possible duplicate lookups.
+
+    The index is queried per claim in memory, the matched claims of every lookup requested during the same tick of the
+    event loop are loaded with a single query instead of one query per claim.
+    """
+
+    def __init__(self, duplicate_service: DuplicateService = get_duplicate_service()):
+        self.duplicate_service: DuplicateService = duplicate_service
+        self.__loader: DataLoader = DataLoader(load_fn=self.__batch_load)
+
+    async def load(self, claim: Claim | NodeRecord, limit: int = 5) -> List[tuple[Claim, float]]:
+        return await self.__loader.load((claim.uid, claim.content, limit))
+
+    async def __batch_load(self,
+                           keys: List[tuple[str, str | None, int]]) -> List[List[tuple[Claim, float]] | ValueError]:
+        matches: dict[int, List[Match]] = {}
+        errors: dict[int, ValueError] = {}
+        for position, (claim_id, content, limit) in enumerate(keys):
+            try:
+                matches[position] = self.duplicate_service.match(claim_id, content, limit)
+            except ValueError as e:
+                # Fails only the field with the invalid limit, not the other lookups of the batch
+                errors[position] = e
+
+        duplicates: dict[int, List[tuple[Claim, float]]] = dict(
+            zip(matches, await self.duplicate_service.load_duplicates(list(matches.values()))))
+        return [errors[position] if position in errors else duplicates[position] for position in range(len(keys))]
@@ -0,0 +1,45 @@
+from typing import AsyncIterator, List
+
+from neomodel import adb
+
+from src.app.arg_framework.claim.claim import Claim
+from src.infra.db.identity_map import remember
+
+DEFAULT_BATCH_SIZE: int = 10000
+
+
+class DuplicateRepository:
+    @staticmethod
+    async def stream_claim_contents(batch_size: int = DEFAULT_BATCH_SIZE) -> AsyncIterator[List[tuple[str, str]]]:
+        """
+        Every Claim as (uid, content) pairs, read in batches ordered by the uniquely indexed uid so that no batch has
+        to skip over the previous ones
+        """
+        after: str = ""
+        while True:
+            results, meta = await adb.cypher_query("MATCH (n:Claim) WHERE n.uid > $after "
+                                                   "RETURN n.uid, n.content ORDER BY n.uid LIMIT $limit",
+                                                   {"after": after, "limit": batch_size})
+            if not results:
+                return
+            yield [(uid, content) for uid, content in results]
+            after = results[-1][0]
+
+    @staticmethod
+    async def get_claims(claim_ids: List[str]) -> List[Claim]:
+        """
+        :return: the Claims that still exist, in the order of the given uids
+        """
+        if not claim_ids:
+            return []
+
+        results, meta = await adb.cypher_query("UNWIND $uids AS uid MATCH (n:Claim {uid: uid}) RETURN n",
+                                               {"uids": claim_ids}, resolve_objects=True)
+        claims: dict[str, Claim] = {row[0].uid: row[0] for row in results}
+        for claim in claims.values():
+            remember(claim)
+        return [claims[uid] for uid in claim_ids if uid in claims]
+
+
+def get_duplicate_repository() -> DuplicateRepository:
+    return DuplicateRepository()
@@ -0,0 +1,164 @@
+import asyncio
+import logging
+import os
+import time
+from array import array
+from typing import List
+
+from src.app.arg_framework.claim.claim import Claim
+from src.app.arg_framework.duplicates.duplicate_repository import DuplicateRepository, get_duplicate_repository
+from src.app.arg_framework.duplicates.minhash import LSHIndex, Match, MinHasher
+
+DEFAULT_THRESHOLD: float = 0.5
+DEFAULT_TTL: float = 600.0
+MAX_DUPLICATES: int = 20
+
+
+class DuplicateService:
+    """
+    Near-duplicate detection of Claim contents with MinHash signatures in an in-memory LSH index.
+
+    The index is built per worker at startup and kept up to date by the writes of the same worker. To pick up the
+    claims written by other workers it is rebuilt in the background on the first lookup after 'ttl' seconds, lookups
+    keep using the current index meanwhile. Claims that were deleted elsewhere are dropped when the duplicates are
+    loaded.
+    """
+
+    def __init__(self, duplicate_repository: DuplicateRepository, threshold: float = DEFAULT_THRESHOLD,
+                 ttl: float = DEFAULT_TTL):
+        """:param ttl: seconds after which the index is rebuilt, 0 never rebuilds it"""
+        if not 0 < threshold <= 1:
+            raise ValueError("The duplicate threshold has to be in (0, 1]")
+        self.duplicate_repository: DuplicateRepository = duplicate_repository
+        self.threshold: float = threshold
+        self.ttl: float = ttl
+        self.__hasher: MinHasher = MinHasher()
+        self.__index: LSHIndex = LSHIndex()
+        self.__expires_at: float | None = None
+        self.__rebuild: asyncio.Task | None = None
+        # Writes made while a build reads the claims, replayed onto the new index, None while no build runs
+        self.__changes: list[tuple[str, str | None]] | None = None
+
+    @property
+    def size(self) -> int:
+        return len(self.__index)
+
+    async def build(self) -> int:
+        """
+        Index every Claim of the database into a new index that replaces the current one once it is complete
+
+        :return: the number of indexed claims
+        """
+        started: float = time.perf_counter()
+        index: LSHIndex = LSHIndex()
+        self.__changes = []
+
+        try:
+            async for batch in self.duplicate_repository.stream_claim_contents():
+                for uid, content in batch:
+                    self.__index_content(index, uid, content)
+            for uid, content in self.__changes:
+                self.__index_content(index, uid, content)
+        finally:
+            self.__changes = None
+
+        self.__index = index
+        self.__expires_at = time.monotonic() + self.ttl if self.ttl > 0 else None
+        logging.info(f"Indexed {len(index)} claims for duplicate detection in {time.perf_counter() - started:.1f}s")
+        return len(index)
+
+    def refresh(self) -> None:
+        """Start rebuilding the index in the background if it expired, the current one stays in use until then"""
+        if self.__expires_at is None or self.__expires_at > time.monotonic():
+            return
+        if self.__rebuild is None or self.__rebuild.done():
+            self.__rebuild = asyncio.create_task(self.__rebuild_index())
+
+    async def __rebuild_index(self) -> None:
+        try:
+            await self.build()
+        except Exception as e:
+            # Retried on a later lookup, the stale index keeps serving meanwhile
+            logging.error(f"Rebuilding the duplicate index failed: {str(e)}")
+
+    def __index_content(self, index: LSHIndex, claim_id: str, content: str | None) -> None:
+        signature: array | None = self.__hasher.signature(content) if content is not None else None
+        if signature is None:
+            index.remove(claim_id)
+        else:
+            index.add(claim_id, signature)
+
+    def add(self, claim_id: str, content: str) -> None:
+        """Index a new claim or the new content of a claim"""
+        self.__index_content(self.__index, claim_id, content)
+        if self.__changes is not None:
+            self.__changes.append((claim_id, content))
+
+    def remove(self, claim_id: str) -> None:
+        self.__index.remove(claim_id)
+        if self.__changes is not None:
+            self.__changes.append((claim_id, None))
+
+    def find(self, content: str, exclude: str | None = None, limit: int = 5) -> List[Match]:
+        """
+        The indexed claims whose content is estimated to be at least 'threshold' similar, without touching the database
+
+        :param exclude: the uid of the claim the content belongs to
+        :raises ValueError: if the limit is out of range
+        """
+        if not 0 < limit <= MAX_DUPLICATES:
+            raise ValueError(f"'limit' must be between 1 and {MAX_DUPLICATES}")
+
+        signature: array | None = self.__hasher.signature(content)
+        if signature is None:
+            return []
+        return self.__index.query(signature, self.threshold, limit, exclude=(exclude,) if exclude else ())
+
+    def match(self, claim_id: str, content: str | None = None, limit: int = 5) -> List[Match]:
+        """
+        The indexed near-duplicates of a claim, without touching the database
+
+        :param content: the content of the claim, only hashed if the claim is not indexed in this worker
+        :raises ValueError: if the limit is out of range
+        """
+        if not 0 < limit <= MAX_DUPLICATES:
+            raise ValueError(f"'limit' must be between 1 and {MAX_DUPLICATES}")
+
+        self.refresh()
+        signature: array | None = self.__index.signature(claim_id)
+        if signature is None and content:
+            signature = self.__hasher.signature(content)
+        if signature is None:
+            return []
+        return self.__index.query(signature, self.threshold, limit, exclude=(claim_id,))
+
+    async def load_duplicates(self, matches: List[List[Match]]) -> List[List[tuple[Claim, float]]]:
+        """
+        Load the matched claims of several lookups with a single query
+
+        :return: per lookup the claims that still exist with their estimated similarity, most similar first
+        """
+        claims: dict[str, Claim] = {claim.uid: claim for claim in await self.duplicate_repository.get_claims(
+            list(dict.fromkeys(match.key for claim_matches in matches for match in claim_matches)))}
+        return [[(claims[match.key], match.similarity) for match in claim_matches if match.key in claims]
+                for claim_matches in matches]
+
+    async def get_possible_duplicates(self, claim_id: str, content: str | None = None,
+                                      limit: int = 5) -> List[tuple[Claim, float]]:
+        """
+        :param content: the content of the claim, only hashed if the claim is not indexed in this worker
+        :return: the near-duplicates of the claim with their estimated similarity, most similar first
+        """
+        duplicates, = await self.load_duplicates([self.match(claim_id, content, limit)])
+        return duplicates
+
+
+duplicate_service: DuplicateService = DuplicateService(
+    get_duplicate_repository(),
+    threshold=float(os.getenv("CLAIM_DUPLICATE_THRESHOLD") or DEFAULT_THRESHOLD),
+    ttl=float(os.getenv("CLAIM_DUPLICATE_TTL") or DEFAULT_TTL),
+)
+
+
+def get_duplicate_service() -> DuplicateService:
+    return duplicate_service
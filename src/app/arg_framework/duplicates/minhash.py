@@ -0,0 +1,146 @@
+import random
+import re
+from array import array
+from dataclasses import dataclass
+from typing import Iterable
+
+_WORD = re.compile(r"\w+")
+# Mersenne prime of the universal hash family, shingle hashes are reduced to 61 bits below it
+_PRIME: int = (1 << 61) - 1
+# Values within a bin stay below this bound, so a borrowed minimum never equals an own one
+_BIN_RANGE: int = 1 << 40
+
+SHINGLE_SIZE: int = 5
+NUM_PERMUTATIONS: int = 64
+# BANDS * ROWS == NUM_PERMUTATIONS. Texts become candidates from a Jaccard similarity of about (1/BANDS)^(1/ROWS),
+# here 0.5, and almost surely from 0.7 on.
+BANDS: int = 16
+ROWS: int = 4
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> set[str]:
+    """
+    The overlapping character n-grams of the normalized text: lowercase words separated by single spaces, so case,
+    punctuation and whitespace do not tell texts apart
+    """
+    normalized: str = " ".join(_WORD.findall(text.lower()))
+    if len(normalized) <= size:
+        return {normalized} if normalized else set()
+    return {normalized[i:i + size] for i in range(len(normalized) - size + 1)}
+
+
+class MinHasher:
+    """
+    One-permutation MinHash signatures: the shingle hashes are split by value into 'permutations' bins and each
+    position keeps the minimum of its bin, which costs one pass over the shingles instead of one per position. Empty
+    bins borrow the minimum of the next non-empty bin, offset by the distance, so short texts still compare evenly. The
+    share of equal positions of two signatures estimates the Jaccard similarity of the shingle sets.
+
+    Shingles are hashed with the builtin string hash, so signatures are only comparable within one process.
+    """
+
+    def __init__(self, permutations: int = NUM_PERMUTATIONS, seed: int = 1):
+        generator: random.Random = random.Random(seed)
+        self.permutations: int = permutations
+        # A random affine map spreads the builtin hashes evenly over the bins
+        self.__a: int = generator.randrange(1, _PRIME)
+        self.__b: int = generator.randrange(0, _PRIME)
+
+    def signature(self, text: str) -> array | None:
+        """:return: the signature or None if the text has no words"""
+        bins: list[int | None] = [None] * self.permutations
+        for shingle in shingles(text):
+            position, value = divmod((self.__a * (hash(shingle) & _PRIME) + self.__b) % _PRIME, _BIN_RANGE)
+            position %= self.permutations
+            if bins[position] is None or value < bins[position]:
+                bins[position] = value
+
+        if all(value is None for value in bins):
+            return None
+
+        signature: array = array("Q", [0] * self.permutations)
+        for position in range(self.permutations):
+            distance: int = 0
+            while bins[(position + distance) % self.permutations] is None:
+                distance += 1
+            signature[position] = bins[(position + distance) % self.permutations] + distance * _BIN_RANGE
+        return signature
+
+
+def similarity(a: array, b: array) -> float:
+    """The estimated Jaccard similarity of the texts of two signatures"""
+    return sum(1 for x, y in zip(a, b) if x == y) / len(a)
+
+
+@dataclass(frozen=True)
+class Match:
+    key: str
+    similarity: float
+
+
+class LSHIndex:
+    """
+    Locality-sensitive hashing of MinHash signatures: each signature is cut into 'bands' of 'rows' values and filed
+    under one bucket per band. Similar signatures share a bucket with high probability, so a lookup only compares the
+    few signatures in the buckets of the query instead of every indexed one.
+    """
+
+    def __init__(self, bands: int = BANDS, rows: int = ROWS):
+        self.bands: int = bands
+        self.rows: int = rows
+        self.__signatures: dict[str, array] = {}
+        self.__buckets: list[dict[int, set[str]]] = [{} for _ in range(bands)]
+
+    def __len__(self) -> int:
+        return len(self.__signatures)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.__signatures
+
+    def signature(self, key: str) -> array | None:
+        return self.__signatures.get(key)
+
+    def __band_keys(self, signature: array) -> list[int]:
+        return [hash(tuple(signature[band * self.rows:(band + 1) * self.rows])) for band in range(self.bands)]
+
+    def add(self, key: str, signature: array) -> None:
+        """Index a signature under a key, replacing the one indexed under the key before"""
+        if len(signature) != self.bands * self.rows:
+            raise ValueError(f"Signatures need {self.bands * self.rows} values, got {len(signature)}")
+        self.remove(key)
+
+        self.__signatures[key] = signature
+        for buckets, band_key in zip(self.__buckets, self.__band_keys(signature)):
+            buckets.setdefault(band_key, set()).add(key)
+
+    def remove(self, key: str) -> None:
+        signature: array | None = self.__signatures.pop(key, None)
+        if signature is None:
+            return
+
+        for buckets, band_key in zip(self.__buckets, self.__band_keys(signature)):
+            bucket: set[str] = buckets[band_key]
+            bucket.discard(key)
+            if not bucket:
+                del buckets[band_key]
+
+    def clear(self) -> None:
+        self.__signatures.clear()
+        for buckets in self.__buckets:
+            buckets.clear()
+
+    def query(self, signature: array, threshold: float, limit: int, exclude: Iterable[str] = ()) -> list[Match]:
+        """
+        :param threshold: the minimum estimated similarity of a match
+        :param exclude: keys that are never returned, such as the key of the queried text itself
+        :return: the most similar indexed keys, best first
+        """
+        candidates: set[str] = set()
+        for buckets, band_key in zip(self.__buckets, self.__band_keys(signature)):
+            candidates.update(buckets.get(band_key, ()))
+        candidates.difference_update(exclude)
+
+        matches: list[Match] = [Match(key, score) for key in candidates
+                                if (score := similarity(signature, self.__signatures[key])) >= threshold]
+        matches.sort(key=lambda match: (-match.similarity, match.key))
+        return matches[:limit]
@@ -13,6 +13,9 @@ class Evidence(BaseNode):
     supports = AsyncRelationshipTo('src.app.arg_framework.premise.premise.Premise', 'SUPPORTS')
     counters = AsyncRelationshipTo('src.app.arg_framework.premise.premise.Premise', 'COUNTERS')
 
+    counted_relationships = {"supports": "support_count", "counters": "counter_count"}
+    fulltext_properties = ("content", "source")
+
 
 class EvidenceTypeEnum(Enum):
     SUPPORTS = auto()
@@ -2,10 +2,14 @@ from typing import List
 from uuid import UUID
 
 from strawberry import Info, mutation, type, field
+from strawberry.types.nodes import Selection
 
 from src.app.arg_framework.evidence.evidence import Evidence
 from src.app.arg_framework.evidence.evidence_schema import EvidenceIn, EvidenceType, EvidenceUpdateIn, AddressPremisesIn
 from src.app.arg_framework.evidence.evidence_service import EvidenceService, get_evidence_service
+from src.app.connection import Connection, ListFilterIn
+from src.infra.db.pagination import PageQuery, Page
+from src.infra.db.query_planner import QueryPlanner, PlannedNodes
 
 evidence_service: EvidenceService = get_evidence_service()
 
@@ -13,13 +17,18 @@ evidence_service: EvidenceService = get_evidence_service()
 @type
 class EvidenceQueries:
     @field
-    async def all_evidence(self) -> List[EvidenceType]:
-        evidence_nodes: List[Evidence] = await evidence_service.get_all_evidence()
-        return [EvidenceType.from_node(evidence_node) for evidence_node in evidence_nodes]
+    async def all_evidence(self, info: Info, first: int = 20, after: str | None = None,
+                           filters: ListFilterIn | None = None) -> Connection[EvidenceType]:
+        selections: List[Selection] = QueryPlanner.selections(info, "edges", "node")
+        page: Page = await evidence_service.get_evidence_page(selections, PageQuery(first=first, after=after),
+                                                              **vars(filters or ListFilterIn()))
+        return Connection.from_nodes(info.context.relationship_loader.prime(page.planned), page.has_next_page,
+                                     EvidenceType.from_node)
 
     @field
-    async def evidence_by_id(self, evidence_id: UUID) -> EvidenceType:
-        evidence_node: Evidence = await evidence_service.get_evidence(evidence_id)
+    async def evidence_by_id(self, info: Info, evidence_id: UUID) -> EvidenceType:
+        planned: PlannedNodes = await evidence_service.get_evidence_planned(evidence_id, QueryPlanner.selections(info))
+        evidence_node: Evidence = info.context.relationship_loader.prime(planned)[0]
         return EvidenceType.from_node(evidence_node)
 
 
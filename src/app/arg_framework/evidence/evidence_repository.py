@@ -4,29 +4,38 @@ from uuid import UUID
 
 from neomodel import adb
 from neomodel.exceptions import UniqueProperty, DoesNotExist
+from strawberry.types.nodes import Selection
 
 from src.app.arg_framework.evidence.evidence import Evidence
-from src.app.user.user import User
+from src.app.townsquare.townsquare_scope import townsquare_scope
 from src.infra.db.crud_repository_interface import ICRUDRepository
 from src.infra.db.db_types import GraphDataTypes as types
 from src.infra.db.graph_repository_interface import IGraphRepository
+from src.infra.db.pagination import PageQuery, Page
+from src.infra.db.query_planner import QueryPlanner, PlannedNodes
 
 
 class EvidenceRepository(IGraphRepository, ICRUDRepository):
-    async def create(self, new_evidence: Evidence, author: User) -> Evidence:
+    townsquare_scope: str = townsquare_scope("Evidence")
+    author_relationship: str = "AUTHORED_BY"
+    database_constraints: dict = {
+        "node": {
+            "uid":     ("unique", "required", types.STRING),
+            "content": ("unique", "required", types.STRING),
+        },
+        "indexes": [("created_at", "uid")],
+        "fulltext": Evidence.fulltext_properties,
+    }
+
+    async def create(self, new_evidence: Evidence, relationships: List[tuple[str, UUID]]) -> Evidence:
         try:
-            new_evidence = await new_evidence.save()
-            await new_evidence.author.connect(author)
-            return new_evidence
+            return await self.create_connected(new_evidence, relationships)
 
         except UniqueProperty:
             raise ValueError(f"Evidence '{new_evidence}' already exists")
 
     async def get(self, evidence_id: UUID) -> Evidence:
-        if evidence_id is UUID:
-            evidence_id = evidence_id.hex
-
-        evidence: Evidence | None = await Evidence.nodes.get_or_none(uid=evidence_id)
+        evidence: Evidence | None = await self.get_node(Evidence, evidence_id)
         if not evidence:
             raise LookupError(f"The Evidence with ID '{evidence_id}' not found in the Database")
         return evidence
@@ -34,18 +43,25 @@ class EvidenceRepository(IGraphRepository, ICRUDRepository):
     async def get_all(self) -> List[Evidence]:
         return await Evidence.nodes.all()
 
+    async def get_planned(self, evidence_id: UUID, selections: List[Selection]) -> PlannedNodes:
+        planned: PlannedNodes = await QueryPlanner(Evidence).fetch(selections, where="WHERE n.uid = $uid",
+                                                                   params={"uid": evidence_id.hex})
+        if not planned.nodes:
+            raise LookupError(f"The Evidence with ID '{evidence_id}' not found in the Database")
+        return planned
+
+    async def get_page(self, selections: List[Selection], page: PageQuery, **filters) -> Page:
+        return await self.paginate(Evidence, selections, page, **filters)
+
     async def update(self, evidence_id: UUID, **kwargs) -> Evidence:
         try:
-            evidence: Evidence = await self.get(evidence_id)
+            evidence, previous = await self.update_properties(Evidence, evidence_id, kwargs)
+            for key, old_value in previous.items():
+                logging.info(f"Updating {key}: '{old_value}' --> '{kwargs[key]}'")
 
-            for key, value in kwargs.items():
-                if value is not None:
-                    old_value = getattr(evidence, key)
-                    setattr(evidence, key, value)
-                    logging.info(f"Updating {key}: '{old_value}' --> '{value}'")
-
-            async with adb.transaction:
-                return await evidence.save()
+            self.invalidate(evidence_id)
+            self.write_through(evidence)
+            return evidence
 
         except DoesNotExist as e:
             logging.error(f"The Evidence with ID '{evidence_id}' not found in the Database: {str(e)}")
@@ -59,23 +75,18 @@ class EvidenceRepository(IGraphRepository, ICRUDRepository):
 
     async def delete(self, evidence_id: UUID) -> str:
         try:
-            evidence: Evidence = await self.get(evidence_id)
             async with adb.transaction:
+                evidence: Evidence = await self.get_for_write(Evidence, evidence_id)
+                await self.release_counters(evidence)
                 await evidence.delete()
-                return f"Evidence with ID '{evidence_id}' successfully deleted"
+
+            self.invalidate(evidence_id)
+            self.invalidate_lists(Evidence)
+            return f"Evidence with ID '{evidence_id}' successfully deleted"
         except DoesNotExist as e:
             logging.error(f"The Evidence with ID '{evidence_id}' not found in the Database: {str(e)}")
             raise LookupError(f"The Evidence with ID '{evidence_id}' not found in the Database") from e
 
-    async def add_database_constraints(self, label: str, constraints: dict = None):
-        constraints: dict = {
-            "node": {
-                "uid":     ("unique", "required", types.STRING),
-                "content": ("unique", "required", types.STRING),
-            }
-        }
-        await super().add_database_constraints(label, constraints)
-
 
 def get_evidence_repository() -> EvidenceRepository:
     return EvidenceRepository()
@@ -1,7 +1,7 @@
 from typing import TYPE_CHECKING, Annotated, List
 from uuid import UUID
 
-from strawberry import type, lazy, Private, field, input, enum
+from strawberry import type, lazy, Private, field, input, enum, Info
 
 from src.app.arg_framework.evidence.evidence import Evidence
 from src.app.arg_framework.evidence.evidence import EvidenceTypeEnum
@@ -9,7 +9,7 @@ from src.app.base_node import BaseNodeType, MetaType
 
 if TYPE_CHECKING:
     from src.app.user.user_schema import UserType
-    from src.app.arg_framework.claim.claim_schema import ClaimType
+    from src.app.arg_framework.premise.premise_schema import PremiseType
 
 
 @type(name="Evidence")
@@ -20,20 +20,26 @@ class EvidenceType(BaseNodeType):
     source: str
 
     @field
-    async def author(self) -> Annotated["UserType", lazy("src.app.user.user_schema")]:
+    async def author(self, info: Info) -> Annotated["UserType", lazy("src.app.user.user_schema")]:
         from src.app.user.user_schema import UserType
 
-        return UserType.from_node(await self.node_instance.author.single())
+        return UserType.from_node(await info.context.relationship_loader.load_single(self.node_instance, "author"))
 
     @field
-    async def supports(self) -> List[Annotated["ClaimType", lazy("src.app.arg_framework.claim.claim_schema")]]:
+    async def supports(self, info: Info) -> List[
+        Annotated["PremiseType", lazy("src.app.arg_framework.premise.premise_schema")]]:
         from src.app.arg_framework.premise.premise_schema import PremiseType
-        return [PremiseType.from_node(premise_node) for premise_node in await self.node_instance.supports.all()]
+
+        return [PremiseType.from_node(premise_node) for premise_node in
+                await info.context.relationship_loader.load(self.node_instance, "supports")]
 
     @field
-    async def counters(self) -> List[Annotated["ClaimType", lazy("src.app.arg_framework.claim.claim_schema")]]:
+    async def counters(self, info: Info) -> List[
+        Annotated["PremiseType", lazy("src.app.arg_framework.premise.premise_schema")]]:
         from src.app.arg_framework.premise.premise_schema import PremiseType
-        return [PremiseType.from_node(premise_node) for premise_node in await self.node_instance.counters.all()]
+
+        return [PremiseType.from_node(premise_node) for premise_node in
+                await info.context.relationship_loader.load(self.node_instance, "counters")]
 
     @classmethod
     def from_node(cls, node: Evidence) -> "EvidenceType":
@@ -4,46 +4,71 @@ from typing import List
 from uuid import UUID
 
 from neomodel import adb
+from strawberry.types.nodes import Selection
 
 from src.app.arg_framework.IAddressable import IAddressable
+from src.app.activity.activity_service import ActivityService, get_activity_service
 from src.app.arg_framework.IOwnable import IOwnable
+from src.app.arg_framework.acceptability.acceptability_service import AcceptabilityService, get_acceptability_service
 from src.app.arg_framework.evidence.evidence import Evidence, EvidenceTypeEnum
 from src.app.arg_framework.evidence.evidence_repository import EvidenceRepository, get_evidence_repository
 from src.app.arg_framework.premise.premise import Premise
 from src.app.arg_framework.premise.premise_repository import PremiseRepository, get_premise_repository
 from src.app.user.user import User
 from src.app.user.user_repository import UserRepository, get_user_repository
+from src.infra.db.pagination import PageQuery, Page
+from src.infra.db.query_planner import PlannedNodes
+
+# Evidence relationship attribute for each way Evidence can address a Premise
+EVIDENCE_RELATIONSHIPS: dict[EvidenceTypeEnum, str] = {
+    EvidenceTypeEnum.SUPPORTS: "supports",
+    EvidenceTypeEnum.COUNTERS: "counters",
+}
 
 
 class EvidenceService(IAddressable, IOwnable):
     def __init__(self, evidence_repository: EvidenceRepository, user_repository: UserRepository,
-                 premise_repository: PremiseRepository):
+                 premise_repository: PremiseRepository, acceptability_service: AcceptabilityService,
+                 activity_service: ActivityService):
         self.evidence_repository: EvidenceRepository = evidence_repository
         self.user_repository: UserRepository = user_repository
         self.premise_repository: PremiseRepository = premise_repository
+        self.acceptability_service: AcceptabilityService = acceptability_service
+        self.activity_service: ActivityService = activity_service
 
     async def create_evidence(self, content: str, source: str, author_id: UUID, premises: dict) -> Evidence:
         async with adb.transaction:
             try:
                 new_evidence: Evidence = Evidence(created_at=datetime.now(), content=content, source=source)
-                author: User = await self.user_repository.get(author_id)
-                new_evidence: Evidence = await self.evidence_repository.create(new_evidence, author)
+                targets: List[tuple[str, UUID]] = [("author", author_id)]
 
                 for premise_id, relationship_type in premises.items():
-                    await self.address_node(new_evidence, premise_id, relationship_type)
+                    if relationship_type not in EVIDENCE_RELATIONSHIPS:
+                        raise ValueError(f"Invalid relationship type: {relationship_type}")
+                    targets.append((EVIDENCE_RELATIONSHIPS[relationship_type], premise_id))
 
-                return new_evidence
+                new_evidence = await self.evidence_repository.create(new_evidence, targets)
+                await self.acceptability_service.update_for_premises(premises.keys())
             except LookupError as e:
-                raise ValueError(f"Node not found") from e
+                raise ValueError(f"Node not found: {str(e)}") from e
             except ValueError as e:
                 raise e
 
+        await self.activity_service.publish_created(new_evidence)
+        return new_evidence
+
     async def get_evidence(self, evidence_id: UUID) -> Evidence:
         return await self.evidence_repository.get(evidence_id)
 
     async def get_all_evidence(self) -> List[Evidence]:
         return await self.evidence_repository.get_all()
 
+    async def get_evidence_planned(self, evidence_id: UUID, selections: List[Selection]) -> PlannedNodes:
+        return await self.evidence_repository.get_planned(evidence_id, selections)
+
+    async def get_evidence_page(self, selections: List[Selection], page: PageQuery, **filters) -> Page:
+        return await self.evidence_repository.get_page(selections, page, **filters)
+
     async def update_evidence(self, evidence_id: UUID, **kwargs) -> Evidence:
         return await self.evidence_repository.update(evidence_id, **kwargs)
 
@@ -59,7 +84,12 @@ class EvidenceService(IAddressable, IOwnable):
                 raise e
 
     async def delete_evidence(self, claim_id: UUID) -> str:
-        return await self.evidence_repository.delete(claim_id)
+        evidence: Evidence = await self.evidence_repository.get(claim_id)
+        premises: List[Premise] = await evidence.supports.all() + await evidence.counters.all()
+        message: str = await self.evidence_repository.delete(claim_id)
+
+        await self.acceptability_service.update_for_premises([premise.uid for premise in premises])
+        return message
 
     async def address_node(self, source_node: UUID | Evidence, target_node_id: UUID,
                            relationship_type: Enum | None = None) -> Evidence:
@@ -68,13 +98,12 @@ class EvidenceService(IAddressable, IOwnable):
 
         target_premise: Premise = await self.premise_repository.get(target_node_id)
 
-        if relationship_type == EvidenceTypeEnum.SUPPORTS:
-            await source_node.supports.connect(target_premise)
-        elif relationship_type == EvidenceTypeEnum.COUNTERS:
-            await source_node.counters.connect(target_premise)
-        else:
+        if relationship_type not in EVIDENCE_RELATIONSHIPS:
             raise ValueError(f"Invalid relationship type: {relationship_type}")
+        await self.evidence_repository.connect_counted(source_node, EVIDENCE_RELATIONSHIPS[relationship_type],
+                                                       target_node_id)
 
+        await self.acceptability_service.update_for_premises([target_premise.uid])
         return source_node
 
     async def disconnect_node(self, source_node: UUID | Evidence, target_node_id: UUID) -> Evidence:
@@ -83,13 +112,13 @@ class EvidenceService(IAddressable, IOwnable):
 
         target_premise: Premise = await self.premise_repository.get(target_node_id)
 
-        if target_premise in await source_node.supports.all():
-            await source_node.supports.disconnect(target_premise)
-        elif target_premise in await source_node.counters.all():
-            await source_node.counters.disconnect(target_premise)
+        for relationship in EVIDENCE_RELATIONSHIPS.values():
+            if await self.evidence_repository.disconnect_counted(source_node, relationship, target_node_id):
+                break
         else:
             raise ValueError("Relationship between the source node and target node not found or invalid")
 
+        await self.acceptability_service.update_for_premises([target_premise.uid])
         return source_node
 
     async def check_ownership(self, user_id: UUID, evidence_id: UUID) -> bool:
@@ -104,4 +133,5 @@ class EvidenceService(IAddressable, IOwnable):
 
 
 def get_evidence_service() -> EvidenceService:
-    return EvidenceService(get_evidence_repository(), get_user_repository(), get_premise_repository())
+    return EvidenceService(get_evidence_repository(), get_user_repository(), get_premise_repository(),
+                           get_acceptability_service(), get_activity_service())
@@ -1,11 +1,16 @@
-from neomodel import StringProperty, AsyncRelationshipFrom, AsyncRelationshipTo, AsyncOne
+from neomodel import StringProperty, AsyncRelationshipFrom, AsyncRelationshipTo, AsyncOne, IntegerProperty
 
 from src.app.base_node import BaseNode
 
 
 class Premise(BaseNode):
     content = StringProperty(required=True)
+    support_count = IntegerProperty(default=0)
+    counter_count = IntegerProperty(default=0)
     author = AsyncRelationshipTo('src.app.user.user.User', 'AUTHORED_BY', cardinality=AsyncOne)
 
     claims = AsyncRelationshipFrom('src.app.arg_framework.claim.claim.Claim', 'HAS_PREMISE')
     evidence = AsyncRelationshipFrom('src.app.arg_framework.evidence.evidence.Evidence', 'SUPPORTS')
+
+    counted_relationships = {"claims": "premise_count"}
+    fulltext_properties = ("content",)
@@ -2,10 +2,14 @@ from typing import List
 from uuid import UUID
 
 from strawberry import type, field, mutation, Info
+from strawberry.types.nodes import Selection
 
 from src.app.arg_framework.premise.premise import Premise
 from src.app.arg_framework.premise.premise_schema import PremiseType, PremiseIn, PremiseUpdateIn
 from src.app.arg_framework.premise.premise_service import PremiseService, get_premise_service
+from src.app.connection import Connection, ListFilterIn
+from src.infra.db.pagination import PageQuery, Page
+from src.infra.db.query_planner import QueryPlanner, PlannedNodes
 
 premise_service: PremiseService = get_premise_service()
 
@@ -13,13 +17,18 @@ premise_service: PremiseService = get_premise_service()
 @type
 class PremiseQueries:
     @field
-    async def all_premises(self) -> List[PremiseType]:
-        premise_nodes: List[Premise] = await premise_service.get_all_premises()
-        return [PremiseType.from_node(premise_node) for premise_node in premise_nodes]
+    async def all_premises(self, info: Info, first: int = 20, after: str | None = None,
+                           filters: ListFilterIn | None = None) -> Connection[PremiseType]:
+        selections: List[Selection] = QueryPlanner.selections(info, "edges", "node")
+        page: Page = await premise_service.get_premises_page(selections, PageQuery(first=first, after=after),
+                                                             **vars(filters or ListFilterIn()))
+        return Connection.from_nodes(info.context.relationship_loader.prime(page.planned), page.has_next_page,
+                                     PremiseType.from_node)
 
     @field
-    async def premise_by_id(self, premise_id: UUID) -> PremiseType:
-        premise_node: Premise = await premise_service.get_premise(premise_id)
+    async def premise_by_id(self, info: Info, premise_id: UUID) -> PremiseType:
+        planned: PlannedNodes = await premise_service.get_premise_planned(premise_id, QueryPlanner.selections(info))
+        premise_node: Premise = info.context.relationship_loader.prime(planned)[0]
         return PremiseType.from_node(premise_node)
 
 
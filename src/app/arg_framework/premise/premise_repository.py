@@ -1,31 +1,41 @@
+import logging
 from typing import List
 from uuid import UUID
 
 from neomodel import adb
 from neomodel.exceptions import UniqueProperty, DoesNotExist
+from strawberry.types.nodes import Selection
 
 from src.app.arg_framework.premise.premise import Premise
-from src.app.user.user import User
+from src.app.townsquare.townsquare_scope import townsquare_scope
 from src.infra.db.crud_repository_interface import ICRUDRepository
 from src.infra.db.db_types import GraphDataTypes as types
 from src.infra.db.graph_repository_interface import IGraphRepository
+from src.infra.db.pagination import PageQuery, Page
+from src.infra.db.query_planner import QueryPlanner, PlannedNodes
 
 
 class PremiseRepository(ICRUDRepository, IGraphRepository):
-    async def create(self, new_premise: Premise, author: User) -> Premise:
+    townsquare_scope: str = townsquare_scope("Premise")
+    author_relationship: str = "AUTHORED_BY"
+    database_constraints: dict = {
+        "node": {
+            "uid":     ("unique", "required", types.STRING),
+            "content": ("unique", "required", types.STRING),
+        },
+        "indexes": [("created_at", "uid")],
+        "fulltext": Premise.fulltext_properties,
+    }
+
+    async def create(self, new_premise: Premise, relationships: List[tuple[str, UUID]]) -> Premise:
         try:
-            new_premise = await new_premise.save()
-            await new_premise.author.connect(author)
-            return new_premise
+            return await self.create_connected(new_premise, relationships)
 
         except UniqueProperty:
             raise ValueError(f"Premise '{new_premise}' already exists")
 
     async def get(self, premise_id: UUID) -> Premise:
-        if type(premise_id) is UUID:
-            premise_id = premise_id.hex
-
-        premise: Premise | None = await Premise.nodes.get_or_none(uid=premise_id)
+        premise: Premise | None = await self.get_node(Premise, premise_id)
         if not premise:
             raise LookupError(f"The Premise with ID '{premise_id}' not found in the Database")
         return premise
@@ -33,18 +43,25 @@ class PremiseRepository(ICRUDRepository, IGraphRepository):
     async def get_all(self) -> List[Premise]:
         return await Premise.nodes.all()
 
+    async def get_planned(self, premise_id: UUID, selections: List[Selection]) -> PlannedNodes:
+        planned: PlannedNodes = await QueryPlanner(Premise).fetch(selections, where="WHERE n.uid = $uid",
+                                                                  params={"uid": premise_id.hex})
+        if not planned.nodes:
+            raise LookupError(f"The Premise with ID '{premise_id}' not found in the Database")
+        return planned
+
+    async def get_page(self, selections: List[Selection], page: PageQuery, **filters) -> Page:
+        return await self.paginate(Premise, selections, page, **filters)
+
     async def update(self, premise_id: UUID, **kwargs) -> Premise:
         try:
-            premise: Premise = await self.get(premise_id)
+            premise, previous = await self.update_properties(Premise, premise_id, kwargs)
+            for key, old_value in previous.items():
+                logging.info(f"Updating {key}: '{old_value}' --> '{kwargs[key]}'")
 
-            for key, value in kwargs.items():
-                if value is not None:
-                    old_value = getattr(premise, key)
-                    setattr(premise, key, value)
-                    logging.info(f"Updating {key}: '{old_value}' --> '{value}'")
-
-            async with adb.transaction:
-                return await premise.save()
+            self.invalidate(premise_id)
+            self.write_through(premise)
+            return premise
 
         except DoesNotExist as e:
             logging.error(f"The Premise with ID '{premise_id}' not found in the Database: {str(e)}")
@@ -58,24 +75,19 @@ class PremiseRepository(ICRUDRepository, IGraphRepository):
 
     async def delete(self, premise_id: UUID) -> str:
         try:
-            premise: Premise = await self.get(premise_id)
             async with adb.transaction:
+                premise: Premise = await self.get_for_write(Premise, premise_id)
+                await self.release_counters(premise)
                 await premise.delete()
-                return f"Premise '{premise_id}' deleted"
+
+            self.invalidate(premise_id)
+            self.invalidate_lists(Premise)
+            return f"Premise '{premise_id}' deleted"
 
         except DoesNotExist as e:
             logging.error(f"The Premise with ID '{premise_id}' not found in the Database: {str(e)}")
             raise LookupError(f"The Premise with ID '{premise_id}' not found in the Database") from e
 
-    async def add_database_constraints(self, label: str, constraints: dict = None):
-        constraints: dict = {
-            "node": {
-                "uid":     ("unique", "required", types.STRING),
-                "content": ("unique", "required", types.STRING),
-            }
-        }
-        return await super().add_database_constraints(label, constraints)
-
 
 def get_premise_repository() -> PremiseRepository:
     return PremiseRepository()
@@ -1,7 +1,7 @@
 from typing import TYPE_CHECKING, Annotated, List
 from uuid import UUID
 
-from strawberry import type, lazy, Private, field, input
+from strawberry import type, lazy, Private, field, input, Info
 
 from src.app.arg_framework.premise.premise import Premise
 from src.app.base_node import BaseNodeType, MetaType
@@ -17,24 +17,30 @@ class PremiseType(BaseNodeType):
     node_instance: Private[Premise]
 
     content: str
+    support_count: int = 0
+    counter_count: int = 0
 
     @field
-    async def author(self) -> Annotated["UserType", lazy("src.app.user.user_schema")]:
+    async def author(self, info: Info) -> Annotated["UserType", lazy("src.app.user.user_schema")]:
         from src.app.user.user_schema import UserType
 
-        return UserType.from_node(await self.node_instance.author.single())
+        return UserType.from_node(await info.context.relationship_loader.load_single(self.node_instance, "author"))
 
     @field
-    async def claims(self) -> List[Annotated["ClaimType", lazy("src.app.arg_framework.claim.claim_schema")]]:
+    async def claims(self, info: Info) -> List[
+        Annotated["ClaimType", lazy("src.app.arg_framework.claim.claim_schema")]]:
         from src.app.arg_framework.claim.claim_schema import ClaimType
 
-        return [ClaimType.from_node(claim_node) for claim_node in await self.node_instance.claims.all()]
+        return [ClaimType.from_node(claim_node) for claim_node in
+                await info.context.relationship_loader.load(self.node_instance, "claims")]
 
     @field
-    async def evidence(self) -> List[Annotated["EvidenceType", lazy("src.app.arg_framework.evidence.evidence_schema")]]:
+    async def evidence(self, info: Info) -> List[
+        Annotated["EvidenceType", lazy("src.app.arg_framework.evidence.evidence_schema")]]:
         from src.app.arg_framework.evidence.evidence_schema import EvidenceType
 
-        return [EvidenceType.from_node(evidence_node) for evidence_node in await self.node_instance.evidence.all()]
+        return [EvidenceType.from_node(evidence_node) for evidence_node in
+                await info.context.relationship_loader.load(self.node_instance, "evidence")]
 
     @classmethod
     def from_node(cls, node: Premise) -> "PremiseType":
@@ -42,7 +48,9 @@ class PremiseType(BaseNodeType):
             node_instance=node,
 
             meta=MetaType(uid=node.uid, created_at=node.created_at),
-            content=node.content
+            content=node.content,
+            support_count=node.support_count or 0,
+            counter_count=node.counter_count or 0,
         )
 
 
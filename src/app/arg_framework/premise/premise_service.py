@@ -4,53 +4,72 @@ from typing import List
 from uuid import UUID
 
 from neomodel import adb, AsyncStructuredNode
+from strawberry.types.nodes import Selection
 
 from src.app.arg_framework.IAddressable import IAddressable
+from src.app.activity.activity_service import ActivityService, get_activity_service
 from src.app.arg_framework.IOwnable import IOwnable
+from src.app.arg_framework.acceptability.acceptability_service import AcceptabilityService, get_acceptability_service
 from src.app.arg_framework.claim.claim import Claim
 from src.app.arg_framework.claim.claim_repository import ClaimRepository, get_claim_repository
 from src.app.arg_framework.premise.premise import Premise
 from src.app.arg_framework.premise.premise_repository import PremiseRepository, get_premise_repository
 from src.app.user.user import User
 from src.app.user.user_repository import UserRepository, get_user_repository
+from src.infra.db.pagination import PageQuery, Page
+from src.infra.db.query_planner import PlannedNodes
 
 
 class PremiseService(IOwnable, IAddressable):
     def __init__(self, premise_repository: PremiseRepository, user_repository: UserRepository,
-                 claim_repository: ClaimRepository):
+                 claim_repository: ClaimRepository, acceptability_service: AcceptabilityService,
+                 activity_service: ActivityService):
         self.premise_repository: PremiseRepository = premise_repository
         self.user_repository: UserRepository = user_repository
         self.claim_repository: ClaimRepository = claim_repository
+        self.acceptability_service: AcceptabilityService = acceptability_service
+        self.activity_service: ActivityService = activity_service
 
     async def create_premise(self, content: str, author_id: UUID, claim_ids: List[UUID]) -> Premise:
         async with adb.transaction:
             try:
                 new_premise: Premise = Premise(created_at=datetime.now(), content=content)
-                author: User = await self.user_repository.get(author_id)
+                targets: List[tuple[str, UUID]] = [("author", author_id)]
+                targets.extend(("claims", claim_id) for claim_id in claim_ids)
 
-                new_premise: Premise = await self.premise_repository.create(new_premise, author)
-
-                for claim_id in claim_ids:
-                    await self.address_node(new_premise, claim_id)
-
-                return new_premise
+                new_premise = await self.premise_repository.create(new_premise, targets)
+                await self.acceptability_service.update(claim_ids)
 
             except LookupError as e:
-                raise ValueError(f"Node not found") from e
+                raise ValueError(f"Node not found: {str(e)}") from e
             except ValueError as e:
                 raise e
 
+        await self.activity_service.publish_created(new_premise)
+        return new_premise
+
     async def get_premise(self, premise_id: UUID) -> Premise:
         return await self.premise_repository.get(premise_id)
 
     async def get_all_premises(self) -> List[Premise]:
         return await self.premise_repository.get_all()
 
+    async def get_premise_planned(self, premise_id: UUID, selections: List[Selection]) -> PlannedNodes:
+        return await self.premise_repository.get_planned(premise_id, selections)
+
+    async def get_premises_page(self, selections: List[Selection], page: PageQuery, **filters) -> Page:
+        return await self.premise_repository.get_page(selections, page, **filters)
+
     async def update_premise(self, premise_id: UUID, **kwargs) -> Premise:
         return await self.premise_repository.update(premise_id, **kwargs)
 
     async def delete_premise(self, premise_id: UUID) -> str:
-        return await self.premise_repository.delete(premise_id)
+        premise: Premise = await self.get_premise(premise_id)
+        claims: List[Claim] = await premise.claims.all()
+        message: str = await self.premise_repository.delete(premise_id)
+
+        await self.acceptability_service.update([claim.uid for claim in claims])
+        return message
 
     async def check_ownership(self, user_id: UUID, premise_id: UUID) -> bool:
         premise: Premise = await self.get_premise(premise_id)
@@ -70,15 +89,18 @@ class PremiseService(IOwnable, IAddressable):
 
         target_node: Claim = await self.claim_repository.get(target_node_id)
 
-        await source_node.claims.connect(target_node)
+        await self.premise_repository.connect_counted(source_node, "claims", target_node_id)
+        await self.acceptability_service.update([target_node.uid])
         return source_node
 
     async def disconnect_node(self, source_node: Premise, target_node_id: UUID) -> Premise:
         target_node: Claim = await self.claim_repository.get(target_node_id)
 
-        await source_node.claims.disconnect(target_node)
+        await self.premise_repository.disconnect_counted(source_node, "claims", target_node_id)
+        await self.acceptability_service.update([target_node.uid])
         return source_node
 
 
 def get_premise_service() -> PremiseService:
-    return PremiseService(get_premise_repository(), get_user_repository(), get_claim_repository())
+    return PremiseService(get_premise_repository(), get_user_repository(), get_claim_repository(),
+                          get_acceptability_service(), get_activity_service())
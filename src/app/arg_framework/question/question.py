@@ -1,4 +1,5 @@
-from neomodel import StringProperty, AsyncRelationshipTo, AsyncOne, AsyncRelationshipFrom, AsyncZeroOrOne
+from neomodel import StringProperty, AsyncRelationshipTo, AsyncOne, AsyncRelationshipFrom, AsyncZeroOrOne, \
+    IntegerProperty
 
 from src.app.base_node import BaseNode
 
@@ -6,6 +7,7 @@ from src.app.base_node import BaseNode
 class Question(BaseNode):
     question = StringProperty(required=True, unique_index=True)
     description = StringProperty()
+    answer_count = IntegerProperty(default=0)
 
     author = AsyncRelationshipTo('src.app.user.user.User', 'ASKED_BY', cardinality=AsyncOne)
     townsquare = AsyncRelationshipTo('src.app.townsquare.townsquare.Townsquare', 'ASKED_IN', cardinality=AsyncZeroOrOne)
@@ -13,3 +15,7 @@ class Question(BaseNode):
     # Claims
     questions = AsyncRelationshipTo('src.app.arg_framework.claim.claim.Claim', 'QUESTIONS', cardinality=AsyncZeroOrOne)
     answered_by = AsyncRelationshipFrom('src.app.arg_framework.claim.claim.Claim', 'ANSWERS')
+
+    counted_relationships = {"townsquare": "question_count"}
+    fulltext_properties = ("question", "description")
+    derived_relationships = {"accepted_answers": ("answered_by", ("preferred_label", "acceptability_score"))}
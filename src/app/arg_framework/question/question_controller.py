@@ -2,10 +2,15 @@ from typing import List
 from uuid import UUID
 
 from strawberry import type, mutation, field, Info
+from strawberry.types.nodes import Selection
 
 from src.app.arg_framework.question.question import Question
-from src.app.arg_framework.question.question_schema import QuestionType, QuestionIn, QuestionUpdateIn
+from src.app.arg_framework.question.question_schema import QuestionType, QuestionIn, QuestionUpdateIn, \
+    SimilarQuestionType
 from src.app.arg_framework.question.question_service import QuestionService, get_question_service
+from src.app.connection import Connection, ListFilterIn
+from src.infra.db.pagination import PageQuery, Page
+from src.infra.db.query_planner import QueryPlanner, PlannedNodes
 
 question_service: QuestionService = get_question_service()
 
@@ -13,15 +18,26 @@ question_service: QuestionService = get_question_service()
 @type
 class QuestionQueries:
     @field
-    async def all_questions(self) -> List[QuestionType]:
-        question_nodes: List[Question] = await question_service.get_all_questions()
-        return [QuestionType.from_node(question_node) for question_node in question_nodes]
+    async def all_questions(self, info: Info, first: int = 20, after: str | None = None,
+                            filters: ListFilterIn | None = None) -> Connection[QuestionType]:
+        selections: List[Selection] = QueryPlanner.selections(info, "edges", "node")
+        page: Page = await question_service.get_questions_page(selections, PageQuery(first=first, after=after),
+                                                               **vars(filters or ListFilterIn()))
+        return Connection.from_nodes(info.context.relationship_loader.prime(page.planned), page.has_next_page,
+                                     QuestionType.from_node)
 
     @field
-    async def question_by_id(self, question_id: UUID) -> QuestionType:
-        question_node: Question = await question_service.get_question(question_id)
+    async def question_by_id(self, info: Info, question_id: UUID) -> QuestionType:
+        planned: PlannedNodes = await question_service.get_question_planned(question_id, QueryPlanner.selections(info))
+        question_node: Question = info.context.relationship_loader.prime(planned)[0]
         return QuestionType.from_node(question_node)
 
+    @field
+    async def similar_questions(self, text: str, townsquare_id: UUID, k: int = 5) -> List[SimilarQuestionType]:
+        similar: List[tuple[Question, float]] = await question_service.get_similar_questions(text, townsquare_id, k)
+        return [SimilarQuestionType(similarity=similarity, question=QuestionType.from_node(question_node))
+                for question_node, similarity in similar]
+
 
 @type
 class QuestionMutations:
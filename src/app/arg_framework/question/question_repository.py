@@ -4,31 +4,49 @@ from uuid import UUID
 
 from neomodel import adb
 from neomodel.exceptions import UniqueProperty, DoesNotExist
+from strawberry.types.nodes import Selection
 
 from src.app.arg_framework.question.question import Question
 from src.app.townsquare.townsquare import Townsquare
 from src.app.user.user import User
+from src.app.townsquare.townsquare_scope import townsquare_scope
 from src.infra.db.crud_repository_interface import ICRUDRepository
 from src.infra.db.db_types import GraphDataTypes as types
 from src.infra.db.graph_repository_interface import IGraphRepository
+from src.infra.db.pagination import PageQuery, Page
+from src.infra.db.query_planner import QueryPlanner, PlannedNodes
 
 
 class QuestionRepository(IGraphRepository, ICRUDRepository):
+    townsquare_scope: str = townsquare_scope("Question")
+    author_relationship: str = "ASKED_BY"
+    database_constraints: dict = {
+        'node': {
+            'uid':         ("unique", "required", types.STRING),
+            'question': ("unique", "required", types.STRING),
+            'description': ("unique", types.STRING)
+        },
+        "indexes": [("created_at", "uid")],
+        "fulltext": Question.fulltext_properties,
+    }
+
     async def create(self, new_question: Question, author: User, townsquare: Townsquare | None) -> Question:
         try:
             await new_question.save()
             await new_question.author.connect(author)
 
             if townsquare:
-                await new_question.townsquare.connect(townsquare)
+                await self.connect_counted(new_question, "townsquare", townsquare.uid)
 
+            self.invalidate(author.uid)
+            self.invalidate_lists(Question)
             return new_question
 
         except UniqueProperty:
             raise ValueError(f"Question '{new_question.question}' already exists")
 
     async def get(self, question_id: UUID) -> Question:
-        question: Question | None = await Question.nodes.get_or_none(uid=question_id)
+        question: Question | None = await self.get_node(Question, question_id)
         if not question:
             raise LookupError(f"The Question with ID '{question_id}' not found in the Database")
         return question
@@ -36,16 +54,25 @@ class QuestionRepository(IGraphRepository, ICRUDRepository):
     async def get_all(self) -> List[Question]:
         return await Question.nodes.all()
 
+    async def get_planned(self, question_id: UUID, selections: List[Selection]) -> PlannedNodes:
+        planned: PlannedNodes = await QueryPlanner(Question).fetch(selections, where="WHERE n.uid = $uid",
+                                                                   params={"uid": question_id.hex})
+        if not planned.nodes:
+            raise LookupError(f"The Question with ID '{question_id}' not found in the Database")
+        return planned
+
+    async def get_page(self, selections: List[Selection], page: PageQuery, **filters) -> Page:
+        return await self.paginate(Question, selections, page, **filters)
+
     async def update(self, question_id: UUID, **kwargs) -> Question:
         try:
-            question: Question = await self.get(question_id)
-            for key, value in kwargs.items():
-                if value is not None:
-                    old_value = getattr(question, key)
-                    setattr(question, key, value)
-                    logging.info(f"Updating {key}: '{old_value}' --> '{value}'")
-            async with adb.transaction:
-                return await question.save()
+            question, previous = await self.update_properties(Question, question_id, kwargs)
+            for key, old_value in previous.items():
+                logging.info(f"Updating {key}: '{old_value}' --> '{kwargs[key]}'")
+
+            self.invalidate(question_id)
+            self.write_through(question)
+            return question
         except DoesNotExist as e:
             logging.error(f"The Question with ID '{question_id}' not found in the Database: {str(e)}")
             raise LookupError(f"The Question with ID '{question_id}' not found in the Database") from e
@@ -58,10 +85,14 @@ class QuestionRepository(IGraphRepository, ICRUDRepository):
 
     async def delete(self, question_id: UUID) -> str:
         try:
-            question: Question = await self.get(question_id)
             async with adb.transaction:
+                question: Question = await self.get_for_write(Question, question_id)
+                await self.release_counters(question)
                 await question.delete()
-                return f"Question with ID '{question_id}' successfully deleted"
+
+            self.invalidate(question_id)
+            self.invalidate_lists(Question)
+            return f"Question with ID '{question_id}' successfully deleted"
         except DoesNotExist:
             logging.error(f"The Question with ID '{question_id}' not found in the Database")
             raise LookupError(f"The Question with ID '{question_id}' not found in the Database")
@@ -69,16 +100,6 @@ class QuestionRepository(IGraphRepository, ICRUDRepository):
             logging.error(f"Error deleting Question with ID '{question_id}': {str(e)}")
             raise e
 
-    async def add_database_constraints(self, label: str, constraints: dict = None):
-        constraints: dict = {
-            'node': {
-                'uid':         ("unique", "required", types.STRING),
-                'question': ("unique", "required", types.STRING),
-                'description': ("unique", types.STRING)
-            }
-        }
-        await super().add_database_constraints(label, constraints)
-
 
 def get_question_repository():
     return QuestionRepository()
@@ -1,8 +1,9 @@
 from typing import TYPE_CHECKING, Annotated, List
 from uuid import UUID
 
-from strawberry import type, input, lazy, field, Private
+from strawberry import type, input, lazy, field, Private, Info
 
+from src.app.arg_framework.acceptability.acceptability_label import AcceptabilityLabel
 from src.app.arg_framework.question.question import Question
 from src.app.base_node import BaseNodeType, MetaType
 
@@ -19,36 +20,50 @@ class QuestionType(BaseNodeType):
 
     question: str
     description: str | None = None
+    answer_count: int = 0
 
     @field
-    async def author(self) -> Annotated["UserType", lazy("src.app.user.user_schema")]:
+    async def author(self, info: Info) -> Annotated["UserType", lazy("src.app.user.user_schema")]:
         from src.app.user.user_schema import UserType
 
-        author_node: User = await self.node_instance.author.single()
+        author_node: User = await info.context.relationship_loader.load_single(self.node_instance, "author")
         return UserType.from_node(author_node)
 
     @field
-    async def townsquare(self) -> Annotated["TownsquareType", lazy("src.app.townsquare.townsquare_schema")] | None:
+    async def townsquare(self, info: Info) -> Annotated[
+        "TownsquareType", lazy("src.app.townsquare.townsquare_schema")] | None:
         from src.app.townsquare.townsquare_schema import TownsquareType
 
-        townsquare_node = await self.node_instance.townsquare.single()
+        townsquare_node = await info.context.relationship_loader.load_single(self.node_instance, "townsquare")
         return TownsquareType.from_node(townsquare_node) if townsquare_node else None
 
     @field
-    async def questions(self) -> List[Annotated["ClaimType", lazy("src.app.arg_framework.claim.claim_schema")]] | None:
+    async def questions(self, info: Info) -> List[
+        Annotated["ClaimType", lazy("src.app.arg_framework.claim.claim_schema")]] | None:
         from src.app.arg_framework.claim.claim_schema import ClaimType
 
-        claim_nodes: List[Claim] | None = await self.node_instance.questions.all()
+        claim_nodes: List[Claim] | None = await info.context.relationship_loader.load(self.node_instance, "questions")
         return [ClaimType.from_node(claim_node) for claim_node in claim_nodes] if claim_nodes else None
 
     @field
-    async def answered_by(self) -> List[
-                                       Annotated["ClaimType", lazy("src.app.arg_framework.claim.claim_schema")]] | None:
+    async def answered_by(self, info: Info) -> List[
+        Annotated["ClaimType", lazy("src.app.arg_framework.claim.claim_schema")]] | None:
         from src.app.arg_framework.claim.claim_schema import ClaimType
 
-        claim_nodes: List[Claim] | None = await self.node_instance.answered_by.all()
+        claim_nodes: List[Claim] | None = await info.context.relationship_loader.load(self.node_instance, "answered_by")
         return [ClaimType.from_node(claim_node) for claim_node in claim_nodes] if claim_nodes else None
 
+    @field
+    async def accepted_answers(self, info: Info) -> List[
+        Annotated["ClaimType", lazy("src.app.arg_framework.claim.claim_schema")]]:
+        from src.app.arg_framework.claim.claim_schema import ClaimType
+
+        claim_nodes: List[Claim] = await info.context.relationship_loader.load(self.node_instance, "answered_by")
+        accepted: List[Claim] = [claim_node for claim_node in claim_nodes
+                                 if claim_node.preferred_label == AcceptabilityLabel.IN.value]
+        accepted.sort(key=lambda claim_node: claim_node.acceptability_score or 0.0, reverse=True)
+        return [ClaimType.from_node(claim_node) for claim_node in accepted]
+
     @classmethod
     def from_node(cls, node: Question) -> "QuestionType":
         return QuestionType(
@@ -57,9 +72,16 @@ class QuestionType(BaseNodeType):
             meta=MetaType(uid=node.uid, created_at=node.created_at),
             question=node.question,
             description=node.description,
+            answer_count=node.answer_count or 0,
         )
 
 
+@type(name="SimilarQuestion")
+class SimilarQuestionType:
+    similarity: float
+    question: QuestionType
+
+
 @input(name="NewQuestion")
 class QuestionIn:
     question: str
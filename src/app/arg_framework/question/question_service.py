@@ -4,24 +4,33 @@ from typing import List
 from uuid import UUID
 
 from neomodel import AsyncStructuredNode, adb
+from strawberry.types.nodes import Selection
 
+from src.app.activity.activity_service import ActivityService, get_activity_service
 from src.app.arg_framework.IAddressable import IAddressable
 from src.app.arg_framework.IOwnable import IOwnable
 from src.app.arg_framework.question.question import Question
 from src.app.arg_framework.question.question_repository import QuestionRepository
+from src.app.arg_framework.similar_questions.similar_question_service import (SimilarQuestionService,
+                                                                              get_similar_question_service)
 from src.app.townsquare.townsquare import Townsquare
 from src.app.townsquare.townsquare_repository import TownsquareRepository
 from src.app.user.user import User
 from src.app.user.user_repository import UserRepository
+from src.infra.db.pagination import PageQuery, Page
+from src.infra.db.query_planner import PlannedNodes
 
 
 class QuestionService(IOwnable, IAddressable):
 
     def __init__(self, question_repository: QuestionRepository, user_repository: UserRepository,
-                 townsquare_repository: TownsquareRepository):
+                 townsquare_repository: TownsquareRepository, activity_service: ActivityService,
+                 similar_question_service: SimilarQuestionService):
         self.question_repository: QuestionRepository = question_repository
         self.user_repository: UserRepository = user_repository
         self.townsquare_repository: TownsquareRepository = townsquare_repository
+        self.activity_service: ActivityService = activity_service
+        self.similar_question_service: SimilarQuestionService = similar_question_service
 
     async def create_question(self, author_id: UUID, question: str, description: str, townsquare_id: UUID | None,
                               addressed_node_id: UUID | None) -> Question:
@@ -38,25 +47,35 @@ class QuestionService(IOwnable, IAddressable):
 
                 if townsquare_id:
                     townsquare: Townsquare = await self.townsquare_repository.get(townsquare_id)
-                    return await self.question_repository.create(new_question=new_question,
-                                                                 author=author,
-                                                                 townsquare=townsquare)
+                    new_question = await self.question_repository.create(new_question=new_question,
+                                                                         author=author,
+                                                                         townsquare=townsquare)
                 else:
                     new_question: Question = await self.question_repository.create(new_question=new_question,
                                                                                    author=author, townsquare=None)
-                    return await self.address_node(new_question, addressed_node_id)
+                    new_question = await self.address_node(new_question, addressed_node_id)
 
             except LookupError as e:
                 raise ValueError(f"Node not found") from e
             except ValueError as e:
                 raise e
 
+        await self.similar_question_service.add(new_question)
+        await self.activity_service.publish_created(new_question)
+        return new_question
+
     async def get_question(self, question_id: UUID) -> Question:
         return await self.question_repository.get(question_id)
 
     async def get_all_questions(self) -> List[Question]:
         return await self.question_repository.get_all()
 
+    async def get_question_planned(self, question_id: UUID, selections: List[Selection]) -> PlannedNodes:
+        return await self.question_repository.get_planned(question_id, selections)
+
+    async def get_questions_page(self, selections: List[Selection], page: PageQuery, **filters) -> Page:
+        return await self.question_repository.get_page(selections, page, **filters)
+
     async def check_ownership(self, user_id: UUID, question_id: UUID) -> bool:
         question: Question | None = await self.get_question(question_id)
 
@@ -69,11 +88,19 @@ class QuestionService(IOwnable, IAddressable):
 
         return True
 
+    async def get_similar_questions(self, text: str, townsquare_id: UUID, k: int = 5) -> List[tuple[Question, float]]:
+        await self.townsquare_repository.get(townsquare_id)
+        return await self.similar_question_service.get_similar_questions(text, townsquare_id, k)
+
     async def update_question(self, question_id: UUID, **kwargs) -> Question:
-        return await self.question_repository.update(question_id, **kwargs)
+        question: Question = await self.question_repository.update(question_id, **kwargs)
+        await self.similar_question_service.add(question)
+        return question
 
     async def delete_question(self, question_id: UUID) -> str:
-        return await self.question_repository.delete(question_id)
+        message: str = await self.question_repository.delete(question_id)
+        self.similar_question_service.remove(question_id)
+        return message
 
     async def address_node(self, source_node: UUID | AsyncStructuredNode, target_node_id: UUID,
                            relationship_type: Enum | None = None) -> AsyncStructuredNode:
@@ -84,15 +111,18 @@ class QuestionService(IOwnable, IAddressable):
         target_node: AsyncStructuredNode = await self.question_repository.query_nodes(target_node_id)
 
         await source_node.questions.connect(target_node)
-        return question
+        self.question_repository.invalidate(source_node.uid, target_node.uid)
+        return source_node
 
     async def disconnect_node(self, source_node: UUID, target_node_id: UUID) -> Question:
         question: Question = await self.get_question(source_node)
         target_node: AsyncStructuredNode = await self.question_repository.query_nodes(target_node_id)
 
         await question.questions.disconnect(target_node)
+        self.question_repository.invalidate(question.uid, target_node.uid)
         return question
 
 
 def get_question_service() -> QuestionService:
-    return QuestionService(QuestionRepository(), UserRepository(), TownsquareRepository())
+    return QuestionService(QuestionRepository(), UserRepository(), TownsquareRepository(), get_activity_service(),
+                           get_similar_question_service())
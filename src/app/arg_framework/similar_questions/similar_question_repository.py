@@ -0,0 +1,45 @@
+from typing import List
+
+from neomodel import adb
+
+from src.app.arg_framework.question.question import Question
+from src.app.townsquare.townsquare_scope import townsquare_ids, townsquare_scope
+from src.infra.db.identity_map import remember
+
+
+class SimilarQuestionRepository:
+    @staticmethod
+    async def get_question_texts(townsquare_id: str) -> List[tuple[str, str]]:
+        """
+        :return: (uid, text) of every Question of the Townsquare, the text joins the question and its description
+        """
+        results, meta = await adb.cypher_query(f"MATCH (n:Question) WHERE {townsquare_scope('Question')} "
+                                               f"RETURN n.uid, n.question + ' ' + coalesce(n.description, '')",
+                                               {"townsquare_id": townsquare_id})
+        return [(uid, text) for uid, text in results]
+
+    @staticmethod
+    async def get_townsquare_ids(question_id: str) -> List[str]:
+        results, meta = await adb.cypher_query(f"MATCH (n:Question {{uid: $uid}}) "
+                                               f"UNWIND {townsquare_ids('Question')} AS townsquare_id "
+                                               f"RETURN DISTINCT townsquare_id", {"uid": question_id})
+        return [row[0] for row in results]
+
+    @staticmethod
+    async def get_questions(question_ids: List[str]) -> List[Question]:
+        """
+        :return: the Questions that still exist, in the order of the given uids
+        """
+        if not question_ids:
+            return []
+
+        results, meta = await adb.cypher_query("UNWIND $uids AS uid MATCH (n:Question {uid: uid}) RETURN n",
+                                               {"uids": question_ids}, resolve_objects=True)
+        questions: dict[str, Question] = {row[0].uid: row[0] for row in results}
+        for question in questions.values():
+            remember(question)
+        return [questions[uid] for uid in question_ids if uid in questions]
+
+
+def get_similar_question_repository() -> SimilarQuestionRepository:
+    return SimilarQuestionRepository()
@@ -0,0 +1,109 @@
+import logging
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import List
+from uuid import UUID
+
+from src.app.arg_framework.question.question import Question
+from src.app.arg_framework.similar_questions.similar_question_repository import (SimilarQuestionRepository,
+                                                                                 get_similar_question_repository)
+from src.app.arg_framework.similar_questions.tfidf import QuestionMatrix
+from src.infra.cache.response_cache import list_tag, track
+
+MAX_SIMILAR_QUESTIONS: int = 50
+DEFAULT_TTL: float = 600.0
+
+
+def question_text(question: Question) -> str:
+    return f"{question.question} {question.description or ''}"
+
+
+@dataclass
+class _LoadedMatrix:
+    matrix: QuestionMatrix
+    expires_at: float
+
+
+class SimilarQuestionService:
+    """
+    Recommends existing questions of a Townsquare that are similar to a text, e.g. before a near-copy is asked.
+
+    The questions of a Townsquare are loaded into a QuestionMatrix on its first lookup and then kept up to date by the
+    question writes of this worker. At most 'max_townsquares' matrices are held, the least recently used are dropped,
+    and each one is reloaded after 'ttl' seconds to pick up the writes of other workers.
+    """
+
+    def __init__(self, similar_question_repository: SimilarQuestionRepository, max_townsquares: int = 100,
+                 ttl: float = DEFAULT_TTL):
+        self.similar_question_repository: SimilarQuestionRepository = similar_question_repository
+        self.max_townsquares: int = max_townsquares
+        self.ttl: float = ttl
+        self.__matrices: OrderedDict[str, _LoadedMatrix] = OrderedDict()
+
+    async def __get_matrix(self, townsquare_id: str) -> QuestionMatrix:
+        loaded: _LoadedMatrix | None = self.__matrices.get(townsquare_id)
+        if loaded and loaded.expires_at > time.monotonic():
+            self.__matrices.move_to_end(townsquare_id)
+            return loaded.matrix
+
+        matrix: QuestionMatrix = QuestionMatrix()
+        matrix.add_all(await self.similar_question_repository.get_question_texts(townsquare_id))
+        logging.debug(f"Loaded {len(matrix)} questions of the Townsquare '{townsquare_id}' for recommendations")
+
+        if self.max_townsquares > 0:
+            self.__matrices[townsquare_id] = _LoadedMatrix(matrix=matrix, expires_at=time.monotonic() + self.ttl)
+            self.__matrices.move_to_end(townsquare_id)
+            while len(self.__matrices) > self.max_townsquares:
+                self.__matrices.popitem(last=False)
+        return matrix
+
+    async def get_similar_questions(self, text: str, townsquare_id: UUID, k: int = 5,
+                                    exclude: str | None = None) -> List[tuple[Question, float]]:
+        """
+        :param exclude: the uid of a question that is not recommended, such as the one the text belongs to
+        :raises ValueError: if k is out of range
+        :return: the most similar questions of the Townsquare with their cosine similarity, most similar first
+        """
+        if not 0 < k <= MAX_SIMILAR_QUESTIONS:
+            raise ValueError(f"'k' must be between 1 and {MAX_SIMILAR_QUESTIONS}")
+
+        # Cached responses have to be invalidated by every new question, not only by changes of the returned ones
+        track(list_tag(Question.__label__))
+        matrix: QuestionMatrix = await self.__get_matrix(townsquare_id.hex)
+        matches: List[tuple[str, float]] = matrix.query(text, k, exclude=(exclude,) if exclude else ())
+        similarities: dict[str, float] = dict(matches)
+
+        questions: List[Question] = await self.similar_question_repository.get_questions([uid for uid, _ in matches])
+        return [(question, similarities[question.uid]) for question in questions]
+
+    async def add(self, question: Question) -> None:
+        """Add a new question or the new text of a question to the loaded matrices of its Townsquares"""
+        if not self.__matrices:
+            return
+
+        for townsquare_id in await self.similar_question_repository.get_townsquare_ids(question.uid):
+            loaded: _LoadedMatrix | None = self.__matrices.get(townsquare_id)
+            if loaded:
+                loaded.matrix.add(question.uid, question_text(question))
+
+    def remove(self, question_id: UUID | str) -> None:
+        uid: str = question_id.hex if isinstance(question_id, UUID) else question_id
+        for loaded in self.__matrices.values():
+            loaded.matrix.remove(uid)
+
+    def clear(self) -> None:
+        """Drop every loaded matrix, e.g. after a bulk import"""
+        self.__matrices.clear()
+
+
+similar_question_service: SimilarQuestionService = SimilarQuestionService(
+    get_similar_question_repository(),
+    max_townsquares=int(os.getenv("SIMILAR_QUESTIONS_TOWNSQUARES") or 100),
+    ttl=float(os.getenv("SIMILAR_QUESTIONS_TTL") or DEFAULT_TTL),
+)
+
+
+def get_similar_question_service() -> SimilarQuestionService:
+    return similar_question_service
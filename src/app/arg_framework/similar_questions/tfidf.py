@@ -0,0 +1,133 @@
+import re
+from typing import Iterable
+
+import numpy as np
+
+_WORD = re.compile(r"\w+")
+
+# Width of the hashed bag-of-words, a row takes FEATURES * 4 bytes
+FEATURES: int = 1 << 11
+INITIAL_CAPACITY: int = 16
+
+
+def term_counts(text: str, features: int = FEATURES) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Hash the lowercase words of a text into feature columns, so no vocabulary has to be kept
+
+    :return: the distinct columns and how often each occurs
+    """
+    columns: np.ndarray = np.fromiter((hash(word) % features for word in _WORD.findall(text.lower())), dtype=np.int64)
+    return np.unique(columns, return_counts=True)
+
+
+class QuestionMatrix:
+    """
+    TF-IDF vectors of the questions of one Townsquare as the rows of a dense float32 matrix, so the cosine similarity
+    of a text to all of them is one matrix-vector product.
+
+    Rows are L2-normalized with the document frequencies at the time they were added. All rows are weighted again
+    once the number of questions has doubled since the last time, which keeps the weights current at an amortized
+    constant cost per question. Removed rows are zeroed and dropped on the next reweighting.
+    """
+
+    def __init__(self, features: int = FEATURES):
+        self.features: int = features
+        self.__matrix: np.ndarray = np.zeros((INITIAL_CAPACITY, features), dtype=np.float32)
+        self.__keys: list[str | None] = []
+        self.__terms: list[tuple[np.ndarray, np.ndarray] | None] = []
+        self.__rows: dict[str, int] = {}
+        self.__document_frequencies: np.ndarray = np.zeros(features, dtype=np.int64)
+        self.__weighted_documents: int = 0
+
+    def __len__(self) -> int:
+        return len(self.__rows)
+
+    def __idf(self) -> np.ndarray:
+        documents: int = len(self.__rows)
+        return np.log((1 + documents) / (1 + self.__document_frequencies)).astype(np.float32) + 1
+
+    @staticmethod
+    def __weigh(terms: tuple[np.ndarray, np.ndarray], idf: np.ndarray, row: np.ndarray) -> None:
+        columns, counts = terms
+        row[:] = 0
+        row[columns] = (1 + np.log(counts)) * idf[columns]
+        norm: float = float(np.linalg.norm(row))
+        if norm:
+            row /= norm
+
+    def add(self, key: str, text: str) -> None:
+        """Add a question or replace the text of a question added before"""
+        self.remove(key)
+        terms: tuple[np.ndarray, np.ndarray] = term_counts(text, self.features)
+
+        if len(self.__keys) == len(self.__matrix):
+            self.__matrix = np.concatenate([self.__matrix, np.zeros_like(self.__matrix)])
+
+        position: int = len(self.__keys)
+        self.__keys.append(key)
+        self.__terms.append(terms)
+        self.__rows[key] = position
+        self.__document_frequencies[terms[0]] += 1
+
+        if len(self.__rows) >= 2 * self.__weighted_documents:
+            self.__reweight()
+        else:
+            self.__weigh(terms, self.__idf(), self.__matrix[position])
+
+    def add_all(self, questions: Iterable[tuple[str, str]]) -> None:
+        """Add many (key, text) pairs and weigh all rows once at the end"""
+        for key, text in questions:
+            self.remove(key)
+            terms: tuple[np.ndarray, np.ndarray] = term_counts(text, self.features)
+            self.__keys.append(key)
+            self.__terms.append(terms)
+            self.__rows[key] = len(self.__keys) - 1
+            self.__document_frequencies[terms[0]] += 1
+        self.__reweight()
+
+    def remove(self, key: str) -> None:
+        position: int | None = self.__rows.pop(key, None)
+        if position is None:
+            return
+
+        self.__document_frequencies[self.__terms[position][0]] -= 1
+        self.__keys[position] = None
+        self.__terms[position] = None
+        if position < len(self.__matrix):
+            self.__matrix[position] = 0
+
+    def __reweight(self) -> None:
+        """Compact the removed rows away and weigh every row with the current document frequencies"""
+        live: list[int] = [position for position, key in enumerate(self.__keys) if key is not None]
+        self.__keys = [self.__keys[position] for position in live]
+        self.__terms = [self.__terms[position] for position in live]
+        self.__rows = {key: position for position, key in enumerate(self.__keys)}
+
+        capacity: int = max(INITIAL_CAPACITY, 1 << (2 * len(live) - 1).bit_length() if live else 0)
+        self.__matrix = np.zeros((capacity, self.features), dtype=np.float32)
+
+        idf: np.ndarray = self.__idf()
+        for position, terms in enumerate(self.__terms):
+            self.__weigh(terms, idf, self.__matrix[position])
+        self.__weighted_documents = len(live)
+
+    def query(self, text: str, k: int, exclude: Iterable[str] = ()) -> list[tuple[str, float]]:
+        """
+        :param exclude: keys that are never returned
+        :return: up to k (key, cosine similarity) pairs with a positive similarity, most similar first
+        """
+        if not self.__rows:
+            return []
+
+        vector: np.ndarray = np.zeros(self.features, dtype=np.float32)
+        self.__weigh(term_counts(text, self.features), self.__idf(), vector)
+
+        scores: np.ndarray = self.__matrix[:len(self.__keys)] @ vector
+        excluded: set[str] = set(exclude)
+        wanted: int = min(len(scores), k + len(excluded))
+        best: np.ndarray = np.argpartition(-scores, wanted - 1)[:wanted]
+
+        results: list[tuple[str, float]] = [(self.__keys[position], float(scores[position]))
+                                            for position in best[np.argsort(-scores[best])]
+                                            if scores[position] > 0 and self.__keys[position] not in excluded]
+        return results[:k]
@@ -1,21 +1,27 @@
 from uuid import UUID
 
-from aiocache import cached
-from fastapi import status, HTTPException, Request
+from fastapi import status, HTTPException, Request, WebSocket
 from strawberry.fastapi.context import BaseContext
 
+from src.app.arg_framework.duplicates.duplicate_loader import DuplicateLoader
 from src.app.auth.auth_service import AuthenticationService, get_auth_service
+from src.infra.db.identity_map import begin_identity_map
+from src.infra.db.relationship_loader import RelationshipLoader
 
 
 class UserContext(BaseContext):
 
-    def __init__(self, request: Request):
+    def __init__(self, request: Request | WebSocket):
         super().__init__()
         self.request = request
+        self.relationship_loader: RelationshipLoader = RelationshipLoader()
+        self.duplicate_loader: DuplicateLoader = DuplicateLoader()
+        self.__uid: UUID | None = None
 
-    @cached(ttl=1800)
     async def uid(self, auth_service: AuthenticationService = get_auth_service()) -> UUID | None:
-
+        # Memoized for the request, resolvers call this repeatedly
+        if self.__uid:
+            return self.__uid
         if not self.request:
             return None
         token: str | None = self.request.headers.get('Authorization', None)
@@ -25,8 +31,8 @@ class UserContext(BaseContext):
                                 headers={"WWW-Authenticate": "Bearer"})
         try:
             token: str = token.split(" ")[1]  # Remove "Bearer" prefix
-            uid: UUID = auth_service.decode_access_token(token)
-            return uid
+            self.__uid = auth_service.decode_access_token(token)
+            return self.__uid
 
         except PermissionError as e:
             raise HTTPException(
@@ -36,5 +42,7 @@ class UserContext(BaseContext):
             ) from e
 
 
-async def get_user_context(request: Request) -> UserContext:
-    return UserContext(request=request)
+async def get_user_context(request: Request = None, ws: WebSocket = None) -> UserContext:
+    # Subscriptions run over a websocket instead of a request
+    begin_identity_map()
+    return UserContext(request=request or ws)
@@ -24,6 +24,8 @@ class AuthMutations:
             raise Exception("User not found")
         except PermissionError:
             raise Exception("Invalid Credentials")
+        except RuntimeError:
+            raise Exception("Too many login attempts, try again later")
 
 
 @type
@@ -5,19 +5,19 @@ from uuid import UUID
 from fastapi import Depends
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
-from passlib.context import CryptContext
 
+from src.app.auth.password_hasher import get_password_hasher
+from src.app.auth.token_cache import TokenCache, get_token_cache
 from src.app.user.user import User
 from src.app.user.user_service import get_user_service
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="login")
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 
 class AuthenticationService:
 
-    def __init__(self):
+    def __init__(self, token_cache: TokenCache | None = None):
+        self.token_cache: TokenCache = token_cache or get_token_cache()
         self.__secret_key: str = os.getenv("SECRET_KEY")
         self.__algorithm: str = os.getenv("ALGORITHM", "HS256")
         self.__access_token_expire_minutes: timedelta = timedelta(
@@ -38,22 +38,35 @@ class AuthenticationService:
             raise PermissionError("Failed to create access Token") from e
 
     def decode_access_token(self, token: str) -> UUID:
-        """Decode the access token and return the user UUID from (sub)"""
+        """
+        Decode the access token and return the user UUID from (sub). Valid tokens are cached until they expire, so
+        only the first request with a token pays for the signature check.
+        """
+        uid: UUID | None = self.token_cache.get(token)
+        if uid:
+            return uid
+
         try:
             payload = jwt.decode(token=token, key=self.__secret_key, algorithms=[self.__algorithm])
-            uid: str = payload.get("sub")
-            if uid is None:
+            subject: str = payload.get("sub")
+            if subject is None:
                 raise PermissionError("Invalid token data")
-            return UUID(uid)
+            uid = UUID(subject)
 
-        except JWTError as e:
+        except (JWTError, ValueError) as e:
             raise PermissionError("Could not validate credentials") from e
 
+        # Tokens without an expiry are never cached
+        if "exp" in payload:
+            self.token_cache.put(token, uid, float(payload["exp"]))
+        return uid
+
     @staticmethod
     async def authenticate_user(username: str, password: str) -> User:
+        """:raises RuntimeError: if too many passwords are being verified already"""
         try:
             user: User = await get_user_service().get_user_via_username(username)
-            if not pwd_context.verify(password, user.password):
+            if not await get_password_hasher().verify(password, user.password):
                 raise PermissionError("Wrong Password")
             return user
         except LookupError as e:
@@ -0,0 +1,66 @@
+import asyncio
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, TypeVar
+
+from passlib.context import CryptContext
+
+T = TypeVar("T")
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt hashing and verification on a dedicated thread pool instead of the event loop. bcrypt releases the
+    GIL, so the loop keeps serving other requests while a hash is computed.
+
+    At most 'max_workers' operations run and 'max_queue' wait at any time. Any further operation is rejected at once
+    with a RuntimeError, so a login storm degrades into fast failures instead of a backlog that starves everything
+    else.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int):
+        self.max_workers: int = max_workers
+        self.max_queue: int = max_queue
+        self.rejected: int = 0
+        self.__pending: int = 0
+        self.__executor: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=max_workers,
+                                                                 thread_name_prefix="password-hasher")
+
+    async def hash(self, password: str) -> str:
+        return await self.__run(pwd_context.hash, password)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        return await self.__run(pwd_context.verify, password, hashed_password)
+
+    @property
+    def pending(self) -> int:
+        """Running and queued operations"""
+        return self.__pending
+
+    def shutdown(self) -> None:
+        self.__executor.shutdown(wait=False, cancel_futures=True)
+
+    async def __run(self, operation: Callable[..., T], *args) -> T:
+        if self.__pending >= self.max_workers + self.max_queue:
+            self.rejected += 1
+            logging.warning(f"Password hashing overloaded, {self.__pending} operations pending")
+            raise RuntimeError("Too many concurrent password operations, try again later")
+
+        self.__pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.__executor, operation, *args)
+        finally:
+            self.__pending -= 1
+
+
+password_hasher: PasswordHasher = PasswordHasher(
+    max_workers=int(os.getenv("PASSWORD_HASH_WORKERS") or min(4, os.cpu_count() or 1)),
+    max_queue=int(os.getenv("PASSWORD_HASH_QUEUE") or 16),
+)
+
+
+def get_password_hasher() -> PasswordHasher:
+    return password_hasher
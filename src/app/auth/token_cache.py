@@ -0,0 +1,92 @@
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from uuid import UUID
+
+DEFAULT_MAX_SIZE: int = 10000
+
+
+@dataclass(frozen=True)
+class TokenCacheStatistics:
+    size: int
+    max_size: int
+    hits: int
+    misses: int
+    expirations: int
+    evictions: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups: int = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class TokenCache:
+    """
+    Process-wide LRU of decoded access tokens.
+
+    Entries are keyed by the SHA-256 of the token, so raw credentials are never kept in memory, and expire at the 'exp'
+    claim of their own token. The least recently used entry is evicted once 'max_size' is reached.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_MAX_SIZE):
+        self.max_size: int = max_size
+        self.__entries: OrderedDict[str, tuple[UUID, float]] = OrderedDict()
+        self.__hits: int = 0
+        self.__misses: int = 0
+        self.__expirations: int = 0
+        self.__evictions: int = 0
+
+    def get(self, token: str) -> UUID | None:
+        key: str = self.__key(token)
+        entry: tuple[UUID, float] | None = self.__entries.get(key)
+
+        if entry is None:
+            self.__misses += 1
+            return None
+
+        uid, expires_at = entry
+        if expires_at <= time.time():
+            del self.__entries[key]
+            self.__expirations += 1
+            self.__misses += 1
+            return None
+
+        self.__entries.move_to_end(key)
+        self.__hits += 1
+        return uid
+
+    def put(self, token: str, uid: UUID, expires_at: float) -> None:
+        """
+        :param expires_at: the 'exp' claim of the token as a POSIX timestamp
+        """
+        if self.max_size <= 0 or expires_at <= time.time():
+            return
+
+        key: str = self.__key(token)
+        self.__entries[key] = (uid, expires_at)
+        self.__entries.move_to_end(key)
+
+        while len(self.__entries) > self.max_size:
+            self.__entries.popitem(last=False)
+            self.__evictions += 1
+
+    def clear(self) -> None:
+        self.__entries.clear()
+
+    def statistics(self) -> TokenCacheStatistics:
+        return TokenCacheStatistics(size=len(self.__entries), max_size=self.max_size, hits=self.__hits,
+                                    misses=self.__misses, expirations=self.__expirations, evictions=self.__evictions)
+
+    @staticmethod
+    def __key(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+
+token_cache: TokenCache = TokenCache(int(os.getenv("TOKEN_CACHE_SIZE") or DEFAULT_MAX_SIZE))
+
+
+def get_token_cache() -> TokenCache:
+    return token_cache
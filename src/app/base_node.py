@@ -4,9 +4,12 @@ from uuid import UUID
 from neomodel import AsyncStructuredNode, UniqueIdProperty, DateTimeProperty
 from strawberry import interface, type
 
+from src.infra.db.db_types import ADDRESSABLE_LABEL
+
 
 class BaseNode(AsyncStructuredNode):
-    __abstract_node__ = True
+    # Not abstract: every subclass inherits the shared label, so any node can be resolved by its uid alone
+    __label__ = ADDRESSABLE_LABEL
 
     uid = UniqueIdProperty()
     created_at = DateTimeProperty()
@@ -0,0 +1,42 @@
+from datetime import datetime
+from typing import Generic, TypeVar, List, Callable
+from uuid import UUID
+
+from neomodel import AsyncStructuredNode
+from strawberry import type, input
+
+from src.infra.db.pagination import Cursor
+
+NodeType = TypeVar("NodeType")
+
+
+@type
+class PageInfo:
+    has_next_page: bool
+    end_cursor: str | None = None
+
+
+@type
+class Edge(Generic[NodeType]):
+    cursor: str
+    node: NodeType
+
+
+@type
+class Connection(Generic[NodeType]):
+    edges: List[Edge[NodeType]]
+    page_info: PageInfo
+
+    @classmethod
+    def from_nodes(cls, nodes: List[AsyncStructuredNode], has_next_page: bool,
+                   from_node: Callable[[AsyncStructuredNode], NodeType]) -> "Connection[NodeType]":
+        edges: List[Edge[NodeType]] = [Edge(cursor=Cursor.of(node).encode(), node=from_node(node)) for node in nodes]
+        return cls(edges=edges,
+                   page_info=PageInfo(has_next_page=has_next_page, end_cursor=edges[-1].cursor if edges else None))
+
+
+@input(name="ListFilter")
+class ListFilterIn:
+    townsquare_id: UUID | None = None
+    author_id: UUID | None = None
+    created_after: datetime | None = None
@@ -0,0 +1,32 @@
+from typing import List
+from uuid import UUID
+
+from strawberry import type, field, Info
+
+from src.app.connection import Connection, Edge, PageInfo
+from src.app.search.search_schema import SearchHitType, SearchableSchema, SEARCHABLE_NODES
+from src.app.search.search_service import get_search_service, SearchService, SearchPage
+from src.infra.db.pagination import RankCursor
+
+search_service: SearchService = get_search_service()
+
+
+@type
+class SearchQueries:
+    @field
+    async def arguments(self, info: Info, text: str, types: List[SearchableSchema] | None = None,
+                        townsquare_id: UUID | None = None, first: int = 20,
+                        after: str | None = None) -> Connection[SearchHitType]:
+        page: SearchPage = await search_service.search(text, [SEARCHABLE_NODES[t] for t in types or []],
+                                                       townsquare_id, first, after)
+        edges: List[Edge[SearchHitType]] = [Edge(cursor=RankCursor(hit.position).encode(),
+                                                 node=SearchHitType.from_hit(hit)) for hit in page.hits]
+        return Connection(edges=edges, page_info=PageInfo(has_next_page=page.has_next_page,
+                                                          end_cursor=edges[-1].cursor if edges else None))
+
+
+@type
+class Query:
+    @field
+    async def search(self) -> SearchQueries:
+        return SearchQueries()
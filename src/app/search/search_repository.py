@@ -0,0 +1,54 @@
+from typing import List, Type
+from uuid import UUID
+
+from neomodel import adb, AsyncStructuredNode
+
+from src.app.townsquare.townsquare_scope import townsquare_scope
+from src.infra.cache.response_cache import list_tag, track
+from src.infra.db.fulltext import fulltext_index
+from src.infra.db.identity_map import remember
+
+
+class SearchRepository:
+    @staticmethod
+    async def search(node_classes: List[Type[AsyncStructuredNode]], query: str, skip: int, limit: int,
+                     townsquare_id: UUID | None = None) -> List[tuple[AsyncStructuredNode, float]]:
+        """
+        Query the full-text indexes of the node classes and merge their matches by relevance
+
+        :param query: a Lucene query
+        :param skip: the number of best matches to skip
+        :param limit: the maximum number of matches to return
+        :return: pairs of node and score, best first
+        """
+        params: dict = {"query": query, "candidates": skip + limit, "skip": skip, "limit": limit}
+        branches: list[str] = []
+
+        for i, node_class in enumerate(node_classes):
+            label: str = node_class.__label__
+            if townsquare_id:
+                # The index streams its matches best first, the scope is tested on that stream and the branch stops
+                # once it has enough matches of the Townsquare, however far down the global ranking they are
+                branches.append(f"CALL db.index.fulltext.queryNodes($index_{i}, $query) "
+                                f"YIELD node AS n, score WHERE {townsquare_scope(label)} "
+                                f"RETURN n, score LIMIT $candidates")
+            else:
+                branches.append(f"CALL db.index.fulltext.queryNodes($index_{i}, $query, {{limit: $candidates}}) "
+                                f"YIELD node AS n, score "
+                                f"RETURN n, score")
+            params[f"index_{i}"] = fulltext_index(label)
+            track(list_tag(label))
+
+        if townsquare_id:
+            params["townsquare_id"] = townsquare_id.hex
+
+        results, meta = await adb.cypher_query(f"CALL {{ {' UNION ALL '.join(branches)} }} "
+                                               f"RETURN n, score ORDER BY score DESC, n.uid SKIP $skip LIMIT $limit",
+                                               params, resolve_objects=True)
+        for node, score in results:
+            remember(node)
+        return [(node, score) for node, score in results]
+
+
+def get_search_repository() -> SearchRepository:
+    return SearchRepository()
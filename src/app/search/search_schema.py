@@ -0,0 +1,59 @@
+from enum import Enum, auto
+from typing import Callable, List, Type
+
+from neomodel import AsyncStructuredNode
+from strawberry import type, enum
+
+from src.app.arg_framework.claim.claim import Claim
+from src.app.arg_framework.claim.claim_schema import ClaimType
+from src.app.arg_framework.evidence.evidence import Evidence
+from src.app.arg_framework.evidence.evidence_schema import EvidenceType
+from src.app.arg_framework.premise.premise import Premise
+from src.app.arg_framework.premise.premise_schema import PremiseType
+from src.app.arg_framework.question.question import Question
+from src.app.arg_framework.question.question_schema import QuestionType
+from src.app.base_node import BaseNodeType
+from src.app.search.search_service import SearchHit
+
+
+class Searchable(Enum):
+    CLAIM = auto()
+    QUESTION = auto()
+    PREMISE = auto()
+    EVIDENCE = auto()
+
+
+SearchableSchema = enum(Searchable)
+
+SEARCHABLE_NODES: dict[Searchable, Type[AsyncStructuredNode]] = {
+    Searchable.CLAIM: Claim,
+    Searchable.QUESTION: Question,
+    Searchable.PREMISE: Premise,
+    Searchable.EVIDENCE: Evidence,
+}
+
+_FROM_NODE: dict[Type[AsyncStructuredNode], Callable[[AsyncStructuredNode], BaseNodeType]] = {
+    Claim: ClaimType.from_node,
+    Question: QuestionType.from_node,
+    Premise: PremiseType.from_node,
+    Evidence: EvidenceType.from_node,
+}
+
+
+@type(name="Highlight")
+class HighlightType:
+    property: str
+    snippet: str
+
+
+@type(name="SearchHit")
+class SearchHitType:
+    score: float
+    highlights: List[HighlightType]
+    node: BaseNodeType
+
+    @classmethod
+    def from_hit(cls, hit: SearchHit) -> "SearchHitType":
+        return cls(score=hit.score,
+                   highlights=[HighlightType(property=h.property, snippet=h.snippet) for h in hit.highlights],
+                   node=_FROM_NODE[hit.node.__class__](hit.node))
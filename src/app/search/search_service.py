@@ -0,0 +1,108 @@
+import html
+import re
+from dataclasses import dataclass, field
+from typing import List, Type
+from uuid import UUID
+
+from neomodel import AsyncStructuredNode
+
+from src.app.arg_framework.claim.claim import Claim
+from src.app.arg_framework.evidence.evidence import Evidence
+from src.app.arg_framework.premise.premise import Premise
+from src.app.arg_framework.question.question import Question
+from src.app.search.search_repository import SearchRepository, get_search_repository
+from src.infra.db.fulltext import fulltext_properties, lucene_query, query_terms
+from src.infra.db.pagination import MAX_PAGE_SIZE, RankCursor
+
+SEARCHABLE_CLASSES: tuple[Type[AsyncStructuredNode], ...] = (Claim, Question, Premise, Evidence)
+
+# Relevance ranking is only meaningful for the first results, deeper pages are refused
+MAX_SEARCH_DEPTH: int = 1000
+# Characters of context kept on each side of the first match of a highlight
+SNIPPET_CONTEXT: int = 60
+
+
+@dataclass
+class Highlight:
+    property: str
+    snippet: str
+
+
+@dataclass
+class SearchHit:
+    node: AsyncStructuredNode
+    score: float
+    position: int
+    highlights: List[Highlight] = field(default_factory=list)
+
+
+@dataclass
+class SearchPage:
+    hits: List[SearchHit]
+    has_next_page: bool
+
+
+def highlight(text: str, terms: List[str]) -> str | None:
+    """
+    Cut the text around its first match and wrap every match in <em> tags, the rest of the text is HTML-escaped
+
+    :return: the snippet, or None if no term occurs in the text
+    """
+    pattern: re.Pattern = re.compile(r"\b(" + "|".join(re.escape(term) for term in terms) + r")\b", re.IGNORECASE)
+    first: re.Match | None = pattern.search(text)
+    if not first:
+        return None
+
+    start: int = max(0, first.start() - SNIPPET_CONTEXT)
+    end: int = min(len(text), first.end() + SNIPPET_CONTEXT)
+    snippet: str = text[start:end]
+
+    parts: list[str] = []
+    position: int = 0
+    for match in pattern.finditer(snippet):
+        parts.append(html.escape(snippet[position:match.start()]))
+        parts.append(f"<em>{html.escape(match.group())}</em>")
+        position = match.end()
+    parts.append(html.escape(snippet[position:]))
+
+    return f"{'…' if start > 0 else ''}{''.join(parts)}{'…' if end < len(text) else ''}"
+
+
+class SearchService:
+    def __init__(self, search_repository: SearchRepository):
+        self.search_repository: SearchRepository = search_repository
+
+    async def search(self, text: str, node_classes: List[Type[AsyncStructuredNode]] | None = None,
+                     townsquare_id: UUID | None = None, first: int = 20, after: str | None = None) -> SearchPage:
+        """
+        Full-text search ranked by relevance
+
+        :param node_classes: the kinds of nodes to search, all searchable ones by default
+        :raises ValueError: if the text contains no word or the page request is invalid
+        """
+        terms: List[str] = query_terms(text)
+        if not terms:
+            raise ValueError("The search text has to contain at least one word")
+        if not 0 < first <= MAX_PAGE_SIZE:
+            raise ValueError(f"'first' must be between 1 and {MAX_PAGE_SIZE}")
+
+        skip: int = RankCursor.decode(after).position + 1 if after else 0
+        if skip + first > MAX_SEARCH_DEPTH:
+            raise ValueError(f"Search results are limited to the best {MAX_SEARCH_DEPTH} matches, refine the search")
+
+        results: List[tuple[AsyncStructuredNode, float]] = await self.search_repository.search(
+            list(node_classes or SEARCHABLE_CLASSES), lucene_query(terms), skip, first + 1, townsquare_id)
+
+        hits: List[SearchHit] = [
+            SearchHit(node=node, score=score, position=skip + i, highlights=[
+                Highlight(property=name, snippet=snippet)
+                for name in fulltext_properties(type(node))
+                if (value := getattr(node, name, None)) and (snippet := highlight(value, terms))
+            ])
+            for i, (node, score) in enumerate(results[:first])
+        ]
+        return SearchPage(hits=hits, has_next_page=len(results) > first)
+
+
+def get_search_service() -> SearchService:
+    return SearchService(get_search_repository())
@@ -1,4 +1,4 @@
-from neomodel import StringProperty, AsyncRelationshipFrom
+from neomodel import StringProperty, AsyncRelationshipFrom, IntegerProperty
 
 from src.app.base_node import BaseNode
 
@@ -6,6 +6,8 @@ from src.app.base_node import BaseNode
 class Townsquare(BaseNode):
     name = StringProperty(unique_index=True)
     description = StringProperty()
+    member_count = IntegerProperty(default=0)
+    question_count = IntegerProperty(default=0)
 
     members = AsyncRelationshipFrom('src.app.user.user.User', 'MEMBER_OF')
     questions = AsyncRelationshipFrom('src.app.arg_framework.question.question.Question', 'ASKED_IN')
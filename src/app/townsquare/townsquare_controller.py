@@ -2,10 +2,14 @@ from typing import List
 from uuid import UUID
 
 from strawberry import type, mutation, field, Info
+from strawberry.types.nodes import Selection
 
+from src.app.connection import Connection, ListFilterIn
 from src.app.townsquare.townsquare import Townsquare
 from src.app.townsquare.townsquare_schema import TownsquareIn, TownsquareType, TownsquareUpdateIn
 from src.app.townsquare.townsquare_service import get_townsquare_service, TownsquareService
+from src.infra.db.pagination import PageQuery, Page
+from src.infra.db.query_planner import QueryPlanner, PlannedNodes
 
 townsquare_service: TownsquareService = get_townsquare_service()
 
@@ -13,13 +17,19 @@ townsquare_service: TownsquareService = get_townsquare_service()
 @type
 class TownsquareQueries:
     @field
-    async def all_townsquares(self) -> List[TownsquareType]:
-        townsquare_nodes: List[Townsquare] = await townsquare_service.get_all_townsquares()
-        return [TownsquareType.from_node(townsquare_node) for townsquare_node in townsquare_nodes]
+    async def all_townsquares(self, info: Info, first: int = 20, after: str | None = None,
+                              filters: ListFilterIn | None = None) -> Connection[TownsquareType]:
+        selections: List[Selection] = QueryPlanner.selections(info, "edges", "node")
+        page: Page = await townsquare_service.get_townsquares_page(selections, PageQuery(first=first, after=after),
+                                                                   **vars(filters or ListFilterIn()))
+        return Connection.from_nodes(info.context.relationship_loader.prime(page.planned), page.has_next_page,
+                                     TownsquareType.from_node)
 
     @field
-    async def townsquare_by_id(self, townsquare_id: UUID) -> TownsquareType:
-        townsquare_node: Townsquare = await townsquare_service.get_townsquare(townsquare_id)
+    async def townsquare_by_id(self, info: Info, townsquare_id: UUID) -> TownsquareType:
+        planned: PlannedNodes = await townsquare_service.get_townsquare_planned(townsquare_id,
+                                                                                QueryPlanner.selections(info))
+        townsquare_node: Townsquare = info.context.relationship_loader.prime(planned)[0]
         return TownsquareType.from_node(townsquare_node)
 
 
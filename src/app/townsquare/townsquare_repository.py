@@ -4,23 +4,42 @@ from uuid import UUID
 
 from neomodel import adb
 from neomodel.exceptions import UniqueProperty, DoesNotExist
+from strawberry.types.nodes import Selection
 
 from src.app.townsquare.townsquare import Townsquare
+from src.app.townsquare.townsquare_scope import townsquare_scope
 from src.infra.db.crud_repository_interface import ICRUDRepository
 from src.infra.db.db_types import GraphDataTypes as types
 from src.infra.db.graph_repository_interface import IGraphRepository
+from src.infra.db.node_cache import NodeCache, get_node_cache
+from src.infra.db.pagination import PageQuery, Page
+from src.infra.db.query_planner import QueryPlanner, PlannedNodes
 
 
 class TownsquareRepository(ICRUDRepository, IGraphRepository):
+    townsquare_scope: str = townsquare_scope("Townsquare")
+    database_constraints: dict = {
+        "node": {
+            "uid":  ("unique", "required", types.STRING),
+            "name": ("unique", "required", types.STRING),
+            # "description": ("", "", types.STRING),
+        },
+        "indexes": [("created_at", "uid")]
+    }
+
     async def create(self, new_townsquare: Townsquare) -> Townsquare:
         async with adb.transaction:
             try:
-                return await new_townsquare.save()
+                new_townsquare = await new_townsquare.save()
             except UniqueProperty:
                 raise ValueError(f"Townsquare '{new_townsquare.name}' already exists")
 
+        self.invalidate_lists(Townsquare)
+        self.write_through(new_townsquare)
+        return new_townsquare
+
     async def get(self, townsquare_id: UUID) -> Townsquare:
-        townsquare: Townsquare | None = await Townsquare.nodes.get_or_none(uid=townsquare_id.hex)
+        townsquare: Townsquare | None = await self.get_node(Townsquare, townsquare_id)
         if not townsquare:
             raise LookupError(f"The Townsquare with ID '{townsquare_id}' not found in the Database")
         return townsquare
@@ -28,16 +47,44 @@ class TownsquareRepository(ICRUDRepository, IGraphRepository):
     async def get_all(self) -> List[Townsquare]:
         return await Townsquare.nodes.all()
 
+    async def warm_up_node_cache(self, count: int) -> int:
+        """
+        Load the most active Townsquares, by members and questions, into the node cache
+
+        :return: the number of Townsquares cached
+        """
+        node_cache: NodeCache = get_node_cache()
+        if count <= 0 or not node_cache.enabled:
+            return 0
+
+        results, meta = await adb.cypher_query("MATCH (n:Townsquare) "
+                                               "RETURN n ORDER BY n.member_count + n.question_count DESC LIMIT $count",
+                                               {"count": count}, resolve_objects=True)
+        for row in results:
+            node_cache.put(row[0])
+
+        logging.info(f"Cached the {len(results)} most active Townsquares")
+        return len(results)
+
+    async def get_planned(self, townsquare_id: UUID, selections: List[Selection]) -> PlannedNodes:
+        planned: PlannedNodes = await QueryPlanner(Townsquare).fetch(selections, where="WHERE n.uid = $uid",
+                                                                     params={"uid": townsquare_id.hex})
+        if not planned.nodes:
+            raise LookupError(f"The Townsquare with ID '{townsquare_id}' not found in the Database")
+        return planned
+
+    async def get_page(self, selections: List[Selection], page: PageQuery, **filters) -> Page:
+        return await self.paginate(Townsquare, selections, page, **filters)
+
     async def update(self, townsquare_id: UUID, **kwargs) -> Townsquare:
         try:
-            townsquare: Townsquare = await self.get(townsquare_id)
-            for key, value in kwargs.items():
-                if value is not None:
-                    old_value = getattr(townsquare, key)
-                    setattr(townsquare, key, value)
-                    logging.info(f"Updating {key}: '{old_value}' --> '{value}'")
-            async with adb.transaction:
-                return await townsquare.save()
+            townsquare, previous = await self.update_properties(Townsquare, townsquare_id, kwargs)
+            for key, old_value in previous.items():
+                logging.info(f"Updating {key}: '{old_value}' --> '{kwargs[key]}'")
+
+            self.invalidate(townsquare_id)
+            self.write_through(townsquare)
+            return townsquare
         except DoesNotExist as e:
             logging.error(f"The Townsquare with ID '{townsquare_id}' not found in the Database: {str(e)}")
             raise LookupError(f"The Townsquare with ID '{townsquare_id}' not found in the Database") from e
@@ -50,10 +97,13 @@ class TownsquareRepository(ICRUDRepository, IGraphRepository):
 
     async def delete(self, townsquare_id: UUID) -> str:
         try:
-            townsquare: Townsquare = await self.get(townsquare_id)
             async with adb.transaction:
+                townsquare: Townsquare = await self.get_for_write(Townsquare, townsquare_id)
                 await townsquare.delete()
-                return f"Townsquare with ID '{townsquare_id}' successfully deleted"
+
+            self.invalidate(townsquare_id)
+            self.invalidate_lists(Townsquare)
+            return f"Townsquare with ID '{townsquare_id}' successfully deleted"
         except DoesNotExist:
             logging.error(f"The Townsquare with ID '{townsquare_id}' not found in the Database")
             raise LookupError(f"The Townsquare with ID '{townsquare_id}' not found in the Database")
@@ -61,17 +111,6 @@ class TownsquareRepository(ICRUDRepository, IGraphRepository):
             logging.error(f"Error deleting Townsquare with ID '{townsquare_id}': {str(e)}")
             raise e
 
-    # Graph Constraints
-    async def add_database_constraints(self, label: str, constraints=None):
-        constraints: dict = {
-            "node": {
-                "uid":  ("unique", "required", types.STRING),
-                "name": ("unique", "required", types.STRING),
-                # "description": ("", "", types.STRING),
-            }
-        }
-        await super().add_database_constraints(label, constraints)
-
     @staticmethod
     def get_repository() -> 'TownsquareRepository':
         return TownsquareRepository()
@@ -1,6 +1,6 @@
 from typing import List, TYPE_CHECKING, Annotated
 
-from strawberry import type, input, Private, lazy, field
+from strawberry import type, input, Private, lazy, field, Info
 
 from src.app.base_node import BaseNodeType, MetaType
 from src.app.townsquare.townsquare import Townsquare
@@ -16,20 +16,22 @@ class TownsquareType(BaseNodeType):
 
     name: str
     description: str
+    member_count: int = 0
+    question_count: int = 0
 
     @field
-    async def members(self) -> List[Annotated["UserType", lazy("src.app.user.user_schema")]]:
+    async def members(self, info: Info) -> List[Annotated["UserType", lazy("src.app.user.user_schema")]]:
         from src.app.user.user_schema import UserType
 
-        member_nodes: List[User] = await self.node_instance.members.all()
+        member_nodes: List[User] = await info.context.relationship_loader.load(self.node_instance, "members")
         return [UserType.from_node(member_node) for member_node in member_nodes]
 
     @field
-    async def questions(self) -> List[
+    async def questions(self, info: Info) -> List[
         Annotated["QuestionType", lazy("src.app.arg_framework.question.question_schema")]]:
         from src.app.arg_framework.question.question_schema import QuestionType
 
-        question_nodes: List[Question] = await self.node_instance.questions.all()
+        question_nodes: List[Question] = await info.context.relationship_loader.load(self.node_instance, "questions")
         return [QuestionType.from_node(question_node) for question_node in question_nodes]
 
     @classmethod
@@ -40,6 +42,8 @@ class TownsquareType(BaseNodeType):
             meta=MetaType(uid=node.uid, created_at=node.created_at),
             name=node.name,
             description=node.description,
+            member_count=node.member_count or 0,
+            question_count=node.question_count or 0,
         )
 
 
@@ -0,0 +1,53 @@
+# Cypher expressions that test whether the node bound to 'n' belongs to the Townsquare '$townsquare_id'.
+# Claims belong to a townsquare through the question they (transitively) answer; the depth of the attack/support chain
+# is bounded like the GraphQL query depth.
+
+_QUESTION_IN_TOWNSQUARE = "(:Question)-[:ASKED_IN]->(:Townsquare {uid: $townsquare_id})"
+_CLAIM_IN_TOWNSQUARE = f"(:Claim)-[:ATTACKS|SUPPORTS*0..10]->(:Claim)-[:ANSWERS]->{_QUESTION_IN_TOWNSQUARE}"
+
+TOWNSQUARE_SCOPES: dict[str, str] = {
+    "Townsquare": "n.uid = $townsquare_id",
+    "User":       "EXISTS { (n)-[:MEMBER_OF]->(:Townsquare {uid: $townsquare_id}) }",
+    "Question":   f"(EXISTS {{ (n)-[:ASKED_IN]->(:Townsquare {{uid: $townsquare_id}}) }} OR "
+                  f"EXISTS {{ (n)-[:QUESTIONS]->{_CLAIM_IN_TOWNSQUARE} }})",
+    "Claim":      f"EXISTS {{ (n)-[:ATTACKS|SUPPORTS*0..10]->(:Claim)-[:ANSWERS]->{_QUESTION_IN_TOWNSQUARE} }}",
+    "Premise":    f"EXISTS {{ (n)<-[:HAS_PREMISE]-{_CLAIM_IN_TOWNSQUARE} }}",
+    "Evidence":   f"EXISTS {{ (n)-[:SUPPORTS|COUNTERS]->(:Premise)<-[:HAS_PREMISE]-{_CLAIM_IN_TOWNSQUARE} }}",
+}
+
+
+def townsquare_scope(label: str, variable: str = "n") -> str:
+    """
+    :param label: the label of the node that is tested
+    :param variable: the Cypher variable the node is bound to
+    :raises ValueError
+    :return: a boolean Cypher expression that references the parameter '$townsquare_id'
+    """
+    if label not in TOWNSQUARE_SCOPES:
+        raise ValueError(f"'{label}' cannot be scoped to a Townsquare")
+    return TOWNSQUARE_SCOPES[label].replace("(n)", f"({variable})").replace("n.uid", f"{variable}.uid")
+
+
+# Paths from the node bound to 'n' to the Townsquares '(t)' it belongs to, the reverse of TOWNSQUARE_SCOPES
+_TO_TOWNSQUARE = "(:Question)-[:ASKED_IN]->(t:Townsquare)"
+_CLAIM_TO_TOWNSQUARE = f"(:Claim)-[:ATTACKS|SUPPORTS*0..10]->(:Claim)-[:ANSWERS]->{_TO_TOWNSQUARE}"
+
+TOWNSQUARE_PATHS: dict[str, list[str]] = {
+    "User":     ["(n)-[:MEMBER_OF]->(t:Townsquare)"],
+    "Question": ["(n)-[:ASKED_IN]->(t:Townsquare)", f"(n)-[:QUESTIONS]->{_CLAIM_TO_TOWNSQUARE}"],
+    "Claim":    [f"(n)-[:ATTACKS|SUPPORTS*0..10]->(:Claim)-[:ANSWERS]->{_TO_TOWNSQUARE}"],
+    "Premise":  [f"(n)<-[:HAS_PREMISE]-{_CLAIM_TO_TOWNSQUARE}"],
+    "Evidence": [f"(n)-[:SUPPORTS|COUNTERS]->(:Premise)<-[:HAS_PREMISE]-{_CLAIM_TO_TOWNSQUARE}"],
+}
+
+
+def townsquare_ids(label: str, variable: str = "n") -> str:
+    """
+    :param label: the label of the node whose Townsquares are looked up
+    :param variable: the Cypher variable the node is bound to
+    :raises ValueError
+    :return: a Cypher list expression of the uids of the Townsquares the node belongs to, possibly with duplicates
+    """
+    if label not in TOWNSQUARE_PATHS:
+        raise ValueError(f"'{label}' cannot be scoped to a Townsquare")
+    return " + ".join(f"[{path.replace('(n)', f'({variable})')} | t.uid]" for path in TOWNSQUARE_PATHS[label])
@@ -2,11 +2,15 @@ from datetime import datetime
 from typing import List
 from uuid import UUID
 
+from strawberry.types.nodes import Selection
+
 from src.app.townsquare.townsquare import Townsquare
 from src.app.townsquare.townsquare_repository import TownsquareRepository
 from src.app.user.user import User
 from src.app.user.user_repository import UserRepository
 from src.app.user.user_service import get_user_service
+from src.infra.db.pagination import PageQuery, Page
+from src.infra.db.query_planner import PlannedNodes
 
 
 class TownsquareService:
@@ -32,6 +36,12 @@ class TownsquareService:
     async def get_all_townsquares(self) -> List[Townsquare]:
         return await self.townsquare_repository.get_all()
 
+    async def get_townsquare_planned(self, townsquare_id: UUID, selections: List[Selection]) -> PlannedNodes:
+        return await self.townsquare_repository.get_planned(townsquare_id, selections)
+
+    async def get_townsquares_page(self, selections: List[Selection], page: PageQuery, **filters) -> Page:
+        return await self.townsquare_repository.get_page(selections, page, **filters)
+
     async def update_townsquare(self, townsquare_id: UUID, **kwargs) -> Townsquare:
         return await self.townsquare_repository.update(townsquare_id, **kwargs)
 
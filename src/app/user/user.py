@@ -13,3 +13,5 @@ class User(BaseNode):
     townsquare_memberships = AsyncRelationshipTo('src.app.townsquare.townsquare.Townsquare', 'MEMBER_OF')
     questions = AsyncRelationshipFrom('src.app.arg_framework.question.question.Question', 'ASKED_BY')
     claims = AsyncRelationshipFrom('src.app.arg_framework.claim.claim.Claim', 'AUTHORED_BY')
+
+    counted_relationships = {"townsquare_memberships": "member_count"}
@@ -2,10 +2,14 @@ from typing import List
 from uuid import UUID
 
 from strawberry import type, mutation, Info, field
+from strawberry.types.nodes import Selection
 
+from src.app.connection import Connection, ListFilterIn
 from src.app.user.user import User
 from src.app.user.user_schema import UserIn, UserType, UserUpdateIn
 from src.app.user.user_service import get_user_service, UserService
+from src.infra.db.pagination import PageQuery, Page
+from src.infra.db.query_planner import QueryPlanner, PlannedNodes
 
 user_service: UserService = get_user_service()
 
@@ -13,18 +17,25 @@ user_service: UserService = get_user_service()
 @type
 class UserQueries:
     @field
-    async def all_users(self) -> List[UserType]:
-        user_nodes: List[User] = await user_service.get_all_users()
-        return [UserType.from_node(user_node) for user_node in user_nodes]
+    async def all_users(self, info: Info, first: int = 20, after: str | None = None,
+                        filters: ListFilterIn | None = None) -> Connection[UserType]:
+        selections: List[Selection] = QueryPlanner.selections(info, "edges", "node")
+        page: Page = await user_service.get_users_page(selections, PageQuery(first=first, after=after),
+                                                       **vars(filters or ListFilterIn()))
+        return Connection.from_nodes(info.context.relationship_loader.prime(page.planned), page.has_next_page,
+                                     UserType.from_node)
 
     @field
-    async def user_by_id(self, user_id: UUID) -> UserType:
-        user_node: User = await user_service.get_user_via_id(user_id)
+    async def user_by_id(self, info: Info, user_id: UUID) -> UserType:
+        planned: PlannedNodes = await user_service.get_user_via_id_planned(user_id, QueryPlanner.selections(info))
+        user_node: User = info.context.relationship_loader.prime(planned)[0]
         return UserType.from_node(user_node)
 
     @field
-    async def user_by_username(self, username: str) -> UserType:
-        user_node: User = await user_service.get_user_via_username(username)
+    async def user_by_username(self, info: Info, username: str) -> UserType:
+        planned: PlannedNodes = await user_service.get_user_via_username_planned(username,
+                                                                                 QueryPlanner.selections(info))
+        user_node: User = info.context.relationship_loader.prime(planned)[0]
         return UserType.from_node(user_node)
 
 
@@ -4,27 +4,46 @@ from uuid import UUID
 
 from neomodel import adb
 from neomodel.exceptions import UniqueProperty, DoesNotExist
+from strawberry.types.nodes import Selection
 
 from src.app.townsquare.townsquare import Townsquare
+from src.app.townsquare.townsquare_scope import townsquare_scope
 from src.app.user.user import User
 from src.infra.db.crud_repository_interface import ICRUDRepository
 from src.infra.db.db_types import GraphDataTypes as types
 from src.infra.db.graph_repository_interface import IGraphRepository
+from src.infra.db.pagination import PageQuery, Page
+from src.infra.db.query_planner import QueryPlanner, PlannedNodes
 
 
 class UserRepository(ICRUDRepository, IGraphRepository):
+    townsquare_scope: str = townsquare_scope("User")
+    database_constraints: dict = {
+        "node": {
+            "uid":        ("unique", "required", types.STRING),
+            "username":   ("unique", "required", types.STRING),
+            "email":      ("unique", "required", types.STRING),
+            "password":   ("required", types.STRING),
+            "first_name": ("required", types.STRING)
+        },
+        "indexes": [("created_at", "uid")]
+    }
 
     @staticmethod
     async def create(new_user: User) -> User:
         async with adb.transaction:
             try:
-                return await new_user.save()
+                new_user = await new_user.save()
             except UniqueProperty:
                 raise ValueError(f"Username '{new_user.username}' or Email '{new_user.email}' already exists")
 
+        UserRepository.invalidate_lists(User)
+        UserRepository.write_through(new_user)
+        return new_user
+
     @staticmethod
     async def get(user_id: UUID) -> User:
-        user: User | None = await User.nodes.get_or_none(uid=user_id.hex)
+        user: User | None = await UserRepository.get_node(User, user_id)
         if not user:
             raise LookupError(f"The User with ID '{user_id}' not found in the Database")
         return user
@@ -40,17 +59,34 @@ class UserRepository(ICRUDRepository, IGraphRepository):
     async def get_all() -> List[User]:
         return await User.nodes.all()
 
+    @staticmethod
+    async def get_planned(user_id: UUID, selections: List[Selection]) -> PlannedNodes:
+        planned: PlannedNodes = await QueryPlanner(User).fetch(selections, where="WHERE n.uid = $uid",
+                                                               params={"uid": user_id.hex})
+        if not planned.nodes:
+            raise LookupError(f"The User with ID '{user_id}' not found in the Database")
+        return planned
+
+    @staticmethod
+    async def get_via_username_planned(username: str, selections: List[Selection]) -> PlannedNodes:
+        planned: PlannedNodes = await QueryPlanner(User).fetch(selections, where="WHERE n.username = $username",
+                                                               params={"username": username})
+        if not planned.nodes:
+            raise LookupError(f"The User with username '{username}' not found in the Database")
+        return planned
+
+    async def get_page(self, selections: List[Selection], page: PageQuery, **filters) -> Page:
+        return await self.paginate(User, selections, page, **filters)
+
     async def update(self, user_id: UUID, **kwargs) -> User:
         try:
-            user: User = await self.get(user_id)
-            for key, value in kwargs.items():
-                if value is not None:
-                    old_name = getattr(user, key)
-                    setattr(user, key, value)
-                    logging.info(f"Updating {key}: '{old_name}' --> '{value}'")
+            user, previous = await self.update_properties(User, user_id, kwargs)
+            for key, old_value in previous.items():
+                logging.info(f"Updating {key}: '{old_value}' --> '{kwargs[key]}'")
 
-            async with adb.transaction:
-                return await user.save()
+            self.invalidate(user_id)
+            self.write_through(user)
+            return user
         except DoesNotExist as e:
             logging.error(f"The User with ID '{user_id}' not found in the Database: {str(e)}")
             raise LookupError(f"The User with ID '{user_id}' not found in the Database") from e
@@ -65,10 +101,13 @@ class UserRepository(ICRUDRepository, IGraphRepository):
 
     async def delete(self, user_id: UUID) -> str:
         try:
-            user: User = await self.get(user_id)
             async with adb.transaction:
+                user: User = await self.get_for_write(User, user_id)
+                await self.release_counters(user)
                 await user.delete()
 
+            self.invalidate(user_id)
+            self.invalidate_lists(User)
             logging.info(f"User with ID '{user_id}' deleted")
             return f"User with username '{user.username}' deleted"
         except DoesNotExist as e:
@@ -81,15 +120,17 @@ class UserRepository(ICRUDRepository, IGraphRepository):
     # Townsquare Memberships
     async def join_townsquare(self, user_id: UUID, townsquare_id: UUID) -> User:
         try:
-            user: User = await self.get(user_id)
-            townsquare: Townsquare | None = await Townsquare.nodes.get_or_none(uid=townsquare_id)
-
+            townsquare: Townsquare | None = await self.get_node(Townsquare, townsquare_id)
             if not townsquare:
                 raise LookupError(f"The Townsquare with ID '{townsquare_id}' not found in the Database")
 
             async with adb.transaction:
-                await user.townsquare_memberships.connect(townsquare)
-                return await user.save()
+                user: User = await self.get_for_write(User, user_id)
+                await self.connect_counted(user, "townsquare_memberships", townsquare.uid)
+
+            self.invalidate(user_id)
+            self.write_through(user)
+            return user
 
         except DoesNotExist as e:
             logging.error(f"The User with ID '{user_id}' not found in the Database: {str(e)}")
@@ -100,15 +141,17 @@ class UserRepository(ICRUDRepository, IGraphRepository):
 
     async def leave_townsquare(self, user_id: UUID, townsquare_id: UUID) -> User:
         try:
-            user: User = await self.get(user_id)
-
-            townsquare: Townsquare | None = await Townsquare.nodes.get_or_none(uid=townsquare_id)
+            townsquare: Townsquare | None = await self.get_node(Townsquare, townsquare_id)
             if not townsquare:
                 raise LookupError(f"The Townsquare with ID '{townsquare_id}' not found in the Database")
 
             async with adb.transaction:
-                await user.townsquare_memberships.disconnect(townsquare)
-                return await user.save()
+                user: User = await self.get_for_write(User, user_id)
+                await self.disconnect_counted(user, "townsquare_memberships", townsquare.uid)
+
+            self.invalidate(user_id)
+            self.write_through(user)
+            return user
         except DoesNotExist as e:
             logging.error(f"The User with ID '{user_id}' not found in the Database: {str(e)}")
             raise LookupError(f"The User with ID '{user_id}' not found in the Database") from e
@@ -116,19 +159,6 @@ class UserRepository(ICRUDRepository, IGraphRepository):
             logging.error(f"Error leaving User with ID '{user_id}' from Townsquare: {str(e)}")
             raise e
 
-    # Graph Constraints
-    async def add_database_constraints(self, label: str, constraints=None):
-        constraints: dict = {
-            "node": {
-                "uid":        ("unique", "required", types.STRING),
-                "username":   ("unique", "required", types.STRING),
-                "email":      ("unique", "required", types.STRING),
-                "password":   ("required", types.STRING),
-                "first_name": ("required", types.STRING)
-            }
-        }
-        await super().add_database_constraints(label, constraints)
-
 
 def get_user_repository() -> UserRepository:
     return UserRepository()
@@ -1,6 +1,6 @@
 from typing import List, TYPE_CHECKING, Annotated
 
-from strawberry import type, input, Private, field, lazy
+from strawberry import type, input, Private, field, lazy, Info
 
 from src.app.arg_framework.claim.claim import Claim
 from src.app.arg_framework.question.question import Question
@@ -24,26 +24,28 @@ class UserType(BaseNodeType):
     first_name: str | None = None
 
     @field
-    async def townsquare_memberships(self) -> List[Annotated[
+    async def townsquare_memberships(self, info: Info) -> List[Annotated[
         "TownsquareType", lazy("src.app.townsquare.townsquare_schema")]] | None:
         from src.app.townsquare.townsquare_schema import TownsquareType
 
-        townsquare_nodes: List[Townsquare] = await self.node_instance.townsquare_memberships.all()
+        townsquare_nodes: List[Townsquare] = await info.context.relationship_loader.load(self.node_instance,
+                                                                                         "townsquare_memberships")
         return [TownsquareType.from_node(townsquare_node) for townsquare_node in townsquare_nodes]
 
     @field
-    async def questions(self) -> List[Annotated[
+    async def questions(self, info: Info) -> List[Annotated[
         "QuestionType", lazy("src.app.arg_framework.question.question_schema")]] | None:
         from src.app.arg_framework.question.question_schema import QuestionType
 
-        question_nodes: List[Question] = await self.node_instance.questions.all()
+        question_nodes: List[Question] = await info.context.relationship_loader.load(self.node_instance, "questions")
         return [QuestionType.from_node(question_node) for question_node in question_nodes]
 
     @field
-    async def claims(self) -> List[Annotated["ClaimType", lazy("src.app.arg_framework.claim.claim_schema")]] | None:
+    async def claims(self, info: Info) -> List[
+        Annotated["ClaimType", lazy("src.app.arg_framework.claim.claim_schema")]] | None:
         from src.app.arg_framework.claim.claim_schema import ClaimType
 
-        claim_nodes: List[Claim] = await self.node_instance.claims.all()
+        claim_nodes: List[Claim] = await info.context.relationship_loader.load(self.node_instance, "claims")
         return [ClaimType.from_node(claim_node) for claim_node in claim_nodes]
 
     @classmethod
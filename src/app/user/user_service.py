@@ -2,24 +2,26 @@ from datetime import datetime
 from typing import List
 from uuid import UUID
 
-from passlib.context import CryptContext
+from strawberry.types.nodes import Selection
 
+from src.app.auth.password_hasher import PasswordHasher, get_password_hasher
 from src.app.user.user import User
 from src.app.user.user_repository import UserRepository
-
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from src.infra.db.pagination import PageQuery, Page
+from src.infra.db.query_planner import PlannedNodes
 
 
 class UserService:
 
-    def __init__(self, user_repository: UserRepository):
+    def __init__(self, user_repository: UserRepository, password_hasher: PasswordHasher):
         self.user_repository = user_repository
+        self.password_hasher = password_hasher
 
     async def create_user(self, username: str, email: str, password: str, first_name: str | None) -> User:
         new_user: User = User(created_at=datetime.now(),
                               username=username,
                               email=email,
-                              password=pwd_context.hash(password))
+                              password=await self.password_hasher.hash(password))
         if first_name:
             new_user.first_name = first_name.capitalize()
         return await self.user_repository.create(new_user)
@@ -33,7 +35,18 @@ class UserService:
     async def get_all_users(self) -> List[User]:
         return await self.user_repository.get_all()
 
+    async def get_user_via_id_planned(self, user_id: UUID, selections: List[Selection]) -> PlannedNodes:
+        return await self.user_repository.get_planned(user_id, selections)
+
+    async def get_user_via_username_planned(self, username: str, selections: List[Selection]) -> PlannedNodes:
+        return await self.user_repository.get_via_username_planned(username, selections)
+
+    async def get_users_page(self, selections: List[Selection], page: PageQuery, **filters) -> Page:
+        return await self.user_repository.get_page(selections, page, **filters)
+
     async def update_user(self, user_id: UUID, **kwargs) -> User:
+        if kwargs.get("password"):
+            kwargs["password"] = await self.password_hasher.hash(kwargs["password"])
         return await self.user_repository.update(user_id, **kwargs)
 
     async def delete_user(self, user_id: UUID) -> str:
@@ -47,4 +60,4 @@ class UserService:
 
 
 def get_user_service() -> UserService:
-    return UserService(UserRepository())
+    return UserService(UserRepository(), get_password_hasher())
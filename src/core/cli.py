@@ -0,0 +1,248 @@
+import asyncio
+import sys
+from pathlib import Path
+from typing import Any, Coroutine, List, Optional, TypeVar
+from uuid import UUID
+
+import typer
+
+import src.core.config as config
+from src.app.arg_framework.acceptability.acceptability_service import get_acceptability_service
+from src.core.db_utils import declared_schema, setup_db, teardown_db
+from src.core.export import DEFAULT_PAGE_SIZE, encode, export_townsquare
+from src.core.generator import GeneratorSettings, GraphGenerator, write_ndjson
+from src.core.loader import Dialect, GraphLoader, LoadReport, LoadSchema, NODE_CLASSES, read_bloom_schema, read_records
+from src.core.schema_registry import (CONTROLLERS_FILE, SchemaRegistry, discover_controller_modules,
+                                      render_controller_modules)
+from src.infra.db import counters
+from src.infra.db import migrations
+from src.infra.db.batch_writer import BatchWriter, DEFAULT_CHUNK_SIZE
+from src.infra.db.migrations import Migration
+
+T = TypeVar("T")
+
+app = typer.Typer(help="Hive maintenance commands, run with 'python -m src.core.cli'")
+
+
+def _run(command: Coroutine[Any, Any, T]) -> T:
+    """Run a command against the database and close the driver afterwards"""
+    async def run() -> T:
+        try:
+            return await command
+        finally:
+            await teardown_db()
+
+    return asyncio.run(run())
+
+
+@app.command()
+def load(paths: List[Path] = typer.Argument(..., exists=True, dir_okay=False,
+                                            help="JSON, NDJSON or CSV record files or Bloom scenes, nodes first"),
+         dialect: Optional[Dialect] = typer.Option(None, help="Input dialect, detected from each file by default"),
+         label: Optional[str] = typer.Option(None, help="Label of node records that do not name one"),
+         schema: Optional[Path] = typer.Option(None, exists=True, dir_okay=False,
+                                               help="Bloom perspective to validate against instead of the models"),
+         batch_size: int = typer.Option(DEFAULT_CHUNK_SIZE, min=1, help="Rows per UNWIND transaction"),
+         parallelism: int = typer.Option(4, min=1, help="Concurrent write transactions"),
+         database: str = typer.Option("neo4j")):
+    """Stream seed or migration data into the database"""
+    config.configure_logger()
+    report: LoadReport = _run(_load(paths, dialect, label, schema, batch_size, parallelism, database))
+
+    typer.echo(f"Loaded {report.nodes} nodes and {report.relationships} relationships in {report.seconds:.1f}s "
+               f"({report.rows_per_second:.0f} rows/s), skipped {report.skipped_relationships} relationships")
+
+
+async def _load(paths: List[Path], dialect: Dialect | None, label: str | None, schema: Path | None, batch_size: int,
+                parallelism: int, database: str) -> LoadReport:
+    await setup_db(database_name=database, test_connection=True)
+
+    base_schema: LoadSchema = read_bloom_schema(schema) if schema else LoadSchema.from_models()
+    report: LoadReport = LoadReport()
+
+    for path in paths:
+        path_dialect: Dialect = dialect or Dialect.of(path)
+        # A Bloom scene is validated against its own perspective unless another schema was given
+        path_schema: LoadSchema = read_bloom_schema(path) if path_dialect == Dialect.BLOOM and not schema \
+            else base_schema
+
+        loader: GraphLoader = GraphLoader(BatchWriter(batch_size, parallelism), path_schema, batch_size, report)
+        await loader.load(read_records(path, path_dialect, label))
+
+    return report
+
+
+@app.command()
+def export(townsquare_id: UUID,
+           output: Optional[Path] = typer.Option(None, "--output", "-o", dir_okay=False,
+                                                 help="Target file, standard output by default"),
+           gzip: bool = typer.Option(False, help="Compress the NDJSON stream"),
+           include_credentials: bool = typer.Option(False, help="Export password hashes for a complete snapshot"),
+           page_size: int = typer.Option(DEFAULT_PAGE_SIZE, min=1, help="Nodes fetched per query"),
+           database: str = typer.Option("neo4j")):
+    """Stream the subgraph of a Townsquare as NDJSON in the format read by 'load'"""
+    config.configure_logger()
+    _run(_export(townsquare_id, output, gzip, include_credentials, page_size, database))
+
+
+async def _export(townsquare_id: UUID, output: Path | None, gzip: bool, include_credentials: bool, page_size: int,
+                  database: str) -> None:
+    await setup_db(database_name=database)
+
+    target = output.open("wb") if output else sys.stdout.buffer
+    try:
+        async for data in encode(export_townsquare(townsquare_id, page_size, include_credentials), gzip):
+            target.write(data)
+    finally:
+        if output:
+            target.close()
+
+
+@app.command()
+def recompute_acceptability(database: str = typer.Option("neo4j")):
+    """Recompute the grounded and preferred labels and support scores of every Claim"""
+    config.configure_logger()
+    results: dict = _run(_recompute_acceptability(database))
+
+    typer.echo(f"Recomputed the acceptability of {len(results)} claims")
+
+
+async def _recompute_acceptability(database: str) -> dict:
+    await setup_db(database_name=database)
+    return await get_acceptability_service().recompute_all()
+
+
+@app.command()
+def repair_counters(batch_size: int = typer.Option(DEFAULT_CHUNK_SIZE, min=1, help="Nodes recounted per transaction"),
+                    database: str = typer.Option("neo4j")):
+    """Recompute the engagement counters from the relationships, e.g. after a 'load'"""
+    config.configure_logger()
+    repaired: int = _run(_repair_counters(batch_size, database))
+
+    typer.echo(f"Repaired the counters of {repaired} nodes")
+
+
+async def _repair_counters(batch_size: int, database: str) -> int:
+    await setup_db(database_name=database)
+    return await counters.repair(NODE_CLASSES.values(), batch_size)
+
+
+@app.command()
+def generate(users: int = typer.Option(GeneratorSettings.users, min=1),
+             townsquares: int = typer.Option(GeneratorSettings.townsquares, min=1),
+             memberships_per_user: float = typer.Option(GeneratorSettings.memberships_per_user, min=0),
+             questions_per_townsquare: float = typer.Option(GeneratorSettings.questions_per_townsquare, min=0),
+             claims_per_question: float = typer.Option(GeneratorSettings.claims_per_question, min=0),
+             claim_fan_out: float = typer.Option(GeneratorSettings.claim_fan_out, min=0,
+                                                 help="Mean responses to each claim"),
+             claim_depth: int = typer.Option(GeneratorSettings.claim_depth, min=0,
+                                             help="Levels of responses below the answers of a question"),
+             attack_ratio: float = typer.Option(GeneratorSettings.attack_ratio, min=0, max=1),
+             premises_per_claim: float = typer.Option(GeneratorSettings.premises_per_claim, min=0),
+             evidence_per_premise: float = typer.Option(GeneratorSettings.evidence_per_premise, min=0),
+             counter_ratio: float = typer.Option(GeneratorSettings.counter_ratio, min=0, max=1),
+             popularity_exponent: float = typer.Option(GeneratorSettings.popularity_exponent, min=0,
+                                                       help="Zipf exponent of townsquare and user popularity"),
+             seed: int = typer.Option(GeneratorSettings.seed),
+             output: Optional[Path] = typer.Option(None, "--output", "-o", dir_okay=False,
+                                                   help="Write NDJSON for 'load' instead of writing to the database"),
+             records_per_file: Optional[int] = typer.Option(None, min=1, help="Split the NDJSON output"),
+             batch_size: int = typer.Option(DEFAULT_CHUNK_SIZE, min=1, help="Rows per UNWIND transaction"),
+             parallelism: int = typer.Option(4, min=1, help="Concurrent write transactions"),
+             database: str = typer.Option("neo4j")):
+    """Generate a synthetic graph of the given shape for capacity planning and load tests"""
+    config.configure_logger()
+    settings: GeneratorSettings = GeneratorSettings(
+        users=users, townsquares=townsquares, memberships_per_user=memberships_per_user,
+        questions_per_townsquare=questions_per_townsquare, claims_per_question=claims_per_question,
+        claim_fan_out=claim_fan_out, claim_depth=claim_depth, attack_ratio=attack_ratio,
+        premises_per_claim=premises_per_claim, evidence_per_premise=evidence_per_premise,
+        counter_ratio=counter_ratio, popularity_exponent=popularity_exponent, seed=seed)
+    expected: dict[str, int] = settings.expected_nodes()
+    typer.echo(f"Generating about {sum(expected.values())} nodes: "
+               f"{', '.join(f'{count} {label}' for label, count in expected.items())}")
+
+    generator: GraphGenerator = GraphGenerator(settings, batch_size)
+    if output:
+        paths: List[Path] = write_ndjson(generator.records(), output, records_per_file)
+        typer.echo(f"Wrote {len(paths)} files, load them in order with 'python -m src.core.cli load'")
+    else:
+        report, repaired = _run(_generate(generator, batch_size, parallelism, database))
+        typer.echo(f"Loaded {report.nodes} nodes and {report.relationships} relationships in {report.seconds:.1f}s "
+                   f"({report.rows_per_second:.0f} rows/s), repaired the counters of {repaired} nodes")
+
+    typer.echo(f"Generated {sum(generator.report.nodes.values())} nodes and "
+               f"{sum(generator.report.relationships.values())} relationships, "
+               f"run 'recompute-acceptability' to label the claims")
+
+
+async def _generate(generator: GraphGenerator, batch_size: int, parallelism: int,
+                    database: str) -> tuple[LoadReport, int]:
+    await setup_db(database_name=database, test_connection=True)
+
+    loader: GraphLoader = GraphLoader(BatchWriter(batch_size, parallelism), LoadSchema.from_models(), batch_size)
+    report: LoadReport = await loader.load(generator.records())
+    # The generated nodes carry no counters, they are derived from the relationships after loading
+    return report, await counters.repair(NODE_CLASSES.values(), batch_size)
+
+
+@app.command()
+def migrate(dry_run: bool = typer.Option(False, help="Only report the missing constraints and indexes"),
+            batch_size: int = typer.Option(migrations.DEFAULT_BATCH_SIZE, min=1,
+                                           help="Schema statements per transaction"),
+            timeout: int = typer.Option(migrations.DEFAULT_INDEX_TIMEOUT, min=1,
+                                        help="Seconds to wait for new indexes to be populated"),
+            database: str = typer.Option("neo4j")):
+    """Create the declared constraints and indexes that are missing from the database"""
+    config.configure_logger()
+    migration, seconds = _run(_migrate(dry_run, batch_size, timeout, database))
+
+    for item in migration.missing:
+        typer.echo(f"{'missing' if dry_run else 'created'}: {item.name}")
+    for name in migration.undeclared:
+        typer.echo(f"undeclared: {name}")
+    typer.echo(f"{len(migration.missing)} missing, {len(migration.present)} up to date, "
+               f"{len(migration.undeclared)} undeclared" + ("" if dry_run else f", applied in {seconds:.1f}s"))
+
+
+async def _migrate(dry_run: bool, batch_size: int, timeout: int, database: str) -> tuple[Migration, float]:
+    await setup_db(database_name=database)
+    migration: Migration = await migrations.plan(declared_schema())
+    if dry_run:
+        return migration, 0.0
+    return migration, await migrations.apply(migration, batch_size, timeout)
+
+
+@app.command()
+def build_schema(check: bool = typer.Option(False, help="Fail if the controller list is stale instead of writing it")):
+    """Regenerate the controller list the GraphQL schema is built from, validate it and report the build timings"""
+    modules: list[str] = discover_controller_modules()
+    source: str = render_controller_modules(modules)
+    stale: bool = not CONTROLLERS_FILE.exists() or CONTROLLERS_FILE.read_text() != source
+
+    if stale and check:
+        typer.echo(f"{CONTROLLERS_FILE.name} is stale, run 'python -m src.core.cli build-schema'", err=True)
+        raise typer.Exit(1)
+
+    registry: SchemaRegistry = SchemaRegistry(modules)
+    problems: list[str] = registry.validate()
+    if not problems:
+        try:
+            registry.schema()
+        except Exception as e:
+            problems.append(f"Building the schema failed: {e}")
+
+    if problems:
+        for problem in problems:
+            typer.echo(problem, err=True)
+        raise typer.Exit(1)
+
+    if stale:
+        CONTROLLERS_FILE.write_text(source)
+        typer.echo(f"Wrote {len(modules)} controllers to {CONTROLLERS_FILE.name}")
+    for line in registry.timings.report():
+        typer.echo(line)
+
+
+if __name__ == "__main__":
+    app()
@@ -2,14 +2,23 @@ import logging
 
 from dotenv import load_dotenv
 
-from core.db_utils import setup_db
+from src.app.auth.password_hasher import get_password_hasher
+from src.core.db_utils import setup_db, teardown_db
+from src.core.schema_registry import log_startup_report
 
 load_dotenv(".env")
 
 
 async def configure_app():
     configure_logger()
-    await setup_db(test_connection=True, update_constraints=False)
+    log_startup_report()
+    await setup_db(test_connection=True, update_constraints=False, warm_up_pool=True, warm_up_cache=True,
+                   build_indexes=True)
+
+
+async def shutdown_app():
+    get_password_hasher().shutdown()
+    await teardown_db()
 
 
 def configure_logger(level=logging.INFO):
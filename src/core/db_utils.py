@@ -1,20 +1,32 @@
 import logging
 import os
+from typing import List, Type
 
 from neomodel import config, adb
 from neomodel.exceptions import NeomodelException
 
 from src.app.arg_framework.claim.claim_repository import ClaimRepository
+from src.app.arg_framework.duplicates.duplicate_service import get_duplicate_service
 from src.app.arg_framework.evidence.evidence_repository import EvidenceRepository
 from src.app.arg_framework.premise.premise_repository import PremiseRepository
 from src.app.arg_framework.question.question_repository import QuestionRepository
 from src.app.townsquare.townsquare_repository import TownsquareRepository
 from src.app.user.user_repository import UserRepository
+from src.infra.db.db_lifecycle import DriverSettings, close_driver, open_driver, warm_up
+from src.infra.db.graph_repository_interface import IGraphRepository
+from src.infra.db.migrations import SchemaItem, addressable_items, migrate, schema_items
 
 
 async def setup_db(database_name: str = "neo4j", test_connection: bool = False, purge_db: bool = False,
-                   update_constraints: bool = False) -> None:
-    _configure_neomodel(database_name)
+                   update_constraints: bool = False, warm_up_pool: bool = False, warm_up_cache: bool = False,
+                   build_indexes: bool = False) -> None:
+    settings: DriverSettings = await _configure_neomodel(database_name)
+    if warm_up_pool:
+        await warm_up(settings.warmup_connections)
+    if warm_up_cache:
+        await TownsquareRepository().warm_up_node_cache(int(os.getenv("NODE_CACHE_WARMUP_TOWNSQUARES") or 0))
+    if build_indexes:
+        await get_duplicate_service().build()
     if test_connection:
         await _test_db_connection()
     if purge_db:
@@ -23,18 +35,17 @@ async def setup_db(database_name: str = "neo4j", test_connection: bool = False,
         await _update_constraints()
 
 
-def _configure_neomodel(database: str = "neo4j") -> None:
-    url: str = os.getenv("NEO4J_URI")
-    username: str = os.getenv("NEO4J_USER")
-    password: str = os.getenv("NEO4J_PASSWORD")
+async def teardown_db() -> None:
+    await close_driver()
 
-    if not url or not username or not password:
-        raise ValueError("Database credentials not found in environment variables.")
 
-    config.DATABASE_URL = f"bolt://{username}:{password}@{url}/{database}"
+async def _configure_neomodel(database: str = "neo4j") -> DriverSettings:
+    settings: DriverSettings = DriverSettings.from_env(database)
     config.AUTO_INSTALL_LABELS = True
+    await open_driver(settings)
 
     logging.info(f"Neomodel configured for database: {database}")
+    return settings
 
 
 async def _test_db_connection():
@@ -55,14 +66,27 @@ async def _purge_db():
         raise
 
 
+# The repositories whose 'database_constraints' make up the declared schema, by label
+SCHEMA_REPOSITORIES: dict[str, Type[IGraphRepository]] = {
+    "User":       UserRepository,
+    "Townsquare": TownsquareRepository,
+    "Question":   QuestionRepository,
+    "Claim":      ClaimRepository,
+    "Premise":    PremiseRepository,
+    "Evidence":   EvidenceRepository,
+}
+
+
+def declared_schema() -> List[SchemaItem]:
+    items: List[SchemaItem] = addressable_items()
+    for label, repository in SCHEMA_REPOSITORIES.items():
+        items.extend(schema_items(label, repository.database_constraints))
+    return items
+
+
 async def _update_constraints():
     try:
-        await UserRepository().add_database_constraints(label="User")
-        await TownsquareRepository().add_database_constraints(label="Townsquare")
-        await QuestionRepository().add_database_constraints(label="Question")
-        await ClaimRepository().add_database_constraints(label="Claim")
-        await PremiseRepository().add_database_constraints(label="Premise")
-        await EvidenceRepository().add_database_constraints(label="Evidence")
+        await migrate(declared_schema())
     except Exception as e:
         logging.error(f"Error updating database constraints: {str(e)}")
         raise
@@ -0,0 +1,221 @@
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import AsyncIterator, Iterator
+
+from graphql import DocumentNode, GraphQLError
+from starlette.requests import HTTPConnection, Request
+from strawberry.extensions import SchemaExtension
+from strawberry.fastapi import GraphQLRouter
+
+DEFAULT_MAX_SIZE: int = 1000
+
+
+def query_hash(query: str) -> str:
+    return hashlib.sha256(query.encode()).hexdigest()
+
+
+@dataclass
+class CachedDocument:
+    query: str
+    document: DocumentNode | None = None
+    # None until the document was validated, an empty list once it passed
+    errors: list[GraphQLError] | None = None
+
+
+@dataclass(frozen=True)
+class DocumentCacheStatistics:
+    size: int
+    max_size: int
+    allowed: int
+    hits: int
+    misses: int
+    evictions: int
+    rejections: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups: int = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class DocumentCache:
+    """
+    Parsed and validated GraphQL documents by the SHA-256 of their query, the least recently used one is evicted once
+    'max_size' is reached.
+
+    The same hash identifies an Automatic Persisted Query, so a client that sent a query once may afterwards send only
+    its hash. With an allow-list only the operations it contains are executed, their entries are never evicted and no
+    other query can be registered.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_MAX_SIZE, persisted_queries: bool = True,
+                 allow_list: dict[str, str] | None = None):
+        """
+        :param allow_list: the allowed queries by their hash, None allows every query
+        :raises ValueError: if a hash of the allow-list does not match its query
+        """
+        self.max_size: int = max_size
+        self.persisted_queries: bool = persisted_queries
+        self.strict: bool = allow_list is not None
+        self.__entries: OrderedDict[str, CachedDocument] = OrderedDict()
+        self.__allowed: dict[str, CachedDocument] = {}
+        self.__hits: int = 0
+        self.__misses: int = 0
+        self.__evictions: int = 0
+        self.__rejections: int = 0
+
+        for key, query in (allow_list or {}).items():
+            if query_hash(query) != key:
+                raise ValueError(f"The allow-list hash {key} does not match its query")
+            self.__allowed[key] = CachedDocument(query)
+
+    def get(self, key: str) -> CachedDocument | None:
+        entry: CachedDocument | None = self.__allowed.get(key) or self.__entries.get(key)
+
+        if entry is None:
+            self.__misses += 1
+            return None
+
+        if key in self.__entries:
+            self.__entries.move_to_end(key)
+        self.__hits += 1
+        return entry
+
+    def register(self, key: str, query: str) -> CachedDocument:
+        """
+        The entry of a query, added if it is not cached yet
+
+        :raises PermissionError: if an allow-list is enforced and does not contain the query
+        """
+        entry: CachedDocument | None = self.get(key)
+        if entry is not None:
+            return entry
+
+        if self.strict:
+            self.__rejections += 1
+            raise PermissionError("Operation is not on the allow-list")
+
+        entry = CachedDocument(query)
+        if self.max_size <= 0:
+            return entry
+
+        self.__entries[key] = entry
+        while len(self.__entries) > self.max_size:
+            self.__entries.popitem(last=False)
+            self.__evictions += 1
+        return entry
+
+    def clear(self) -> None:
+        """Drop the cached documents, e.g. after the schema changed, allow-listed queries are only reparsed"""
+        self.__entries.clear()
+        for key, entry in self.__allowed.items():
+            self.__allowed[key] = CachedDocument(entry.query)
+
+    def statistics(self) -> DocumentCacheStatistics:
+        return DocumentCacheStatistics(size=len(self.__entries), max_size=self.max_size, allowed=len(self.__allowed),
+                                       hits=self.__hits, misses=self.__misses, evictions=self.__evictions,
+                                       rejections=self.__rejections)
+
+
+def read_allow_list(path: Path) -> dict[str, str]:
+    """
+    Read a persisted query manifest, either a JSON object of queries by their SHA-256 hash or a JSON list of queries
+    """
+    manifest: dict | list = json.loads(path.read_text())
+    if isinstance(manifest, list):
+        return {query_hash(query): query for query in manifest}
+    return manifest
+
+
+async def _persisted_query_hash(request: HTTPConnection | None) -> str | None:
+    """The hash of an Automatic Persisted Query request, from the 'extensions' of the body or the query string"""
+    if not isinstance(request, Request):
+        return None
+
+    if request.method == "GET":
+        extensions: dict = json.loads(request.query_params.get("extensions") or "{}")
+    elif "application/json" not in (request.headers.get("Content-Type") or ""):
+        return None
+    else:
+        body: bytes = await request.body()
+        # Only requests that use persisted queries pay for parsing the body a second time
+        if b"persistedQuery" not in body:
+            return None
+        extensions = json.loads(body).get("extensions") or {}
+
+    return (extensions.get("persistedQuery") or {}).get("sha256Hash")
+
+
+class DocumentCacheExtension(SchemaExtension):
+    """
+    Skips parsing and validation, including the depth, alias and token limits, for queries that passed them before,
+    resolves Automatic Persisted Queries and enforces the allow-list
+    """
+
+    def __init__(self, *, execution_context):
+        super().__init__(execution_context=execution_context)
+        self.cache: DocumentCache = get_document_cache()
+        self.entry: CachedDocument | None = None
+
+    async def on_operation(self) -> AsyncIterator[None]:
+        query: str | None = self.execution_context.query
+        request = getattr(self.execution_context.context, "request", None)
+        key: str | None = await _persisted_query_hash(request) if self.cache.persisted_queries else None
+
+        if key and query and query_hash(query) != key:
+            raise GraphQLError("provided sha does not match query",
+                               extensions={"code": "PERSISTED_QUERY_HASH_MISMATCH"})
+
+        if key and not query:
+            self.entry = self.cache.get(key)
+            if self.entry is None:
+                # Apollo clients retry with the full query after this error
+                raise GraphQLError("PersistedQueryNotFound", extensions={"code": "PERSISTED_QUERY_NOT_FOUND"})
+            self.execution_context.query = self.entry.query
+
+        elif query:
+            try:
+                self.entry = self.cache.register(key or query_hash(query), query)
+            except PermissionError as e:
+                raise GraphQLError(str(e), extensions={"code": "OPERATION_NOT_ALLOWED"}) from e
+
+        yield
+
+    def on_parse(self) -> Iterator[None]:
+        if self.entry and self.entry.document:
+            self.execution_context.graphql_document = self.entry.document
+        yield
+        if self.entry and not self.entry.document:
+            self.entry.document = self.execution_context.graphql_document
+
+    def on_validate(self) -> Iterator[None]:
+        if self.entry and self.entry.errors is not None:
+            self.execution_context.errors = list(self.entry.errors)
+        yield
+        if self.entry and self.entry.errors is None:
+            self.entry.errors = list(self.execution_context.errors or [])
+
+
+class PersistedQueryRouter(GraphQLRouter):
+    """
+    Serves hash-only Automatic Persisted Queries over GET. Without a 'query' parameter strawberry would answer them
+    with the GraphQL IDE before the DocumentCacheExtension could resolve the hash.
+    """
+
+    def should_render_graphql_ide(self, request) -> bool:
+        return super().should_render_graphql_ide(request) and request.query_params.get("extensions") is None
+
+
+document_cache: DocumentCache = DocumentCache(
+    max_size=int(os.getenv("GRAPHQL_DOCUMENT_CACHE_SIZE") or DEFAULT_MAX_SIZE),
+    persisted_queries=(os.getenv("GRAPHQL_PERSISTED_QUERIES") or "true").lower() in ("1", "true", "yes"),
+    allow_list=read_allow_list(Path(os.environ["GRAPHQL_ALLOW_LIST"])) if os.getenv("GRAPHQL_ALLOW_LIST") else None,
+)
+
+
+def get_document_cache() -> DocumentCache:
+    return document_cache
@@ -0,0 +1,118 @@
+import json
+import zlib
+from typing import AsyncIterator
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
+from neomodel import adb
+
+from src.app.auth.auth_service import AuthenticationService, get_auth_service, oauth2_scheme
+from src.app.townsquare.townsquare_scope import townsquare_scope
+from src.infra.db.db_types import ADDRESSABLE_LABEL
+
+# Export order: every node is written before the relationships that reference it, as the loader expects
+EXPORT_LABELS: tuple[str, ...] = ("Townsquare", "User", "Question", "Claim", "Premise", "Evidence")
+CONTENT_LABELS: tuple[str, ...] = ("Question", "Claim", "Premise", "Evidence")
+CREDENTIAL_PROPERTIES: dict[str, set[str]] = {"User": {"password"}}
+DEFAULT_PAGE_SIZE: int = 1000
+
+router: APIRouter = APIRouter()
+
+
+def export_scope(label: str, variable: str = "n") -> str:
+    """Townsquare scope of the export, users are exported if they are members or authored any exported node"""
+    if label != "User":
+        return townsquare_scope(label, variable)
+
+    authored: str = " OR ".join(f"(x:{content} AND {townsquare_scope(content, 'x')})" for content in CONTENT_LABELS)
+    return (f"({townsquare_scope('User', variable)} OR "
+            f"EXISTS {{ MATCH ({variable})<-[:AUTHORED_BY|ASKED_BY]-(x:{ADDRESSABLE_LABEL}) WHERE {authored} }})")
+
+
+def _in_export(variable: str) -> str:
+    return " OR ".join(f"({variable}:{label} AND {export_scope(label, variable)})" for label in EXPORT_LABELS)
+
+
+async def _pages(label: str, projection: str, params: dict, page_size: int) -> AsyncIterator[list]:
+    """Keyset pagination on the uid of the nodes of one label in the export"""
+    query = (f"MATCH (n:{label}) WHERE n.uid > $after AND {export_scope(label)} "
+             f"WITH n ORDER BY n.uid LIMIT $limit "
+             f"{projection}")
+    after: str = ""
+
+    while True:
+        results, meta = await adb.cypher_query(query, {**params, "after": after, "limit": page_size})
+        if not results:
+            return
+        yield results
+        if len(results) < page_size:
+            return
+        after = max(row[0] for row in results)
+
+
+async def export_townsquare(townsquare_id: UUID, page_size: int = DEFAULT_PAGE_SIZE,
+                            include_credentials: bool = False) -> AsyncIterator[str]:
+    """
+    Stream the subgraph of a Townsquare as NDJSON records in the loader format, one chunk of lines per page
+
+    :param townsquare_id:
+    :param page_size: the number of nodes fetched per query
+    :param include_credentials: export password hashes, only for complete snapshots
+    """
+    params: dict = {"townsquare_id": townsquare_id.hex}
+
+    for label in EXPORT_LABELS:
+        excluded: set[str] = {"uid"} | (set() if include_credentials else CREDENTIAL_PROPERTIES.get(label, set()))
+        async for rows in _pages(label, "RETURN n.uid, properties(n)", params, page_size):
+            yield "".join(_line({"kind": "node", "label": label, "uid": uid,
+                                 "properties": {key: value for key, value in properties.items() if key not in excluded}})
+                          for uid, properties in rows)
+
+    relationships: str = (f"RETURN n.uid, [(n)-[r]->(m:{ADDRESSABLE_LABEL}) WHERE {_in_export('m')} | "
+                          f"[type(r), m.uid]]")
+    for label in EXPORT_LABELS:
+        async for rows in _pages(label, relationships, params, page_size):
+            yield "".join(_line({"kind": "relationship", "type": relationship_type, "start": uid, "end": end})
+                          for uid, targets in rows for relationship_type, end in targets)
+
+
+async def encode(chunks: AsyncIterator[str], compress: bool = False) -> AsyncIterator[bytes]:
+    """Encode the NDJSON chunks, optionally as one gzip stream"""
+    compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16) if compress else None
+
+    async for chunk in chunks:
+        data: bytes = chunk.encode()
+        if compressor:
+            data = compressor.compress(data)
+        if data:
+            yield data
+
+    if compressor:
+        yield compressor.flush()
+
+
+def _line(record: dict) -> str:
+    return json.dumps(record, default=str, ensure_ascii=False) + "\n"
+
+
+@router.get("/townsquares/{townsquare_id}")
+async def export_townsquare_endpoint(townsquare_id: UUID, compress: bool = False,
+                                     token: str = Depends(oauth2_scheme),
+                                     auth_service: AuthenticationService = Depends(get_auth_service)):
+    try:
+        auth_service.decode_access_token(token)
+    except PermissionError as e:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token",
+                            headers={"WWW-Authenticate": "Bearer"}) from e
+
+    results, meta = await adb.cypher_query("MATCH (t:Townsquare {uid: $uid}) RETURN count(t)",
+                                           {"uid": townsquare_id.hex})
+    if not results[0][0]:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,
+                            detail=f"The Townsquare with ID '{townsquare_id}' not found in the Database")
+
+    filename: str = f"townsquare-{townsquare_id}.ndjson{'.gz' if compress else ''}"
+    return StreamingResponse(encode(export_townsquare(townsquare_id), compress),
+                             media_type="application/gzip" if compress else "application/x-ndjson",
+                             headers={"Content-Disposition": f'attachment; filename="{filename}"'})
@@ -0,0 +1,305 @@
+import itertools
+import json
+import random
+import time
+from bisect import bisect_left
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterator, TextIO
+from uuid import UUID
+
+from faker import Faker
+
+from src.app.auth.password_hasher import pwd_context
+
+# Records are written in the loader format, see src.core.loader:
+#   {"kind": "node", "label": "Claim", "uid": "...", "properties": {...}}
+#   {"kind": "relationship", "type": "ATTACKS", "start": "<uid>", "end": "<uid>"}
+
+DAY: float = 86400.0
+
+
+@dataclass(frozen=True)
+class GeneratorSettings:
+    """
+    Shape of a synthetic Hive graph, all per-item counts are means of Poisson distributions.
+
+    Townsquares and users are ranked by popularity with a Zipf law of exponent 'popularity_exponent': the townsquare
+    of rank r draws members and questions in proportion to 1 / r^s, and the user of rank r authors content in the same
+    proportion, so a few townsquares and users dominate like in a real deployment.
+    """
+    users: int = 10_000
+    townsquares: int = 100
+    memberships_per_user: float = 3.0
+    questions_per_townsquare: float = 50.0
+    # Claims answering a question, and responses to each claim on every level of the attack/support tree below it
+    claims_per_question: float = 3.0
+    claim_fan_out: float = 1.0
+    claim_depth: int = 3
+    # Share of responses that attack the claim they respond to, the others support it
+    attack_ratio: float = 0.6
+    premises_per_claim: float = 1.0
+    evidence_per_premise: float = 1.0
+    # Share of evidence that counters its premise, the other evidence supports it
+    counter_ratio: float = 0.3
+    popularity_exponent: float = 1.1
+    # Content is created over this many days before now
+    history_days: int = 365
+    password: str = "hive-password"
+    locale: str = "en_US"
+    seed: int = 0
+
+    def __post_init__(self):
+        if self.users < 1 or self.townsquares < 1:
+            raise ValueError("At least one user and one townsquare are needed")
+        if not 0 <= self.attack_ratio <= 1 or not 0 <= self.counter_ratio <= 1:
+            raise ValueError("The attack and counter ratios have to be in [0, 1]")
+        if self.claim_depth < 0 or self.popularity_exponent < 0:
+            raise ValueError("The claim depth and popularity exponent must not be negative")
+
+    def expected_nodes(self) -> dict[str, int]:
+        """The expected number of nodes per label, for capacity planning before a run"""
+        questions: float = self.townsquares * self.questions_per_townsquare
+        claims: float = questions * self.claims_per_question * sum(self.claim_fan_out ** depth
+                                                                   for depth in range(self.claim_depth + 1))
+        premises: float = claims * self.premises_per_claim
+        return {
+            "User":       self.users,
+            "Townsquare": self.townsquares,
+            "Question":   round(questions),
+            "Claim":      round(claims),
+            "Premise":    round(premises),
+            "Evidence":   round(premises * self.evidence_per_premise),
+        }
+
+
+@dataclass
+class GeneratorReport:
+    nodes: Counter = field(default_factory=Counter)
+    relationships: Counter = field(default_factory=Counter)
+    seconds: float = 0.0
+
+
+class _Popularity:
+    """Weighted draws of indexes 0..n-1 with Zipf weights, O(log n) per draw"""
+
+    def __init__(self, size: int, exponent: float, rng: random.Random):
+        self.rng: random.Random = rng
+        self.cumulative: list[float] = list(itertools.accumulate(1 / (rank ** exponent)
+                                                                 for rank in range(1, size + 1)))
+
+    @property
+    def total(self) -> float:
+        return self.cumulative[-1]
+
+    def weight(self, index: int) -> float:
+        return self.cumulative[index] - (self.cumulative[index - 1] if index else 0.0)
+
+    def draw(self) -> int:
+        return min(bisect_left(self.cumulative, self.rng.random() * self.total), len(self.cumulative) - 1)
+
+
+class GraphGenerator:
+    """
+    Streams a synthetic graph as loader records: users, townsquares and memberships first, then the content of each
+    townsquare in chunks of about 'chunk_size' nodes, each chunk followed by its relationships. A chunk only
+    references nodes of earlier chunks or of itself, as the GraphLoader expects.
+
+    Only the uids of users and the members of each townsquare are kept in memory, the content is never held beyond
+    a chunk. Counters and acceptability are not generated, repair and recompute them after loading.
+    """
+
+    def __init__(self, settings: GeneratorSettings, chunk_size: int = 10_000):
+        self.settings: GeneratorSettings = settings
+        self.chunk_size: int = chunk_size
+        self.report: GeneratorReport = GeneratorReport()
+
+        self.__rng: random.Random = random.Random(settings.seed)
+        self.__faker: Faker = Faker(settings.locale)
+        self.__faker.seed_instance(settings.seed)
+        self.__now: float = time.time()
+        self.__sequence: Iterator[int] = itertools.count(1)
+        self.__nodes: list[dict] = []
+        self.__relationships: list[dict] = []
+
+    # Sampling
+
+    def __uid(self) -> str:
+        return UUID(int=self.__rng.getrandbits(128), version=4).hex
+
+    def __poisson(self, mean: float) -> int:
+        """Knuth's method for small means, a rounded normal approximation for large ones"""
+        if mean <= 0:
+            return 0
+        if mean > 30:
+            return max(0, round(self.__rng.gauss(mean, mean ** 0.5)))
+
+        threshold: float = 2.718281828459045 ** -mean
+        count, product = 0, self.__rng.random()
+        while product > threshold:
+            count += 1
+            product *= self.__rng.random()
+        return count
+
+    def __created_at(self, after: float | None = None) -> float:
+        """A creation time in the history window, or shortly after an earlier one"""
+        if after is None:
+            return self.__now - self.__rng.random() * self.settings.history_days * DAY
+        return min(self.__now, after + self.__rng.expovariate(1 / DAY))
+
+    def __unique(self, text: str) -> str:
+        """Content properties are unique, a sequence number keeps generated texts apart"""
+        return f"{text} ({next(self.__sequence)})"
+
+    # Records
+
+    def __node(self, label: str, properties: dict) -> str:
+        uid: str = self.__uid()
+        self.__nodes.append({"kind": "node", "label": label, "uid": uid, "properties": properties})
+        self.report.nodes[label] += 1
+        return uid
+
+    def __relationship(self, relationship_type: str, start: str, end: str) -> None:
+        self.__relationships.append({"kind": "relationship", "type": relationship_type, "start": start, "end": end})
+        self.report.relationships[relationship_type] += 1
+
+    def __flush(self) -> Iterator[dict]:
+        yield from self.__nodes
+        yield from self.__relationships
+        self.__nodes, self.__relationships = [], []
+
+    # Graph
+
+    def records(self) -> Iterator[dict]:
+        started: float = time.perf_counter()
+        settings: GeneratorSettings = self.settings
+        fake: Faker = self.__faker
+        password: str = pwd_context.hash(settings.password)
+
+        users: list[str] = []
+        for _ in range(settings.users):
+            username: str = f"{fake.user_name()}{len(users) + 1}"
+            users.append(self.__node("User", {"username": username, "email": f"{username}@{fake.free_email_domain()}",
+                                              "password": password, "first_name": fake.first_name(),
+                                              "created_at": self.__created_at()}))
+            if len(self.__nodes) >= self.chunk_size:
+                yield from self.__flush()
+
+        townsquares: list[str] = [self.__node("Townsquare", {"name": self.__unique(fake.catch_phrase()),
+                                                             "description": fake.paragraph(nb_sentences=2),
+                                                             "created_at": self.__created_at()})
+                                  for _ in range(settings.townsquares)]
+        yield from self.__flush()
+
+        townsquare_popularity: _Popularity = _Popularity(settings.townsquares, settings.popularity_exponent,
+                                                         self.__rng)
+        members: list[list[int]] = [[] for _ in townsquares]
+        for user, user_uid in enumerate(users):
+            joined: set[int] = {townsquare_popularity.draw()
+                                for _ in range(min(self.__poisson(settings.memberships_per_user),
+                                                   settings.townsquares))}
+            for townsquare in joined:
+                members[townsquare].append(user)
+                self.__relationship("MEMBER_OF", user_uid, townsquares[townsquare])
+            if len(self.__relationships) >= self.chunk_size:
+                yield from self.__flush()
+        yield from self.__flush()
+
+        question_mean: float = settings.questions_per_townsquare * settings.townsquares / townsquare_popularity.total
+        for townsquare, townsquare_uid in enumerate(townsquares):
+            # Townsquares without members draw authors from all users
+            authors: list[int] = members[townsquare] or list(range(len(users)))
+            activity: _Popularity = _Popularity(len(authors), settings.popularity_exponent, self.__rng)
+
+            for _ in range(self.__poisson(question_mean * townsquare_popularity.weight(townsquare))):
+                self.__question(townsquare_uid, lambda: users[authors[activity.draw()]])
+                if len(self.__nodes) >= self.chunk_size:
+                    yield from self.__flush()
+        yield from self.__flush()
+
+        self.report.seconds = time.perf_counter() - started
+
+    def __question(self, townsquare_uid: str, author) -> None:
+        settings: GeneratorSettings = self.settings
+        fake: Faker = self.__faker
+        created_at: float = self.__created_at()
+
+        question_uid: str = self.__node("Question", {
+            "question": self.__unique(fake.sentence(nb_words=9).rstrip(".") + "?"),
+            "description": fake.paragraph(nb_sentences=3), "created_at": created_at})
+        self.__relationship("ASKED_BY", question_uid, author())
+        self.__relationship("ASKED_IN", question_uid, townsquare_uid)
+
+        # Breadth-first over the attack/support tree of the question's answers
+        level: list[tuple[str, float]] = []
+        for _ in range(self.__poisson(settings.claims_per_question)):
+            claim_uid, claim_created_at = self.__claim(author, created_at)
+            self.__relationship("ANSWERS", claim_uid, question_uid)
+            level.append((claim_uid, claim_created_at))
+
+        for _ in range(settings.claim_depth):
+            responses: list[tuple[str, float]] = []
+            for target_uid, target_created_at in level:
+                for _ in range(self.__poisson(settings.claim_fan_out)):
+                    claim_uid, claim_created_at = self.__claim(author, target_created_at)
+                    relationship: str = "ATTACKS" if self.__rng.random() < settings.attack_ratio else "SUPPORTS"
+                    self.__relationship(relationship, claim_uid, target_uid)
+                    responses.append((claim_uid, claim_created_at))
+            level = responses
+
+    def __claim(self, author, after: float) -> tuple[str, float]:
+        settings: GeneratorSettings = self.settings
+        fake: Faker = self.__faker
+        created_at: float = self.__created_at(after)
+
+        claim_uid: str = self.__node("Claim", {"content": self.__unique(fake.sentence(nb_words=14)),
+                                               "created_at": created_at})
+        self.__relationship("AUTHORED_BY", claim_uid, author())
+
+        for _ in range(self.__poisson(settings.premises_per_claim)):
+            premise_uid: str = self.__node("Premise", {"content": self.__unique(fake.sentence(nb_words=12)),
+                                                       "created_at": self.__created_at(created_at)})
+            self.__relationship("AUTHORED_BY", premise_uid, author())
+            self.__relationship("HAS_PREMISE", claim_uid, premise_uid)
+
+            for _ in range(self.__poisson(settings.evidence_per_premise)):
+                evidence_uid: str = self.__node("Evidence", {
+                    "content": self.__unique(fake.paragraph(nb_sentences=2)), "source": fake.url(),
+                    "created_at": self.__created_at(created_at)})
+                self.__relationship("AUTHORED_BY", evidence_uid, author())
+                relationship: str = "COUNTERS" if self.__rng.random() < settings.counter_ratio else "SUPPORTS"
+                self.__relationship(relationship, evidence_uid, premise_uid)
+
+        return claim_uid, created_at
+
+
+def write_ndjson(records: Iterator[dict], output: Path, records_per_file: int | None = None) -> list[Path]:
+    """
+    Write the records as NDJSON, split into numbered files of at most 'records_per_file' records if given. Splits
+    only fall between records, so the files can be loaded in order.
+
+    :return: the written files
+    """
+    paths: list[Path] = []
+    file: TextIO | None = None
+    written: int = 0
+
+    try:
+        for record in records:
+            if file is None or (records_per_file and written >= records_per_file):
+                if file:
+                    file.close()
+                path: Path = output if not records_per_file else \
+                    output.with_name(f"{output.stem}-{len(paths) + 1:05d}{output.suffix or '.ndjson'}")
+                file = path.open("w", encoding="utf-8")
+                paths.append(path)
+                written = 0
+
+            file.write(json.dumps(record, ensure_ascii=False) + "\n")
+            written += 1
+    finally:
+        if file:
+            file.close()
+
+    return paths
@@ -0,0 +1,346 @@
+import csv
+import json
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
+from pathlib import Path
+from typing import Iterator, Iterable, TextIO, Type, Any
+
+from neomodel import AsyncStructuredNode, DateTimeProperty, IntegerProperty, FloatProperty, BooleanProperty
+from neomodel.util import OUTGOING, INCOMING
+
+from src.app.arg_framework.claim.claim import Claim
+from src.app.arg_framework.evidence.evidence import Evidence
+from src.app.arg_framework.premise.premise import Premise
+from src.app.arg_framework.question.question import Question
+from src.app.townsquare.townsquare import Townsquare
+from src.app.user.user import User
+from src.infra.db.batch_writer import BatchWriter
+from src.infra.db.db_types import ADDRESSABLE_LABEL
+
+# Records shared by every dialect, also written by the exporter:
+#   {"kind": "node", "label": "Claim", "uid": "...", "properties": {"content": "...", "created_at": 1719321902.5}}
+#   {"kind": "relationship", "type": "ATTACKS", "start": "<uid>", "end": "<uid>"}
+# Flat node records ({"label": "Claim", "uid": "...", "content": "..."}) are accepted as well.
+
+NODE_CLASSES: dict[str, Type[AsyncStructuredNode]] = {
+    node_class.__label__: node_class for node_class in (User, Townsquare, Question, Claim, Premise, Evidence)
+}
+
+
+class Dialect(str, Enum):
+    JSON = "json"
+    NDJSON = "ndjson"
+    CSV = "csv"
+    BLOOM = "bloom"
+
+    @classmethod
+    def of(cls, path: Path) -> "Dialect":
+        if path.suffix in (".ndjson", ".jsonl"):
+            return cls.NDJSON
+        if path.suffix == ".csv":
+            return cls.CSV
+        if path.suffix == ".json":
+            # Record files are arrays, Bloom perspectives and scenes are objects
+            with path.open(encoding="utf-8") as file:
+                return cls.JSON if file.read(64).lstrip().startswith("[") else cls.BLOOM
+        raise ValueError(f"Cannot detect the dialect of '{path}'")
+
+
+@dataclass
+class LoadSchema:
+    """Allowed node properties per label and allowed (source label, target label) segments per relationship type"""
+    properties: dict[str, set[str]]
+    segments: dict[str, list[list[str]]]
+
+    @classmethod
+    def from_models(cls) -> "LoadSchema":
+        segments: dict[str, list[list[str]]] = {}
+
+        for label, node_class in NODE_CLASSES.items():
+            for name, _ in node_class.__all_relationships__:
+                definition = getattr(node_class, name)
+                definition.lookup_node_class()
+                target: str = definition.definition["node_class"].__label__
+                direction: int = definition.definition["direction"]
+
+                segment: list[str] = [target, label] if direction == INCOMING else [label, target]
+                relationship_segments = segments.setdefault(definition.definition["relation_type"], [])
+                if segment not in relationship_segments:
+                    relationship_segments.append(segment)
+                if direction not in (OUTGOING, INCOMING) and segment[::-1] not in relationship_segments:
+                    relationship_segments.append(segment[::-1])
+
+        return cls(properties={label: cls.__model_properties(node_class) for label, node_class in NODE_CLASSES.items()},
+                   segments=segments)
+
+    @classmethod
+    def from_bloom(cls, perspective: dict) -> "LoadSchema":
+        """Use the categories and path segments of a Bloom perspective, restricted to the labels of the models"""
+        properties: dict[str, set[str]] = {}
+        for category in perspective.get("categories", []):
+            for label in category.get("labels", []):
+                if label in NODE_CLASSES:
+                    properties[label] = ({prop["name"] for prop in category.get("properties", [])}
+                                         & cls.__model_properties(NODE_CLASSES[label]))
+
+        segments: dict[str, list[list[str]]] = {}
+        for segment in perspective.get("metadata", {}).get("pathSegments", []):
+            if segment["source"] in properties and segment["target"] in properties:
+                segments.setdefault(segment["relationshipType"], []).append([segment["source"], segment["target"]])
+
+        return cls(properties=properties, segments=segments)
+
+    @staticmethod
+    def __model_properties(node_class: Type[AsyncStructuredNode]) -> set[str]:
+        return set(node_class.defined_properties(aliases=False, rels=False))
+
+
+@dataclass
+class LoadReport:
+    nodes: int = 0
+    relationships: int = 0
+    skipped_relationships: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return (self.nodes + self.relationships) / self.seconds if self.seconds else 0.0
+
+
+# Readers
+
+def read_records(path: Path, dialect: Dialect, label: str | None = None) -> Iterator[dict]:
+    """
+    Stream the records of a file, only the Bloom dialect reads its document at once
+
+    :param label: the label of node records that do not name one, e.g. for a CSV file per label
+    """
+    with path.open(encoding="utf-8", newline="") as file:
+        if dialect == Dialect.NDJSON:
+            records: Iterable[dict] = (json.loads(line) for line in file if line.strip())
+        elif dialect == Dialect.JSON:
+            records = _read_json_array(file)
+        elif dialect == Dialect.CSV:
+            records = ({key: value for key, value in row.items() if value != ""} for row in csv.DictReader(file))
+        else:
+            records = _read_bloom(json.load(file))
+
+        for record in records:
+            yield normalise_record(record, label)
+
+
+def read_bloom_schema(path: Path) -> LoadSchema:
+    with path.open(encoding="utf-8") as file:
+        return LoadSchema.from_bloom(json.load(file))
+
+
+def _read_json_array(file: TextIO, buffer_size: int = 1 << 16) -> Iterator[dict]:
+    decoder: json.JSONDecoder = json.JSONDecoder()
+    buffer: str = ""
+    started: bool = False
+
+    while True:
+        buffer = buffer.lstrip()
+        if not started and buffer:
+            if not buffer.startswith("["):
+                raise ValueError("Expected a JSON array of records")
+            buffer, started = buffer[1:], True
+            continue
+        if started and buffer.startswith("]"):
+            return
+        if started and buffer.startswith(","):
+            buffer = buffer[1:]
+            continue
+
+        try:
+            record, end = decoder.raw_decode(buffer) if buffer else (None, 0)
+        except json.JSONDecodeError:
+            record, end = None, 0
+
+        if end:
+            yield record
+            buffer = buffer[end:]
+            continue
+
+        chunk: str = file.read(buffer_size)
+        if not chunk:
+            raise ValueError("Unexpected end of the JSON array")
+        buffer += chunk
+
+
+def _read_bloom(document: dict) -> Iterator[dict]:
+    """
+    Bloom perspectives only describe the graph; scenes exported with data carry 'nodes' and 'relationships' that
+    reference each other by their Bloom ids
+    """
+    uids: dict[Any, str] = {}
+
+    for node in document.get("nodes", []):
+        properties: dict = dict(node.get("properties", {}))
+        labels: list[str] = [label for label in node.get("labels", []) if label in NODE_CLASSES]
+        if not labels:
+            raise ValueError(f"Bloom node '{node.get('id')}' has no known label")
+        uids[node.get("id")] = properties.get("uid")
+        yield {"kind": "node", "label": labels[0], "uid": properties.pop("uid", None), "properties": properties}
+
+    for relationship in document.get("relationships", []):
+        start = relationship.get("startNodeId", relationship.get("fromId", relationship.get("start")))
+        end = relationship.get("endNodeId", relationship.get("toId", relationship.get("end")))
+        yield {"kind": "relationship", "type": relationship.get("type"),
+               "start": uids.get(start, start), "end": uids.get(end, end)}
+
+
+def normalise_record(record: dict, label: str | None = None) -> dict:
+    """
+    :raises ValueError
+    :return: the record in the shared node or relationship shape
+    """
+    kind: str = record.get("kind") or ("relationship" if {"type", "start", "end"} <= record.keys() else "node")
+
+    if kind == "relationship":
+        if not record.get("type") or not record.get("start") or not record.get("end"):
+            raise ValueError(f"Relationship records need a type, start and end: {record}")
+        return {"kind": kind, "type": record["type"], "start": record["start"], "end": record["end"]}
+
+    if kind == "node":
+        properties: dict = dict(record.get("properties") or {
+            key: value for key, value in record.items() if key not in ("kind", "label", "uid")
+        })
+        node_label: str | None = record.get("label") or label
+        if not node_label or not record.get("uid"):
+            raise ValueError(f"Node records need a label and a uid: {record}")
+        return {"kind": kind, "label": node_label, "uid": record["uid"], "properties": properties}
+
+    raise ValueError(f"Unknown record kind '{kind}'")
+
+
+# Writer
+
+class GraphLoader:
+    """
+    Buffers records per label and relationship type and writes them in batches through a BatchWriter.
+
+    Nodes are merged on their uid, so a load can be repeated. Relationships are matched on the Addressable label of
+    both ends; before the first relationship of a run is written every pending node is written, so node records must
+    precede the relationships that reference them. Relationships whose ends are missing or whose labels do not form an
+    allowed segment are skipped and counted.
+    """
+
+    def __init__(self, batch_writer: BatchWriter, schema: LoadSchema, batch_size: int,
+                 report: LoadReport | None = None):
+        self.batch_writer: BatchWriter = batch_writer
+        self.schema: LoadSchema = schema
+        self.batch_size: int = batch_size
+        self.report: LoadReport = report or LoadReport()
+
+        self.__nodes: dict[str, list[dict]] = {}
+        self.__relationships: dict[str, list[list[str]]] = {}
+        self.__kind: str = "node"
+        self.__submitted_relationships: int = 0
+
+    async def load(self, records: Iterable[dict]) -> LoadReport:
+        started: float = time.perf_counter()
+
+        for number, record in enumerate(records, start=1):
+            try:
+                if record["kind"] != self.__kind:
+                    await self.__drain()
+                    self.__kind = record["kind"]
+
+                if record["kind"] == "node":
+                    await self.__add_node(record)
+                else:
+                    await self.__add_relationship(record)
+            except ValueError as e:
+                raise ValueError(f"Record {number}: {str(e)}") from e
+
+        await self.__drain()
+        self.report.seconds += time.perf_counter() - started
+        return self.report
+
+    async def __add_node(self, record: dict) -> None:
+        label: str = record["label"]
+        if label not in self.schema.properties:
+            raise ValueError(f"Unknown label '{label}'")
+
+        unknown: set[str] = record["properties"].keys() - self.schema.properties[label]
+        if unknown:
+            raise ValueError(f"Unknown properties {sorted(unknown)} for '{label}'")
+
+        node_class: Type[AsyncStructuredNode] = NODE_CLASSES[label]
+        row: dict = {name: _coerce(node_class, name, value) for name, value in record["properties"].items()}
+        row["uid"] = record["uid"]
+
+        rows: list[dict] = self.__nodes.setdefault(label, [])
+        rows.append(row)
+        if len(rows) >= self.batch_size:
+            await self.__submit_nodes(label)
+
+    async def __add_relationship(self, record: dict) -> None:
+        relationship_type: str = record["type"]
+        if relationship_type not in self.schema.segments:
+            raise ValueError(f"Unknown relationship type '{relationship_type}'")
+
+        rows: list[list[str]] = self.__relationships.setdefault(relationship_type, [])
+        rows.append([record["start"], record["end"]])
+        if len(rows) >= self.batch_size:
+            await self.__submit_relationships(relationship_type)
+
+    async def __submit_nodes(self, label: str) -> None:
+        other_labels: str = "".join(f":{other}" for other in NODE_CLASSES[label].inherited_labels() if other != label)
+        query = (f"UNWIND $rows AS row "
+                 f"MERGE (n:{label} {{uid: row.uid}}) SET n += row{f', n{other_labels}' if other_labels else ''} "
+                 f"RETURN count(n)")
+        await self.batch_writer.submit(query, self.__nodes.pop(label))
+
+    async def __submit_relationships(self, relationship_type: str) -> None:
+        rows: list[list[str]] = self.__relationships.pop(relationship_type)
+        query = (f"UNWIND $rows AS row "
+                 f"MATCH (a:{ADDRESSABLE_LABEL} {{uid: row[0]}}) "
+                 f"MATCH (b:{ADDRESSABLE_LABEL} {{uid: row[1]}}) "
+                 f"WHERE any(segment IN $segments WHERE segment[0] IN labels(a) AND segment[1] IN labels(b)) "
+                 f"MERGE (a)-[:{relationship_type}]->(b) "
+                 f"RETURN count(*)")
+        self.__submitted_relationships += len(rows)
+        await self.batch_writer.submit(query, rows, {"segments": self.schema.segments[relationship_type]})
+
+    async def __drain(self) -> None:
+        for label in list(self.__nodes):
+            await self.__submit_nodes(label)
+        for relationship_type in list(self.__relationships):
+            await self.__submit_relationships(relationship_type)
+
+        written: int = await self.batch_writer.drain()
+        if self.__kind == "node":
+            self.report.nodes += written
+        else:
+            self.report.relationships += written
+            self.report.skipped_relationships += self.__submitted_relationships - written
+            self.__submitted_relationships = 0
+
+        logging.info(f"Loaded {self.report.nodes} nodes and {self.report.relationships} relationships")
+
+
+def _coerce(node_class: Type[AsyncStructuredNode], name: str, value: Any) -> Any:
+    """Convert a value read from a file into the value stored by the neomodel property"""
+    prop = node_class.defined_properties(aliases=False, rels=False)[name]
+
+    if value is None:
+        return None
+    if isinstance(prop, DateTimeProperty):
+        if isinstance(value, str):
+            try:
+                return float(value)
+            except ValueError:
+                return datetime.fromisoformat(value).timestamp()
+        return float(value)
+    if isinstance(prop, IntegerProperty):
+        return int(value)
+    if isinstance(prop, FloatProperty):
+        return float(value)
+    if isinstance(prop, BooleanProperty):
+        return value if isinstance(value, bool) else str(value).lower() in ("true", "1", "yes")
+    return value
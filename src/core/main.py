@@ -3,7 +3,13 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 
 import src.core.config as config
+from src.app.auth.token_cache import get_token_cache
+from src.core.document_cache import get_document_cache
+from src.core.export import router as export_router
+from src.infra.cache.response_cache import get_response_cache
 from src.core.gql_schema import graphql_app
+from src.infra.db.db_lifecycle import pool_statistics
+from src.infra.db.node_cache import get_node_cache
 
 
 @asynccontextmanager
@@ -14,14 +20,44 @@ async def lifespan(app: FastAPI):
     yield
 
     # Shutdown
-    pass
+    await config.shutdown_app()
 
 
 app = FastAPI(title="Hive API", description="An API for Collective Sensemaking", lifespan=lifespan)
 
 app.include_router(graphql_app, prefix="/graphql", tags=["GraphQL"])
+app.include_router(export_router, prefix="/export", tags=["Export"])
 
 
 @app.get("/")
 async def root():
     return {"message": "Hello World"}
+
+
+@app.get("/health/database")
+async def database_health():
+    return pool_statistics()
+
+
+@app.get("/health/token-cache")
+async def token_cache_health():
+    statistics = get_token_cache().statistics()
+    return {**vars(statistics), "hit_rate": statistics.hit_rate}
+
+
+@app.get("/health/document-cache")
+async def document_cache_health():
+    statistics = get_document_cache().statistics()
+    return {**vars(statistics), "hit_rate": statistics.hit_rate}
+
+
+@app.get("/health/response-cache")
+async def response_cache_health():
+    statistics = get_response_cache().statistics()
+    return {**vars(statistics), "hit_rate": statistics.hit_rate}
+
+
+@app.get("/health/node-cache")
+async def node_cache_health():
+    statistics = get_node_cache().statistics()
+    return {**vars(statistics), "hit_rate": statistics.hit_rate}
@@ -0,0 +1,96 @@
+import hashlib
+import json
+from functools import lru_cache
+from inspect import isawaitable
+from typing import Any, AsyncIterator
+
+from fastapi import HTTPException
+from graphql import ExecutionResult, parse, print_ast
+from strawberry.extensions import SchemaExtension
+from strawberry.types.graphql import OperationType
+
+from src.infra.cache.response_cache import ResponseCache, begin_read_tracking, get_response_cache, node_tag, track
+
+
+@lru_cache(maxsize=1024)
+def normalized_query_hash(query: str) -> str:
+    """The hash of the query without its formatting and comments"""
+    return hashlib.sha256(print_ast(parse(query)).encode()).hexdigest()
+
+
+async def _auth_scope(context: Any) -> str:
+    """The user a response is cached for, requests without a valid token share the anonymous responses"""
+    request = getattr(context, "request", None)
+    if request is None or not request.headers.get("Authorization") or not hasattr(context, "uid"):
+        return "anonymous"
+    try:
+        return (await context.uid()).hex
+    # A malformed header, e.g. without the 'Bearer ' prefix, fails while the token is parsed
+    except (HTTPException, LookupError, PermissionError, ValueError):
+        return "anonymous"
+
+
+def _track_nodes(value: Any) -> None:
+    if isinstance(value, list):
+        for item in value:
+            _track_nodes(item)
+        return
+
+    node = getattr(value, "node_instance", None)
+    if node is not None and node.uid:
+        track(node_tag(node.uid))
+
+
+class ResponseCacheExtension(SchemaExtension):
+    """
+    Serves queries from the response cache and caches the results of successful ones.
+
+    A result is tagged with every node a resolver returned and every listing that was paginated, the repositories
+    invalidate these tags when they write. Mutations and subscriptions are never cached.
+    """
+
+    def __init__(self, *, execution_context):
+        super().__init__(execution_context=execution_context)
+        self.cache: ResponseCache = get_response_cache()
+
+    async def on_execute(self) -> AsyncIterator[None]:
+        execution_context = self.execution_context
+        if not self.cache.enabled or execution_context.operation_type != OperationType.QUERY:
+            yield
+            return
+
+        key: str = await self.__key()
+        data: Any | None = self.cache.get(key)
+        if data is not None:
+            execution_context.result = ExecutionResult(data=data)
+            yield
+            return
+
+        generation: int = self.cache.generation
+        tags: set[str] = begin_read_tracking()
+        yield
+
+        result: ExecutionResult | None = execution_context.result
+        if result is not None and not result.errors and result.data is not None:
+            self.cache.put(key, result.data, tags, generation)
+
+    def resolve(self, _next, root, info, *args, **kwargs) -> Any:
+        result = _next(root, info, *args, **kwargs)
+        if isawaitable(result):
+            return self.__track_awaited(result)
+        _track_nodes(result)
+        return result
+
+    async def __key(self) -> str:
+        execution_context = self.execution_context
+        variables: str = json.dumps(execution_context.variables or {}, sort_keys=True, default=str)
+        scope: str = await _auth_scope(execution_context.context)
+        key: str = "\n".join((normalized_query_hash(execution_context.query), execution_context.operation_name or "",
+                              variables, scope))
+        return hashlib.sha256(key.encode()).hexdigest()
+
+    @staticmethod
+    async def __track_awaited(result) -> Any:
+        value = await result
+        _track_nodes(value)
+        return value
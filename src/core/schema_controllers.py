@@ -0,0 +1,15 @@
+# Generated by 'python -m src.core.cli build-schema', do not edit by hand.
+# The controller modules whose Query, Mutation and Subscription classes make up the GraphQL schema.
+
+CONTROLLER_MODULES: tuple[str, ...] = (
+    "src.app.activity.activity_controller",
+    "src.app.arg_framework.bulk_import.bulk_import_controller",
+    "src.app.arg_framework.claim.claim_controller",
+    "src.app.arg_framework.evidence.evidence_controller",
+    "src.app.arg_framework.premise.premise_controller",
+    "src.app.arg_framework.question.question_controller",
+    "src.app.auth.auth_controller",
+    "src.app.search.search_controller",
+    "src.app.townsquare.townsquare_controller",
+    "src.app.user.user_controller",
+)
@@ -0,0 +1,170 @@
+import logging
+import time
+from dataclasses import dataclass, field
+from importlib import import_module
+from pathlib import Path
+from types import ModuleType
+from typing import Iterable, Sequence
+
+from strawberry import Schema
+from strawberry.extensions import SchemaExtension
+from strawberry.tools import merge_types
+
+from src.core.schema_controllers import CONTROLLER_MODULES
+
+ROOT_TYPES: tuple[str, ...] = ("Query", "Mutation", "Subscription")
+
+# Resolved from this file, not the working directory, so discovery works wherever the process was started
+PROJECT_ROOT: Path = Path(__file__).resolve().parents[2]
+APP_DIRECTORY: Path = PROJECT_ROOT / "src" / "app"
+CONTROLLERS_FILE: Path = Path(__file__).resolve().with_name("schema_controllers.py")
+
+CONTROLLERS_HEADER: str = """\
+# Generated by 'python -m src.core.cli build-schema', do not edit by hand.
+# The controller modules whose Query, Mutation and Subscription classes make up the GraphQL schema.
+"""
+
+
+@dataclass
+class SchemaTimings:
+    """Where the schema build spent its time, module imports include everything a controller pulls in first"""
+    imports: dict[str, float] = field(default_factory=dict)
+    merge_seconds: float = 0.0
+    schema_seconds: float = 0.0
+
+    @property
+    def import_seconds(self) -> float:
+        return sum(self.imports.values())
+
+    @property
+    def total_seconds(self) -> float:
+        return self.import_seconds + self.merge_seconds + self.schema_seconds
+
+    def report(self, slowest: int | None = None) -> list[str]:
+        """
+        :param slowest: only list this many of the slowest imports
+        """
+        imports: list[tuple[str, float]] = sorted(self.imports.items(), key=lambda item: item[1], reverse=True)
+        lines: list[str] = [f"GraphQL schema built in {self.total_seconds * 1000:.0f} ms: "
+                            f"{len(self.imports)} controllers imported in {self.import_seconds * 1000:.0f} ms, "
+                            f"root types merged in {self.merge_seconds * 1000:.0f} ms, "
+                            f"schema constructed in {self.schema_seconds * 1000:.0f} ms"]
+        lines += [f"  {seconds * 1000:8.1f} ms  {module}" for module, seconds in imports[:slowest]]
+        return lines
+
+
+class SchemaRegistry:
+    """
+    Builds the GraphQL schema from an explicit list of controller modules.
+
+    Nothing is imported until the schema is first requested, every module is imported exactly once and the time spent
+    on each step is kept for the startup report.
+    """
+
+    def __init__(self, modules: Sequence[str] = CONTROLLER_MODULES):
+        self.modules: tuple[str, ...] = tuple(modules)
+        self.timings: SchemaTimings = SchemaTimings()
+        self.__controllers: dict[str, ModuleType] | None = None
+        self.__schema: Schema | None = None
+
+    def controllers(self) -> dict[str, ModuleType]:
+        """
+        :raises RuntimeError: if a listed module cannot be imported, i.e. the generated list is stale
+        """
+        if self.__controllers is None:
+            controllers: dict[str, ModuleType] = {}
+            for module_path in self.modules:
+                started: float = time.perf_counter()
+                try:
+                    controllers[module_path] = import_module(module_path)
+                except ModuleNotFoundError as e:
+                    if e.name and module_path.startswith(e.name):
+                        raise RuntimeError(f"Controller '{module_path}' does not exist, "
+                                           f"run 'python -m src.core.cli build-schema'") from e
+                    raise
+                self.timings.imports[module_path] = time.perf_counter() - started
+            self.__controllers = controllers
+        return self.__controllers
+
+    def root_types(self, name: str) -> list[type]:
+        """The classes named 'name' in the controllers, in the order of the module list"""
+        return [getattr(module, name) for module in self.controllers().values() if hasattr(module, name)]
+
+    def schema(self, extensions: Iterable[type[SchemaExtension] | SchemaExtension] = ()) -> Schema:
+        """Build the schema on the first call, later calls return it regardless of 'extensions'"""
+        if self.__schema is None:
+            self.controllers()
+
+            started: float = time.perf_counter()
+            roots: dict[str, type | None] = {name: self.__merge(name) for name in ROOT_TYPES}
+            self.timings.merge_seconds = time.perf_counter() - started
+
+            started = time.perf_counter()
+            self.__schema = Schema(query=roots["Query"], mutation=roots["Mutation"],
+                                   subscription=roots["Subscription"], extensions=list(extensions))
+            self.timings.schema_seconds = time.perf_counter() - started
+        return self.__schema
+
+    def validate(self) -> list[str]:
+        """
+        Check the controllers without building the schema
+
+        :return: one message per problem, empty if the controllers are consistent
+        """
+        problems: list[str] = []
+        try:
+            controllers: dict[str, ModuleType] = self.controllers()
+        except Exception as e:
+            return [f"Importing the controllers failed: {e}"]
+
+        for module_path, module in controllers.items():
+            if not any(hasattr(module, name) for name in ROOT_TYPES):
+                problems.append(f"'{module_path}' defines none of {', '.join(ROOT_TYPES)}")
+
+        for name in ROOT_TYPES:
+            owners: dict[str, str] = {}
+            for module_path, module in controllers.items():
+                root_type: type | None = getattr(module, name, None)
+                definition = getattr(root_type, "__strawberry_definition__", None)
+                if root_type is None:
+                    continue
+                if definition is None:
+                    problems.append(f"{name} of '{module_path}' is not a strawberry type")
+                    continue
+                for root_field in definition.fields:
+                    if root_field.name in owners:
+                        problems.append(f"{name}.{root_field.name} is defined by both '{owners[root_field.name]}' "
+                                        f"and '{module_path}'")
+                    owners.setdefault(root_field.name, module_path)
+
+        if not self.root_types("Query"):
+            problems.append("No controller defines a Query")
+        return problems
+
+    def __merge(self, name: str) -> type | None:
+        root_types: list[type] = self.root_types(name)
+        return merge_types(name, tuple(root_types)) if root_types else None
+
+
+def discover_controller_modules() -> list[str]:
+    """The dotted paths of all controller modules below src/app, in a stable order"""
+    return sorted(".".join(path.relative_to(PROJECT_ROOT).with_suffix("").parts)
+                  for path in APP_DIRECTORY.glob("**/*_controller.py"))
+
+
+def render_controller_modules(modules: Iterable[str]) -> str:
+    """The source of the generated controller list"""
+    entries: str = "".join(f'    "{module}",\n' for module in modules)
+    return f"{CONTROLLERS_HEADER}\nCONTROLLER_MODULES: tuple[str, ...] = (\n{entries})\n"
+
+
+schema_registry: SchemaRegistry = SchemaRegistry()
+
+
+def get_schema_registry() -> SchemaRegistry:
+    return schema_registry
+
+
+def log_startup_report(slowest: int = 5) -> None:
+    for line in schema_registry.timings.report(slowest):
+        logging.info(line)
@@ -0,0 +1,189 @@
+import os
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any
+from uuid import UUID
+
+DEFAULT_TTL: float = 300.0
+
+_read_tags: ContextVar[set[str] | None] = ContextVar("read_tags", default=None)
+
+
+def node_tag(node_id: UUID | str) -> str:
+    return f"node:{node_id.hex if isinstance(node_id, UUID) else node_id}"
+
+
+def list_tag(label: str) -> str:
+    """Tag of every listing of a label, which changes whenever a node of the label is created or deleted"""
+    return f"list:{label}"
+
+
+def begin_read_tracking() -> set[str]:
+    """
+    Collect the tags of everything read from here on in the current context, tasks started afterwards add to the same
+    set
+
+    :return: the set the tags are collected in
+    """
+    tags: set[str] = set()
+    _read_tags.set(tags)
+    return tags
+
+
+def track(*tags: str) -> None:
+    """Record reads of the current context, does nothing unless tracking was started"""
+    tags_read: set[str] | None = _read_tags.get()
+    if tags_read is not None:
+        tags_read.update(tags)
+
+
+@dataclass
+class CachedResponse:
+    data: Any
+    tags: frozenset[str]
+    expires_at: float
+
+
+@dataclass(frozen=True)
+class ResponseCacheStatistics:
+    size: int
+    max_size: int
+    tags: int
+    hits: int
+    misses: int
+    stores: int
+    skipped_stores: int
+    invalidations: int
+    expirations: int
+    evictions: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups: int = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class ResponseCache:
+    """
+    Process-wide LRU of query results with a tag index.
+
+    Each entry is tagged with the nodes and listings it was built from and dropped as soon as one of them is
+    invalidated. Entries also expire after 'ttl' seconds, which bounds the staleness caused by writes that bypass the
+    repositories, e.g. the 'load' command.
+
+    Invalidation only reaches the cache of the worker that wrote, so the cache is disabled unless sized and is meant
+    for single-worker deployments, or for ones that accept the TTL as staleness.
+    """
+
+    def __init__(self, max_size: int = 0, ttl: float = DEFAULT_TTL):
+        self.max_size: int = max_size
+        self.ttl: float = ttl
+        self.__entries: OrderedDict[str, CachedResponse] = OrderedDict()
+        self.__index: dict[str, set[str]] = {}
+        # Incremented by every invalidation, see 'put'
+        self.__generation: int = 0
+        self.__hits: int = 0
+        self.__misses: int = 0
+        self.__stores: int = 0
+        self.__skipped_stores: int = 0
+        self.__invalidations: int = 0
+        self.__expirations: int = 0
+        self.__evictions: int = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0 and self.ttl > 0
+
+    @property
+    def generation(self) -> int:
+        return self.__generation
+
+    def get(self, key: str) -> Any | None:
+        entry: CachedResponse | None = self.__entries.get(key)
+
+        if entry is None:
+            self.__misses += 1
+            return None
+
+        if entry.expires_at <= time.monotonic():
+            self.__remove(key)
+            self.__expirations += 1
+            self.__misses += 1
+            return None
+
+        self.__entries.move_to_end(key)
+        self.__hits += 1
+        return entry.data
+
+    def put(self, key: str, data: Any, tags: set[str], generation: int) -> bool:
+        """
+        :param generation: the generation read before the response was computed, a response that raced with an
+            invalidation may be stale and is not stored
+        :return: whether the response was stored
+        """
+        if not self.enabled:
+            return False
+        if generation != self.__generation:
+            self.__skipped_stores += 1
+            return False
+
+        self.__remove(key)
+        self.__entries[key] = CachedResponse(data=data, tags=frozenset(tags), expires_at=time.monotonic() + self.ttl)
+        for tag in tags:
+            self.__index.setdefault(tag, set()).add(key)
+        self.__stores += 1
+
+        while len(self.__entries) > self.max_size:
+            self.__remove(next(iter(self.__entries)))
+            self.__evictions += 1
+        return True
+
+    def invalidate(self, *tags: str) -> int:
+        """
+        Drop every entry carrying one of the tags
+
+        :return: the number of entries dropped
+        """
+        self.__generation += 1
+        dropped: int = 0
+        for tag in tags:
+            for key in self.__index.pop(tag, set()):
+                dropped += self.__remove(key)
+        self.__invalidations += dropped
+        return dropped
+
+    def clear(self) -> None:
+        self.__generation += 1
+        self.__entries.clear()
+        self.__index.clear()
+
+    def statistics(self) -> ResponseCacheStatistics:
+        return ResponseCacheStatistics(size=len(self.__entries), max_size=self.max_size, tags=len(self.__index),
+                                       hits=self.__hits, misses=self.__misses, stores=self.__stores,
+                                       skipped_stores=self.__skipped_stores, invalidations=self.__invalidations,
+                                       expirations=self.__expirations, evictions=self.__evictions)
+
+    def __remove(self, key: str) -> bool:
+        entry: CachedResponse | None = self.__entries.pop(key, None)
+        if entry is None:
+            return False
+
+        for tag in entry.tags:
+            keys: set[str] | None = self.__index.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self.__index[tag]
+        return True
+
+
+response_cache: ResponseCache = ResponseCache(
+    max_size=int(os.getenv("RESPONSE_CACHE_SIZE") or 0),
+    ttl=float(os.getenv("RESPONSE_CACHE_TTL") or DEFAULT_TTL),
+)
+
+
+def get_response_cache() -> ResponseCache:
+    return response_cache
@@ -0,0 +1,133 @@
+import asyncio
+from typing import List, Type, Iterator
+
+from neo4j import AsyncManagedTransaction
+from neomodel import adb, AsyncStructuredNode
+
+from src.infra.db.relationship_loader import build_relationship_pattern
+
+DEFAULT_CHUNK_SIZE: int = 1000
+
+
+def chunked(rows: List, size: int) -> Iterator[List]:
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+class BatchWriter:
+    """
+    Chunked UNWIND writes for imports.
+
+    Every chunk is committed in its own transaction on its own driver session, up to 'parallelism' chunks run
+    concurrently and transient errors (e.g. deadlocks between parallel chunks) are retried by the driver. The first
+    chunk that fails anyway cancels the chunks still in flight and is raised by the next 'submit' or 'drain'. It leaves
+    the chunks committed before it in place, so callers have to validate the whole batch before writing it.
+
+    A writer counts the rows written since the last drain and must not be shared between concurrent imports.
+    """
+
+    def __init__(self, chunk_size: int = DEFAULT_CHUNK_SIZE, parallelism: int = 1):
+        if chunk_size < 1 or parallelism < 1:
+            raise ValueError("The chunk size and parallelism must be at least 1")
+        self.chunk_size: int = chunk_size
+        self.parallelism: int = parallelism
+        self.__slots: asyncio.Semaphore = asyncio.Semaphore(parallelism)
+        self.__pending: set[asyncio.Task] = set()
+        self.__written: int = 0
+        self.__error: BaseException | None = None
+
+    async def create_nodes(self, node_class: Type[AsyncStructuredNode], nodes: List[AsyncStructuredNode]) -> int:
+        """
+        :param node_class: the neomodel class of all nodes
+        :param nodes: unsaved nodes, their uids have to be set already
+        :return: the number of created nodes
+        """
+        query = (f"UNWIND $rows AS row "
+                 f"CREATE (n:{':'.join(node_class.inherited_labels())}) SET n = row "
+                 f"RETURN count(n)")
+        return await self.write(query, [node_class.deflate(node.__properties__, node) for node in nodes])
+
+    async def create_relationships(self, node_class: Type[AsyncStructuredNode], relationship: str,
+                                   pairs: List[tuple[str, str]]) -> int:
+        """
+        :param node_class: the neomodel class that declares the relationship
+        :param relationship: the attribute name of the relationship on the node class
+        :param pairs: (source uid, target uid) pairs
+        :return: the number of pairs whose source and target were both found
+        """
+        pattern, target_class = build_relationship_pattern(node_class, relationship, labelled=False)
+        query = (f"UNWIND $rows AS row "
+                 f"MATCH (n:{node_class.__label__} {{uid: row[0]}}) "
+                 f"MATCH (m:{target_class.__label__} {{uid: row[1]}}) "
+                 f"MERGE {pattern} "
+                 f"RETURN count(*)")
+        return await self.write(query, [list(pair) for pair in pairs])
+
+    async def write(self, query: str, rows: List, params: dict | None = None) -> int:
+        """
+        Write all rows in chunks and wait for them
+
+        :param query: a query that unwinds '$rows' and returns the number of written rows
+        :return: the number of rows written since the last drain
+        """
+        for chunk in chunked(rows, self.chunk_size):
+            await self.submit(query, chunk, params)
+        return await self.drain()
+
+    async def submit(self, query: str, rows: List, params: dict | None = None) -> None:
+        """
+        Schedule one chunk, waits while 'parallelism' chunks are in flight
+
+        :raises Exception: the error of a chunk that failed since the last drain, nothing is scheduled then
+        """
+        if adb.driver is None:
+            raise RuntimeError("The database connection has not been set up")
+        if self.__error is not None:
+            await self.drain()
+
+        await self.__slots.acquire()
+        if self.__error is not None:
+            self.__slots.release()
+            await self.drain()
+
+        task: asyncio.Task = asyncio.create_task(self.__run(query, rows, params or {}))
+        self.__pending.add(task)
+        task.add_done_callback(self.__finished)
+
+    async def drain(self) -> int:
+        """
+        Wait for every scheduled chunk
+
+        :raises Exception: the error of the first chunk that failed since the last drain
+        :return: the number of rows written since the last drain
+        """
+        await asyncio.gather(*self.__pending, return_exceptions=True)
+        written, self.__written = self.__written, 0
+
+        error, self.__error = self.__error, None
+        if error is not None:
+            raise error
+        return written
+
+    def __finished(self, task: asyncio.Task) -> None:
+        # The slot is released here, a chunk cancelled before it started never runs its own cleanup
+        self.__pending.discard(task)
+        self.__slots.release()
+        if task.cancelled() or task.exception() is None or self.__error is not None:
+            return
+
+        self.__error = task.exception()
+        for pending in self.__pending:
+            pending.cancel()
+
+    async def __run(self, query: str, rows: List, params: dict) -> None:
+        async with adb.driver.session(database=adb._database_name) as session:
+            written: int = await session.execute_write(self.__transaction, query, rows, params)
+        # Added after the await, '+=' would read the count before it and lose the chunks finished meanwhile
+        self.__written += written
+
+    @staticmethod
+    async def __transaction(tx: AsyncManagedTransaction, query: str, rows: List, params: dict) -> int:
+        result = await tx.run(query, rows=rows, **params)
+        record = await result.single()
+        return record[0]
@@ -0,0 +1,81 @@
+import logging
+from typing import Iterable, List, Type
+from uuid import UUID
+
+from neomodel import adb, AsyncStructuredNode
+
+from src.infra.db.relationship_loader import build_relationship_pattern
+
+# Node classes declare 'counted_relationships': relationship attribute -> counter property on the target node
+COUNTED_RELATIONSHIPS: str = "counted_relationships"
+
+
+def counted_relationships(node_class: Type[AsyncStructuredNode]) -> dict[str, str]:
+    return getattr(node_class, COUNTED_RELATIONSHIPS, {})
+
+
+def adjust(counter: str, variable: str = "m", delta: str | int = 1) -> str:
+    """Cypher SET item adding 'delta' to a counter property, counters missing on older nodes start at 0"""
+    return f"{variable}.{counter} = coalesce({variable}.{counter}, 0) + {delta}"
+
+
+def counter_patterns(node_classes: Iterable[Type[AsyncStructuredNode]]) -> dict[Type[AsyncStructuredNode],
+                                                                                dict[str, str]]:
+    """
+    The patterns that define each counter, as seen from the counted node 'n'
+
+    :return: counter property -> pattern per class of counted node
+    """
+    patterns: dict[Type[AsyncStructuredNode], dict[str, str]] = {}
+
+    for node_class in node_classes:
+        for relationship, counter in counted_relationships(node_class).items():
+            pattern, target_class = build_relationship_pattern(node_class, relationship,
+                                                               source=f"s:{node_class.__label__}", target="n",
+                                                               labelled=False)
+            patterns.setdefault(target_class, {})[counter] = pattern
+
+    return patterns
+
+
+def _recount(patterns: dict[str, str]) -> str:
+    return ", ".join(f"n.{counter} = COUNT {{ MATCH {pattern} }}" for counter, pattern in patterns.items())
+
+
+async def recount(node_classes: Iterable[Type[AsyncStructuredNode]], node_ids: Iterable[UUID | str]) -> None:
+    """Recompute the counters of the given nodes from their relationships, e.g. after writes that bypassed them"""
+    uids: List[str] = [node_id.hex if isinstance(node_id, UUID) else node_id for node_id in node_ids]
+    if not uids:
+        return
+
+    for counted_class, patterns in counter_patterns(node_classes).items():
+        await adb.cypher_query(f"UNWIND $uids AS uid MATCH (n:{counted_class.__label__} {{uid: uid}}) "
+                               f"SET {_recount(patterns)}", {"uids": uids})
+
+
+async def repair(node_classes: Iterable[Type[AsyncStructuredNode]], batch_size: int = 1000) -> int:
+    """
+    Recompute every counter in the database, each batch of nodes in its own transaction
+
+    :return: the number of repaired nodes
+    """
+    repaired: int = 0
+
+    for counted_class, patterns in counter_patterns(node_classes).items():
+        query = (f"MATCH (n:{counted_class.__label__}) WHERE n.uid > $after "
+                 f"WITH n ORDER BY n.uid LIMIT $limit "
+                 f"SET {_recount(patterns)} "
+                 f"RETURN count(n), max(n.uid)")
+        after: str = ""
+
+        while True:
+            results, meta = await adb.cypher_query(query, {"after": after, "limit": batch_size})
+            count, last = results[0]
+            repaired += count
+            if count < batch_size:
+                break
+            after = last
+
+        logging.info(f"Counters of {counted_class.__label__} nodes repaired")
+
+    return repaired
@@ -0,0 +1,161 @@
+import asyncio
+import logging
+import os
+from dataclasses import dataclass
+
+from neo4j import AsyncDriver, AsyncGraphDatabase
+from neomodel import adb, config
+
+
+def _env_int(name: str, default: int) -> int:
+    value: str | None = os.getenv(name)
+    return int(value) if value else default
+
+
+def _env_float(name: str, default: float | None) -> float | None:
+    value: str | None = os.getenv(name)
+    return float(value) if value else default
+
+
+@dataclass(frozen=True)
+class DriverSettings:
+    uri: str
+    username: str
+    password: str
+    database: str = "neo4j"
+    max_connection_pool_size: int = 100
+    # Seconds a session waits for a free pooled connection before failing
+    connection_acquisition_timeout: float = 60.0
+    # Seconds after which a connection is replaced, keep below the idle timeout of any load balancer in between
+    max_connection_lifetime: float = 3600.0
+    # Seconds a pooled connection may idle before it is checked on acquisition, None never checks
+    liveness_check_timeout: float | None = None
+    connection_timeout: float = 30.0
+    keep_alive: bool = True
+    warmup_connections: int = 0
+
+    @classmethod
+    def from_env(cls, database: str = "neo4j") -> "DriverSettings":
+        """
+        Read the connection details and pool settings, NEO4J_URI may be a host and port (Bolt is used) or a full URI
+
+        :raises ValueError: if the credentials are missing
+        """
+        uri: str | None = os.getenv("NEO4J_URI")
+        username: str | None = os.getenv("NEO4J_USER")
+        password: str | None = os.getenv("NEO4J_PASSWORD")
+
+        if not uri or not username or not password:
+            raise ValueError("Database credentials not found in environment variables.")
+
+        return cls(
+            uri=uri if "://" in uri else f"bolt://{uri}",
+            username=username,
+            password=password,
+            database=database,
+            max_connection_pool_size=_env_int("NEO4J_MAX_POOL_SIZE", 100),
+            connection_acquisition_timeout=_env_float("NEO4J_ACQUISITION_TIMEOUT", 60.0),
+            max_connection_lifetime=_env_float("NEO4J_MAX_CONNECTION_LIFETIME", 3600.0),
+            liveness_check_timeout=_env_float("NEO4J_LIVENESS_CHECK_TIMEOUT", None),
+            connection_timeout=_env_float("NEO4J_CONNECTION_TIMEOUT", 30.0),
+            keep_alive=(os.getenv("NEO4J_KEEP_ALIVE") or "true").lower() in ("1", "true", "yes"),
+            warmup_connections=_env_int("NEO4J_WARMUP_CONNECTIONS", 0),
+        )
+
+
+_settings: DriverSettings | None = None
+
+
+async def open_driver(settings: DriverSettings) -> AsyncDriver:
+    """Build the pooled driver and hand it to neomodel, replacing any driver opened before"""
+    global _settings
+    await close_driver()
+
+    driver: AsyncDriver = AsyncGraphDatabase.driver(
+        settings.uri,
+        auth=(settings.username, settings.password),
+        max_connection_pool_size=settings.max_connection_pool_size,
+        connection_acquisition_timeout=settings.connection_acquisition_timeout,
+        max_connection_lifetime=settings.max_connection_lifetime,
+        liveness_check_timeout=settings.liveness_check_timeout,
+        connection_timeout=settings.connection_timeout,
+        keep_alive=settings.keep_alive,
+    )
+    config.DRIVER = driver
+    config.DATABASE_NAME = settings.database
+    await adb.set_connection(driver=driver)
+
+    _settings = settings
+    logging.info(f"Neo4j driver opened for database '{settings.database}' "
+                 f"with up to {settings.max_connection_pool_size} pooled connections")
+    return driver
+
+
+async def warm_up(connections: int) -> int:
+    """
+    Open connections ahead of the first requests: each one is held by a transaction until all are established, so the
+    pool cannot hand the same connection out twice
+
+    :param connections: the number of connections, capped at the pool size
+    :return: the number of connections that were established
+    """
+    if not adb.driver or not _settings or connections <= 0:
+        return 0
+
+    connections = min(connections, _settings.max_connection_pool_size)
+    established: list[int] = []
+    release: asyncio.Event = asyncio.Event()
+
+    async def hold() -> None:
+        try:
+            async with adb.driver.session(database=_settings.database) as session:
+                transaction = await session.begin_transaction()
+                try:
+                    await (await transaction.run("RETURN 1")).consume()
+                    established.append(1)
+                    if len(established) == connections:
+                        release.set()
+                    await release.wait()
+                finally:
+                    await transaction.close()
+        except Exception:
+            # A failed connection must not keep the others waiting
+            release.set()
+            raise
+
+    results: list = await asyncio.gather(*(hold() for _ in range(connections)), return_exceptions=True)
+    failures: list[BaseException] = [result for result in results if isinstance(result, BaseException)]
+    if failures:
+        logging.warning(f"Warmed up {len(established)} of {connections} connections: {str(failures[0])}")
+    else:
+        logging.info(f"Warmed up {len(established)} database connections")
+    return len(established)
+
+
+def pool_statistics() -> dict:
+    """A snapshot of the connection pool per server address, read from the driver internals"""
+    pool = getattr(adb.driver, "_pool", None)
+    if pool is None or not _settings:
+        return {"connected": False}
+
+    addresses: dict[str, dict] = {}
+    for address, connections in list(getattr(pool, "connections", {}).items()):
+        in_use: int = sum(1 for connection in list(connections) if getattr(connection, "in_use", False))
+        addresses[str(address)] = {"open": len(connections), "in_use": in_use, "idle": len(connections) - in_use}
+
+    return {
+        "connected":                      True,
+        "database":                       _settings.database,
+        "max_connection_pool_size":       _settings.max_connection_pool_size,
+        "connection_acquisition_timeout": _settings.connection_acquisition_timeout,
+        "addresses":                      addresses,
+    }
+
+
+async def close_driver() -> None:
+    global _settings
+    if adb.driver:
+        await adb.close_connection()
+        config.DRIVER = None
+        logging.info("Neo4j driver closed")
+    _settings = None
@@ -1,5 +1,8 @@
 from enum import Enum, auto
 
+# Label shared by every node with a uid, backed by its own uid constraint for label-independent lookups
+ADDRESSABLE_LABEL: str = "Addressable"
+
 
 class GraphDataTypes(Enum):
     """
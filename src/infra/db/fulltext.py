@@ -0,0 +1,29 @@
+import re
+from typing import Type
+
+from neomodel import AsyncStructuredNode
+
+_TERM = re.compile(r"\w+")
+
+
+def fulltext_index(label: str) -> str:
+    """The name of the full-text index of a label, created from the 'fulltext' entry of its constraints"""
+    return f"node_{label.lower()}_fulltext"
+
+
+def fulltext_properties(node_class: Type[AsyncStructuredNode]) -> tuple[str, ...]:
+    """The indexed properties declared by a node class as 'fulltext_properties'"""
+    return tuple(getattr(node_class, "fulltext_properties", ()))
+
+
+def query_terms(text: str) -> list[str]:
+    """Split free text into the lowercase words the standard analyzer indexes, dropping duplicates"""
+    return list(dict.fromkeys(term.lower() for term in _TERM.findall(text)))
+
+
+def lucene_query(terms: list[str]) -> str:
+    """
+    A Lucene query matching any of the terms, documents matching more of them rank higher. Terms are plain words, so
+    user input can never inject query syntax.
+    """
+    return " ".join(terms)
@@ -1,119 +1,79 @@
 import logging
-from abc import ABC, abstractmethod
+from abc import ABC
+from datetime import datetime, timezone
+from typing import List, Type
 from uuid import UUID
 
 from neomodel import adb, AsyncStructuredNode
+from strawberry.types.nodes import Selection
 
-from infra.db.db_types import GraphDataTypes
+from src.infra.cache.response_cache import get_response_cache, list_tag, node_tag, track
+from src.infra.db.counters import adjust, counted_relationships
+from src.infra.db.db_types import ADDRESSABLE_LABEL
+from src.infra.db.identity_map import NodeClass, lookup, remember, forget
+from src.infra.db.migrations import Migration, addressable_items, migrate, schema_items
+from src.infra.db.node_cache import get_node_cache
+from src.infra.db.pagination import PageQuery, Page
+from src.infra.db.query_planner import QueryPlanner, PlannedNodes
+from src.infra.db.relationship_loader import build_relationship_pattern
 
 
 class IGraphRepository(ABC):
+    # Boolean Cypher expression on 'n' referencing '$townsquare_id', see townsquare_scope
+    townsquare_scope: str | None = None
+    # Relationship type from a node to its author
+    author_relationship: str | None = None
+
+    # Constraints and indexes of the label of the repository, see add_database_constraints
+    database_constraints: dict = {}
 
-    @abstractmethod
     async def add_database_constraints(self, label: str, constraints: dict = None):
         """
-        Add constraints to the graph database for a given node and its relationships
+        Add the missing constraints and indexes of a node and its relationships to the graph database
         https://neo4j.com/docs/cypher-manual/current/constraints/
 
         Constraints are defined as a dictionary with the following structure:
         example_constraints: dict = {
             "node":          {
-                "username": ("unique", "required", GraphDataTypes.String),
-                "uid":      ("key", GraphDataTypes.Integer | GraphDataTypes.String),
-                "email":    ("unique", "required", GraphDataTypes.String),
-                "name":     ("required", GraphDataTypes.String),
+                "username": ("unique", "required", GraphDataTypes.STRING),
+                "uid":      ("key", "INTEGER | STRING"),
+                "email":    ("unique", "required", GraphDataTypes.STRING),
+                "name":     ("required", GraphDataTypes.STRING),
             },
             "relationships": {
                 "relationship_name": {
-                    "property1": ("key", "String | Integer"),
-                    "property2": ("key", "String"),
-                    "property3": ("unique", "required", "String"),
+                    "property1": ("key", "STRING | INTEGER"),
+                    "property2": ("key", "STRING"),
+                    "property3": ("unique", "required", "STRING"),
                 },
             },
+            "indexes": [("created_at", "uid")],
+            "fulltext": ("content", "source"),
         }
-        """
 
-        responses: list[str] = []
+        :param constraints: the repository's 'database_constraints' by default
+        """
         try:
-            if "node" in constraints.keys():
-                responses.extend(await self._create_db_entity_constraints(constraints["node"], label))
-            if "relationships" in constraints.keys():
-                for relationship, relationship_constraints in constraints["relationships"].items():
-                    responses.append(
-                        await self._create_db_entity_constraints(relationship_constraints, label=relationship,
-                                                                 relationship=True))
-
-            logging.info(
-                f"Constraints for node '{label.capitalize()}' and its associated relationships successfully created")
-            return responses
+            migration: Migration = await migrate(schema_items(label, constraints or self.database_constraints))
+            logging.info(f"Constraints for node '{label.capitalize()}' and its associated relationships are up to date")
+            return migration
 
         except Exception as e:
             logging.error(
                 f"Error creating constraints for node {label} and its associated relationships: {str(e)}")
             raise
 
-    async def _create_db_entity_constraints(self, constraints: dict, label: str, relationship: bool = False):
-        queries: list[str] = []
-
-        for entity_property, property_constraints in constraints.items():
-            keys: list[str] = []
-
-            for constraint in property_constraints:
-                if not isinstance(constraint, str):
-                    constraint = str(constraint.name).lower()
-
-                if relationship:
-                    query = f"CREATE CONSTRAINT relationship_{label.lower()}_{entity_property}_is_{constraint} IF NOT EXISTS FOR ()-[e:{label}]-()"
-                else:
-                    query = f"CREATE CONSTRAINT node_{label.lower()}_{entity_property}_is_{constraint} IF NOT EXISTS FOR (e:{label})"
-
-                constraint = constraint.upper()
-                if constraint == "KEY":
-                    keys.append(entity_property)
-                elif constraint == "UNIQUE":
-                    query += f"REQUIRE e.{entity_property} IS UNIQUE "
-                elif constraint == "REQUIRED":
-                    query += f"REQUIRE e.{entity_property} IS NOT NULL "
-                # Type Constraints    
-                elif constraint in GraphDataTypes.__members__:
-                    query += f"REQUIRE e.{entity_property} IS TYPED {GraphDataTypes[constraint].name} "
-                elif "|" in constraint:
-                    first_type, second_type = constraint.split("|")
-                    query += f"REQUIRE e.{entity_property} IS TYPED {GraphDataTypes[first_type].name} | {GraphDataTypes[second_type].value} "
-
-                queries.append(query)
-
-            if keys:
-                if relationship:
-                    query = f"CREATE CONSTRAINT {label}_keys IF NOT EXISTS FOR ()-[e:{label}]-()) "
-                    query += f"REQUIRE (e.{", e.".join(keys)}) IS RELATIONSHIP KEY"
-                else:
-                    query = f"CREATE CONSTRAINT {label}_keys IF NOT EXISTS FOR (e:{label}) "
-                    query += f"REQUIRE (e.{", e.".join(keys)}) IS NODE KEY"
-                queries.append(query)
-
+    async def add_addressable_constraints(self):
+        """
+        Label every node that has a uid as Addressable and constrain the uid on that label, which backs the
+        label-independent lookups of query_nodes
+        """
         try:
-            async with adb.transaction:
-                for query in queries:
-                    response = await adb.cypher_query(query)
-                logging.info(
-                    f"Constraints for '{label.capitalize()}' successfully created: \n {self.__format_constraints(constraints)}")
-                return response
-
+            return await migrate(addressable_items())
         except Exception as e:
-            logging.error(f"Error creating constraints for {label}: {str(e)}")
+            logging.error(f"Error labelling {ADDRESSABLE_LABEL} nodes: {str(e)}")
             raise
 
-    @staticmethod
-    def __format_constraints(constraints: dict) -> str:
-        formatted_constraints = []
-        for property_name, property_constraints in constraints.items():
-            formatted_property_constraints = [
-                str(constraint.name).lower() if type(constraint) is not str else str(constraint) for constraint in
-                property_constraints]
-            formatted_constraints.append(f"{property_name}: {formatted_property_constraints}")
-        return "\n ".join(formatted_constraints)
-
     @staticmethod
     async def query_nodes(node_id: UUID, limit: int = 1) -> AsyncStructuredNode:
         """
@@ -124,11 +84,292 @@ class IGraphRepository(ABC):
         :raises LookupError
         :return: AsyncStructuredNode
         """
-        query = "MATCH (n) WHERE n.uid = $uid RETURN n LIMIT $limit"
+        target_node: AsyncStructuredNode | None = lookup(node_id) or get_node_cache().get(node_id)
+        if target_node:
+            remember(target_node)
+            return target_node
+
+        query = f"MATCH (n:{ADDRESSABLE_LABEL} {{uid: $uid}}) RETURN n LIMIT $limit"
         results, meta = await adb.cypher_query(query, {"uid": node_id.hex, "limit": limit}, resolve_objects=True)
-        target_node: AsyncStructuredNode | None = results[0][0] if results else None
+        target_node = results[0][0] if results else None
 
         if not target_node:
             raise LookupError(f"Node with ID '{node_id}' not found in the Database")
 
+        remember(target_node)
+        get_node_cache().put(target_node)
         return target_node
+
+    @staticmethod
+    async def query_nodes_many(node_ids: List[UUID]) -> dict[str, AsyncStructuredNode]:
+        """
+        Resolve many nodes of any label with a single query
+
+        :param node_ids:
+        :raises LookupError: if any of the nodes does not exist
+        :return: the nodes keyed by their uid
+        """
+        uids: list[str] = [node_id.hex for node_id in node_ids]
+        nodes: dict[str, AsyncStructuredNode] = {uid: node for uid in uids if (node := lookup(uid))}
+        missing: list[str] = [uid for uid in uids if uid not in nodes]
+
+        if missing:
+            query = f"UNWIND $uids AS uid MATCH (n:{ADDRESSABLE_LABEL} {{uid: uid}}) RETURN n"
+            results, meta = await adb.cypher_query(query, {"uids": missing}, resolve_objects=True)
+            for row in results:
+                remember(row[0])
+                nodes[row[0].uid] = row[0]
+
+        not_found: list[str] = [uid for uid in uids if uid not in nodes]
+        if not_found:
+            raise LookupError(f"Nodes with IDs {not_found} not found in the Database")
+
+        return nodes
+
+    @staticmethod
+    async def get_node(node_class: Type[NodeClass], node_id: UUID | str) -> NodeClass | None:
+        """
+        Get a node by its uid, nodes already loaded during the current request are served from the identity map and
+        then from the node cache. For reads only, see get_for_write.
+
+        :param node_class: the neomodel class of the node
+        :param node_id: the uid of the node
+        :return: the node or None if it does not exist
+        """
+        node: NodeClass | None = lookup(node_id, node_class)
+        if node:
+            return node
+
+        node = get_node_cache().get(node_id, node_class)
+        if node:
+            remember(node)
+            return node
+
+        node = await node_class.nodes.get_or_none(uid=node_id.hex if isinstance(node_id, UUID) else node_id)
+        if node:
+            remember(node)
+            get_node_cache().put(node)
+        return node
+
+    @staticmethod
+    async def get_for_write(node_class: Type[NodeClass], node_id: UUID | str) -> NodeClass:
+        """
+        Read a node that is about to be written from the database, call it inside the write transaction. The identity
+        map and node cache serve reads only, their copy may predate writes of other requests and workers.
+
+        :raises LookupError: if the node does not exist
+        """
+        node: NodeClass | None = await node_class.nodes.get_or_none(
+            uid=node_id.hex if isinstance(node_id, UUID) else node_id)
+        if not node:
+            raise LookupError(f"The {node_class.__name__} with ID '{node_id}' not found in the Database")
+        return node
+
+    @staticmethod
+    async def update_properties(node_class: Type[NodeClass], node_id: UUID | str,
+                                changes: dict) -> tuple[NodeClass, dict]:
+        """
+        Set only the given properties with a single statement. Saving a loaded node would write all of its properties
+        and overwrite the counters and acceptability that were maintained meanwhile with the values it was read with.
+
+        :param changes: the new values by property name, None values are left unchanged
+        :raises LookupError: if the node does not exist
+        :raises ValueError: on a property the node class does not define
+        :raises UniqueProperty
+        :return: the updated node and the previous values of the changed properties
+        """
+        properties: dict = node_class.defined_properties(aliases=False, rels=False)
+        unknown: list[str] = [name for name in changes if name not in properties]
+        if unknown:
+            raise ValueError(f"{node_class.__name__} has no properties {unknown}")
+
+        names: dict[str, str] = {properties[name].get_db_property_name(name): name
+                                 for name, value in changes.items() if value is not None}
+        deflated: dict = {db_property: properties[name].deflate(changes[name])
+                          for db_property, name in names.items()}
+        uid: str = node_id.hex if isinstance(node_id, UUID) else node_id
+
+        results, meta = await adb.cypher_query(f"MATCH (n:{node_class.__label__} {{uid: $uid}}) "
+                                               f"WITH n, [key IN keys($changes) | [key, n[key]]] AS previous "
+                                               f"SET n += $changes "
+                                               f"RETURN n, previous", {"uid": uid, "changes": deflated})
+        if not results:
+            raise LookupError(f"The {node_class.__name__} with ID '{node_id}' not found in the Database")
+
+        node, previous = results[0]
+        return node_class.inflate(node), {names[key]: value for key, value in previous}
+
+    @staticmethod
+    async def create_connected(new_node: NodeClass, relationships: List[tuple[str, UUID]]) -> NodeClass:
+        """
+        Create a node and connect it to existing nodes with a single statement.
+
+        Every relationship attribute gets its own 'UNWIND ... MATCH ... MERGE' subquery, which reports the uids it
+        connected and increments the counters of the targets. Must run inside a transaction: if a target is missing
+        the LookupError rolls back the creation.
+
+        :param new_node: the unsaved node
+        :param relationships: pairs of relationship attribute on the node class and target uid, e.g. ("author", uid)
+        :raises LookupError: naming every target that does not exist
+        :raises UniqueProperty
+        :return: the created node
+        """
+        node_class: Type[NodeClass] = type(new_node)
+        targets: dict[str, list[str]] = {}
+        for relationship, target_id in relationships:
+            targets.setdefault(relationship, []).append(target_id.hex)
+
+        params: dict = {"properties": node_class.deflate(new_node.__properties__, new_node)}
+        subqueries: list[str] = []
+        target_classes: list[Type[AsyncStructuredNode]] = []
+
+        counters: dict[str, str] = counted_relationships(node_class)
+        for i, (relationship, uids) in enumerate(targets.items()):
+            pattern, target_class = build_relationship_pattern(node_class, relationship, labelled=False)
+            on_create: str = f"ON CREATE SET {adjust(counters[relationship])} " if relationship in counters else ""
+            subqueries.append(f"CALL {{ WITH n UNWIND $targets_{i} AS uid "
+                              f"MATCH (m:{target_class.__label__} {{uid: uid}}) MERGE {pattern} {on_create}"
+                              f"RETURN collect(uid) AS found_{i} }}")
+            target_classes.append(target_class)
+            params[f"targets_{i}"] = uids
+
+        query = (f"CREATE (n:{':'.join(node_class.inherited_labels())} $properties) "
+                 f"{' '.join(subqueries)} "
+                 f"RETURN n, [{', '.join(f'found_{i}' for i in range(len(targets)))}]")
+        results, meta = await adb.cypher_query(query, params)
+        node, found = results[0]
+
+        missing: list[str] = [
+            f"{target_class.__name__} with ID '{uid}'"
+            for target_class, uids, found_uids in zip(target_classes, targets.values(), found)
+            for uid in uids if uid not in found_uids
+        ]
+        if missing:
+            raise LookupError(f"{', '.join(missing)} not found in the Database")
+
+        new_node = node_class.inflate(node)
+        remember(new_node)
+        IGraphRepository.invalidate(*(uid for found_uids in found for uid in found_uids))
+        IGraphRepository.invalidate_lists(node_class)
+        return new_node
+
+    @staticmethod
+    async def connect_counted(source: AsyncStructuredNode, relationship: str, target_id: UUID | str) -> bool:
+        """
+        Connect two nodes and increment the counter of the target in the same statement, connecting already connected
+        nodes changes nothing
+
+        :param source: the node declaring the relationship
+        :param relationship: the relationship attribute on the class of the source node
+        :param target_id: the uid of the target node
+        :return: False if the target does not exist or has the wrong label
+        """
+        node_class: Type[AsyncStructuredNode] = type(source)
+        pattern, target_class = build_relationship_pattern(node_class, relationship, labelled=False)
+        counter: str | None = counted_relationships(node_class).get(relationship)
+        target: str = target_id.hex if isinstance(target_id, UUID) else target_id
+
+        on_create: str = f"ON CREATE SET {adjust(counter)} " if counter else ""
+        query = (f"MATCH (n:{node_class.__label__} {{uid: $source}}), (m:{target_class.__label__} {{uid: $target}}) "
+                 f"MERGE {pattern} {on_create}"
+                 f"RETURN m.uid")
+        results, meta = await adb.cypher_query(query, {"source": source.uid, "target": target})
+
+        IGraphRepository.invalidate(source.uid, target)
+        return bool(results)
+
+    @staticmethod
+    async def disconnect_counted(source: AsyncStructuredNode, relationship: str, target_id: UUID | str) -> bool:
+        """
+        Delete the relationships between two nodes and decrement the counter of the target in the same statement
+
+        :return: False if the nodes were not connected
+        """
+        node_class: Type[AsyncStructuredNode] = type(source)
+        pattern, _ = build_relationship_pattern(node_class, relationship, target="m", labelled=False)
+        counter: str | None = counted_relationships(node_class).get(relationship)
+        target: str = target_id.hex if isinstance(target_id, UUID) else target_id
+
+        decrement: str = f"SET {adjust(counter, delta='-size(edges)')} " if counter else ""
+        query = (f"MATCH (n:{node_class.__label__} {{uid: $source}}) "
+                 f"MATCH path = {pattern} WHERE m.uid = $target "
+                 f"WITH m, collect(relationships(path)[0]) AS edges "
+                 f"FOREACH (edge IN edges | DELETE edge) "
+                 f"{decrement}"
+                 f"RETURN size(edges)")
+        results, meta = await adb.cypher_query(query, {"source": source.uid, "target": target})
+
+        IGraphRepository.invalidate(source.uid, target)
+        return bool(results and results[0][0])
+
+    @staticmethod
+    async def release_counters(node: AsyncStructuredNode) -> None:
+        """Decrement the counters the relationships of a node contribute to, must run in the transaction deleting it"""
+        node_class: Type[AsyncStructuredNode] = type(node)
+
+        for relationship, counter in counted_relationships(node_class).items():
+            pattern, _ = build_relationship_pattern(node_class, relationship)
+            results, meta = await adb.cypher_query(f"MATCH (n:{node_class.__label__} {{uid: $uid}}) "
+                                                   f"MATCH {pattern} SET {adjust(counter, delta=-1)} RETURN m.uid",
+                                                   {"uid": node.uid})
+            IGraphRepository.invalidate(*(row[0] for row in results))
+
+    @staticmethod
+    def invalidate(*node_ids: UUID | str) -> None:
+        """
+        Drop nodes from every request-scoped cache and every cached response showing them after they were saved or
+        deleted
+        """
+        forget(*node_ids)
+        get_node_cache().discard(*node_ids)
+        if node_ids:
+            get_response_cache().invalidate(*(node_tag(node_id) for node_id in node_ids))
+
+    @staticmethod
+    def write_through(node: AsyncStructuredNode) -> None:
+        """Put a node that was just saved into the node cache, call after the transaction committed"""
+        remember(node)
+        get_node_cache().put(node)
+
+    @staticmethod
+    def invalidate_lists(*node_classes: Type[AsyncStructuredNode]) -> None:
+        """Drop the cached listings of the node classes after one of their nodes was created or deleted"""
+        get_response_cache().invalidate(*(list_tag(node_class.__label__) for node_class in node_classes))
+
+    async def paginate(self, node_class: Type[AsyncStructuredNode], selections: List[Selection], page: PageQuery,
+                       townsquare_id: UUID | None = None, author_id: UUID | None = None,
+                       created_after: datetime | None = None) -> Page:
+        """
+        Fetch one page of nodes ordered by (created_at, uid), planned from the GraphQL selection of a single node
+
+        :raises ValueError: if a filter is not supported for the node or the page request is invalid
+        :return: Page
+        """
+        label: str = node_class.__label__
+        conditions: list[str] = []
+        params: dict = {}
+        track(list_tag(label))
+
+        if created_after:
+            # created_at is stored as UTC epoch seconds, a naive filter is read as UTC rather than server local time
+            if created_after.tzinfo is None:
+                created_after = created_after.replace(tzinfo=timezone.utc)
+            conditions.append("n.created_at > $created_after")
+            params["created_after"] = created_after.timestamp()
+        if townsquare_id:
+            if not self.townsquare_scope:
+                raise ValueError(f"{label} cannot be filtered by Townsquare")
+            conditions.append(self.townsquare_scope)
+            params["townsquare_id"] = townsquare_id.hex
+        if author_id:
+            if not self.author_relationship:
+                raise ValueError(f"{label} cannot be filtered by author")
+            conditions.append(f"EXISTS {{ (n)-[:{self.author_relationship}]->(:User {{uid: $author_id}}) }}")
+            params["author_id"] = author_id.hex
+
+        where, params, order_by, limit = page.compile(conditions, params)
+        planned: PlannedNodes = await QueryPlanner(node_class).fetch(selections, where, params, order_by, limit)
+
+        has_next_page: bool = len(planned.nodes) > page.first
+        planned.nodes = planned.nodes[:page.first]
+        return Page(planned=planned, has_next_page=has_next_page)
@@ -0,0 +1,46 @@
+from contextvars import ContextVar
+from typing import Type, TypeVar
+from uuid import UUID
+
+from neomodel import AsyncStructuredNode
+
+NodeClass = TypeVar("NodeClass", bound=AsyncStructuredNode)
+
+_identity_map: ContextVar[dict[str, AsyncStructuredNode] | None] = ContextVar("identity_map", default=None)
+
+
+def _key(node_id: UUID | str) -> str:
+    return node_id.hex if isinstance(node_id, UUID) else node_id
+
+
+def begin_identity_map() -> None:
+    """
+    Start an empty identity map for the current request.
+
+    Outside a request (startup, CLI) no map is active and every lookup goes to the database.
+    """
+    _identity_map.set({})
+
+
+def lookup(node_id: UUID | str, node_class: Type[NodeClass] = AsyncStructuredNode) -> NodeClass | None:
+    """
+    :param node_id: the uid of the node
+    :param node_class: only return the node if it is an instance of this class
+    :return: the node loaded earlier in this request, or None
+    """
+    identity_map: dict[str, AsyncStructuredNode] | None = _identity_map.get()
+    node: AsyncStructuredNode | None = identity_map.get(_key(node_id)) if identity_map is not None else None
+    return node if isinstance(node, node_class) else None
+
+
+def remember(node: AsyncStructuredNode) -> None:
+    identity_map: dict[str, AsyncStructuredNode] | None = _identity_map.get()
+    if identity_map is not None and node.uid:
+        identity_map[node.uid] = node
+
+
+def forget(*node_ids: UUID | str) -> None:
+    identity_map: dict[str, AsyncStructuredNode] | None = _identity_map.get()
+    if identity_map is not None:
+        for node_id in node_ids:
+            identity_map.pop(_key(node_id), None)
@@ -0,0 +1,189 @@
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Iterable, List
+
+from neomodel import adb
+
+from src.infra.db.batch_writer import chunked
+from src.infra.db.db_types import ADDRESSABLE_LABEL, GraphDataTypes
+from src.infra.db.fulltext import fulltext_index
+
+DEFAULT_BATCH_SIZE: int = 20
+# Seconds to wait for new indexes to come online
+DEFAULT_INDEX_TIMEOUT: int = 300
+
+
+@dataclass(frozen=True)
+class SchemaItem:
+    """A named constraint or index and the statement creating it"""
+    name: str
+    label: str
+    statement: str
+
+
+@dataclass
+class Migration:
+    missing: List[SchemaItem] = field(default_factory=list)
+    present: List[str] = field(default_factory=list)
+    # Constraints and indexes of the database that are not declared, reported but never dropped
+    undeclared: List[str] = field(default_factory=list)
+
+    @property
+    def up_to_date(self) -> bool:
+        return not self.missing
+
+
+def _cypher_type(constraint: str | GraphDataTypes) -> str | None:
+    """The Cypher type of a type constraint such as GraphDataTypes.STRING or 'STRING | INTEGER', None otherwise"""
+    if isinstance(constraint, GraphDataTypes):
+        return constraint.value if isinstance(constraint.value, str) else constraint.name
+
+    names: list[str] = [name.strip().upper() for name in constraint.split("|")]
+    if not all(name in GraphDataTypes.__members__ for name in names):
+        return None
+    return " | ".join(_cypher_type(GraphDataTypes[name]) for name in names)
+
+
+def _constraint_name(constraint: str | GraphDataTypes) -> str:
+    if isinstance(constraint, GraphDataTypes):
+        return constraint.name.lower()
+    return "_or_".join(name.strip().lower() for name in constraint.split("|"))
+
+
+def constraint_items(constraints: dict, label: str, relationship: bool = False) -> List[SchemaItem]:
+    """
+    One constraint per property and kind, plus one composite key over all 'key' properties
+
+    :param constraints: the properties and their constraints, see IGraphRepository.add_database_constraints
+    :raises ValueError: on an unknown kind of constraint
+    """
+    prefix: str = "relationship" if relationship else "node"
+    pattern: str = f"()-[e:{label}]-()" if relationship else f"(e:{label})"
+    items: List[SchemaItem] = []
+    keys: list[str] = []
+
+    for entity_property, property_constraints in constraints.items():
+        for constraint in property_constraints:
+            kind: str = constraint.upper() if isinstance(constraint, str) else ""
+
+            if kind == "KEY":
+                keys.append(entity_property)
+                continue
+            if kind == "UNIQUE":
+                requirement: str = "IS UNIQUE"
+            elif kind == "REQUIRED":
+                requirement = "IS NOT NULL"
+            elif cypher_type := _cypher_type(constraint):
+                requirement = f"IS TYPED {cypher_type}"
+            else:
+                raise ValueError(f"Unknown constraint '{constraint}' on {label}.{entity_property}")
+
+            name: str = f"{prefix}_{label.lower()}_{entity_property}_is_{_constraint_name(constraint)}"
+            items.append(SchemaItem(name, label, f"CREATE CONSTRAINT {name} IF NOT EXISTS FOR {pattern} "
+                                                 f"REQUIRE e.{entity_property} {requirement}"))
+
+    if keys:
+        name = f"{prefix}_{label.lower()}_keys"
+        properties: str = ", ".join(f"e.{key}" for key in keys)
+        items.append(SchemaItem(name, label, f"CREATE CONSTRAINT {name} IF NOT EXISTS FOR {pattern} "
+                                             f"REQUIRE ({properties}) IS {prefix.upper()} KEY"))
+    return items
+
+
+def index_items(indexes: Iterable[tuple[str, ...]], label: str) -> List[SchemaItem]:
+    items: List[SchemaItem] = []
+    for properties in indexes:
+        name: str = f"node_{label.lower()}_{'_'.join(properties)}"
+        entity_properties: str = ", ".join(f"e.{entity_property}" for entity_property in properties)
+        items.append(SchemaItem(name, label, f"CREATE INDEX {name} IF NOT EXISTS FOR (e:{label}) "
+                                             f"ON ({entity_properties})"))
+    return items
+
+
+def fulltext_items(properties: tuple[str, ...], label: str) -> List[SchemaItem]:
+    if not properties:
+        return []
+    name: str = fulltext_index(label)
+    entity_properties: str = ", ".join(f"e.{entity_property}" for entity_property in properties)
+    return [SchemaItem(name, label, f"CREATE FULLTEXT INDEX {name} IF NOT EXISTS FOR (e:{label}) "
+                                    f"ON EACH [{entity_properties}]")]
+
+
+def schema_items(label: str, constraints: dict) -> List[SchemaItem]:
+    """Every constraint and index declared for a label and its relationships"""
+    items: List[SchemaItem] = constraint_items(constraints.get("node", {}), label)
+    items.extend(index_items(constraints.get("indexes", []), label))
+    items.extend(fulltext_items(tuple(constraints.get("fulltext", ())), label))
+    for relationship, relationship_constraints in constraints.get("relationships", {}).items():
+        items.extend(constraint_items(relationship_constraints, relationship, relationship=True))
+    return items
+
+
+def addressable_items() -> List[SchemaItem]:
+    """The uid constraint of the label shared by every node, backing the label-independent lookups of query_nodes"""
+    return constraint_items({"uid": ("unique", "required", GraphDataTypes.STRING)}, ADDRESSABLE_LABEL)
+
+
+async def read_schema() -> tuple[set[str], set[str]]:
+    """:return: the names of the existing constraints and of the existing indexes"""
+    constraints, meta = await adb.cypher_query("SHOW CONSTRAINTS YIELD name")
+    indexes, meta = await adb.cypher_query("SHOW INDEXES YIELD name, type, owningConstraint "
+                                           "WHERE type <> 'LOOKUP' AND owningConstraint IS NULL RETURN name")
+    return {row[0] for row in constraints}, {row[0] for row in indexes}
+
+
+async def plan(declared: List[SchemaItem]) -> Migration:
+    """Diff the declared schema against the database with one read of its constraints and indexes"""
+    constraints, indexes = await read_schema()
+    existing: set[str] = constraints | indexes
+    declared_names: set[str] = {item.name for item in declared}
+
+    return Migration(missing=[item for item in declared if item.name not in existing],
+                     present=sorted(declared_names & existing),
+                     undeclared=sorted(existing - declared_names))
+
+
+async def _label_addressable() -> None:
+    """Label every node that has a uid as Addressable before its constraint is created"""
+    await adb.cypher_query(f"MATCH (n) WHERE n.uid IS NOT NULL AND NOT n:{ADDRESSABLE_LABEL} "
+                           f"CALL {{ WITH n SET n:{ADDRESSABLE_LABEL} }} IN TRANSACTIONS OF 10000 ROWS")
+
+
+async def apply(migration: Migration, batch_size: int = DEFAULT_BATCH_SIZE,
+                timeout: int = DEFAULT_INDEX_TIMEOUT) -> float:
+    """
+    Create the missing constraints and indexes, 'batch_size' schema statements per transaction, and wait until the
+    new indexes are populated
+
+    :raises RuntimeError: if the indexes are not online within 'timeout' seconds
+    :return: the seconds it took
+    """
+    started: float = time.perf_counter()
+    if migration.up_to_date:
+        return 0.0
+
+    if any(item.label == ADDRESSABLE_LABEL for item in migration.missing):
+        await _label_addressable()
+
+    for batch in chunked(migration.missing, batch_size):
+        async with adb.transaction:
+            for item in batch:
+                await adb.cypher_query(item.statement)
+        logging.info(f"Created {', '.join(item.name for item in batch)}")
+
+    try:
+        await adb.cypher_query("CALL db.awaitIndexes($timeout)", {"timeout": timeout})
+    except Exception as e:
+        raise RuntimeError(f"The new indexes are not online after {timeout}s: {str(e)}") from e
+
+    return time.perf_counter() - started
+
+
+async def migrate(declared: List[SchemaItem], batch_size: int = DEFAULT_BATCH_SIZE,
+                  timeout: int = DEFAULT_INDEX_TIMEOUT) -> Migration:
+    migration: Migration = await plan(declared)
+    seconds: float = await apply(migration, batch_size, timeout)
+    logging.info(f"Schema migration created {len(migration.missing)} and kept {len(migration.present)} constraints "
+                 f"and indexes in {seconds:.1f}s")
+    return migration
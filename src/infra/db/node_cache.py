@@ -0,0 +1,131 @@
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Type
+from uuid import UUID
+
+from neomodel import AsyncStructuredNode
+
+from src.infra.db.identity_map import NodeClass
+
+DEFAULT_TTL: float = 60.0
+
+
+@dataclass
+class _Snapshot:
+    node_class: Type[AsyncStructuredNode]
+    element_id: str
+    properties: dict[str, Any]
+    expires_at: float
+
+
+@dataclass(frozen=True)
+class NodeCacheStatistics:
+    size: int
+    max_size: int
+    ttl: float
+    hits: int
+    misses: int
+    expirations: int
+    evictions: int
+    invalidations: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups: int = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class NodeCache:
+    """
+    Process-wide LRU of nodes shared by all requests, disabled unless 'max_size' is positive.
+
+    Only snapshots of the properties are kept and every hit builds a new instance, so a request modifying its node
+    never affects another. Entries are keyed by uid and only returned for their own label. They expire after 'ttl'
+    seconds since writes of other workers are not seen.
+    """
+
+    def __init__(self, max_size: int = 0, ttl: float = DEFAULT_TTL):
+        self.max_size: int = max_size
+        self.ttl: float = ttl
+        self.__entries: OrderedDict[str, _Snapshot] = OrderedDict()
+        self.__hits: int = 0
+        self.__misses: int = 0
+        self.__expirations: int = 0
+        self.__evictions: int = 0
+        self.__invalidations: int = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0 and self.ttl > 0
+
+    def get(self, node_id: UUID | str, node_class: Type[NodeClass] = AsyncStructuredNode) -> NodeClass | None:
+        """
+        :param node_class: only return the node if it is of this class or a subclass
+        """
+        if not self.enabled:
+            return None
+
+        key: str = node_id.hex if isinstance(node_id, UUID) else node_id
+        snapshot: _Snapshot | None = self.__entries.get(key)
+
+        if snapshot is None or not issubclass(snapshot.node_class, node_class):
+            self.__misses += 1
+            return None
+
+        if snapshot.expires_at <= time.monotonic():
+            del self.__entries[key]
+            self.__expirations += 1
+            self.__misses += 1
+            return None
+
+        self.__entries.move_to_end(key)
+        self.__hits += 1
+
+        node: NodeClass = snapshot.node_class(**{name: list(value) if isinstance(value, list) else value
+                                                 for name, value in snapshot.properties.items()})
+        node.element_id_property = snapshot.element_id
+        return node
+
+    def put(self, node: AsyncStructuredNode) -> None:
+        """Cache a node read from or just written to the database"""
+        if not self.enabled or not node.uid or not node.element_id:
+            return
+
+        node_class: Type[AsyncStructuredNode] = type(node)
+        properties: dict[str, Any] = {
+            name: list(value) if isinstance(value, list) else value
+            for name in node_class.defined_properties(aliases=False, rels=False)
+            if (value := getattr(node, name, None)) is not None
+        }
+        self.__entries[node.uid] = _Snapshot(node_class=node_class, element_id=node.element_id, properties=properties,
+                                             expires_at=time.monotonic() + self.ttl)
+        self.__entries.move_to_end(node.uid)
+
+        while len(self.__entries) > self.max_size:
+            self.__entries.popitem(last=False)
+            self.__evictions += 1
+
+    def discard(self, *node_ids: UUID | str) -> None:
+        for node_id in node_ids:
+            if self.__entries.pop(node_id.hex if isinstance(node_id, UUID) else node_id, None) is not None:
+                self.__invalidations += 1
+
+    def clear(self) -> None:
+        self.__entries.clear()
+
+    def statistics(self) -> NodeCacheStatistics:
+        return NodeCacheStatistics(size=len(self.__entries), max_size=self.max_size, ttl=self.ttl, hits=self.__hits,
+                                   misses=self.__misses, expirations=self.__expirations, evictions=self.__evictions,
+                                   invalidations=self.__invalidations)
+
+
+node_cache: NodeCache = NodeCache(
+    max_size=int(os.getenv("NODE_CACHE_SIZE") or 0),
+    ttl=float(os.getenv("NODE_CACHE_TTL") or DEFAULT_TTL),
+)
+
+
+def get_node_cache() -> NodeCache:
+    return node_cache
@@ -0,0 +1,40 @@
+from typing import Type, Any
+
+from neomodel import AsyncStructuredNode
+
+
+class NodeRecord:
+    """
+    Read-only stand-in for a neomodel node that only carries the properties projected by a query.
+
+    Properties of the node class that were not projected read as None; relationships are not available and have to be
+    resolved through the RelationshipLoader.
+    """
+
+    def __init__(self, node_class: Type[AsyncStructuredNode], properties: dict[str, Any]):
+        self.node_class: Type[AsyncStructuredNode] = node_class
+        self.__dict__.update(properties)
+
+    @classmethod
+    def from_projection(cls, node_class: Type[AsyncStructuredNode], projection: dict[str, Any]) -> "NodeRecord":
+        """Inflate the raw values of a Cypher map projection with the property definitions of the node class"""
+        properties: dict = node_class.defined_properties(aliases=False, rels=False)
+        return cls(node_class, {
+            name: properties[name].inflate(value) if value is not None else None for name, value in projection.items()
+        })
+
+    def __getattr__(self, name: str) -> None:
+        # Only invoked for attributes that were not projected
+        node_class: Type[AsyncStructuredNode] | None = self.__dict__.get("node_class")
+        if node_class and name in node_class.defined_properties(aliases=False, rels=False):
+            return None
+        raise AttributeError(f"Node record has no attribute '{name}'")
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, NodeRecord) and other.node_class is self.node_class and other.uid == self.uid
+
+    def __hash__(self) -> int:
+        return hash((self.node_class, self.uid))
+
+    def __repr__(self) -> str:
+        return f"<{self.node_class.__name__}Record: {self.__dict__}>"
@@ -0,0 +1,90 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from dataclasses import dataclass
+
+from neomodel import AsyncStructuredNode
+
+from src.infra.db.query_planner import PlannedNodes
+
+MAX_PAGE_SIZE: int = 100
+
+
+@dataclass(frozen=True)
+class Cursor:
+    """Opaque keyset cursor on (created_at, uid)"""
+    created_at: float
+    uid: str
+
+    def encode(self) -> str:
+        return urlsafe_b64encode(f"{self.created_at!r}:{self.uid}".encode()).decode()
+
+    @classmethod
+    def decode(cls, cursor: str) -> "Cursor":
+        try:
+            created_at, uid = urlsafe_b64decode(cursor.encode()).decode().split(":", 1)
+            return cls(created_at=float(created_at), uid=uid)
+        except ValueError as e:
+            raise ValueError(f"Invalid cursor '{cursor}'") from e
+
+    @classmethod
+    def of(cls, node: AsyncStructuredNode) -> "Cursor":
+        return cls(created_at=node.created_at.timestamp() if node.created_at else 0.0, uid=node.uid)
+
+
+@dataclass(frozen=True)
+class RankCursor:
+    """Opaque cursor on the position in a ranked result, where no property of the nodes defines the order"""
+    position: int
+
+    def encode(self) -> str:
+        return urlsafe_b64encode(f"rank:{self.position}".encode()).decode()
+
+    @classmethod
+    def decode(cls, cursor: str) -> "RankCursor":
+        try:
+            prefix, position = urlsafe_b64decode(cursor.encode()).decode().split(":", 1)
+            if prefix != "rank" or int(position) < 0:
+                raise ValueError(cursor)
+            return cls(position=int(position))
+        except ValueError as e:
+            raise ValueError(f"Invalid cursor '{cursor}'") from e
+
+
+@dataclass
+class Page:
+    planned: PlannedNodes
+    has_next_page: bool
+
+
+@dataclass
+class PageQuery:
+    """
+    Keyset pagination on (created_at, uid) of the root node 'n', backed by a composite index on both properties
+
+    :param first: the number of nodes to return
+    :param after: the cursor of the last node of the previous page
+    """
+    first: int = 20
+    after: str | None = None
+
+    def compile(self, conditions: list[str], params: dict) -> tuple[str, dict, str, int]:
+        """
+        :param conditions: additional boolean Cypher expressions on 'n'
+        :param params: the parameters referenced by the conditions
+        :raises ValueError
+        :return: the WHERE clause, its parameters, the ORDER BY clause and the LIMIT
+        """
+        if not 0 < self.first <= MAX_PAGE_SIZE:
+            raise ValueError(f"'first' must be between 1 and {MAX_PAGE_SIZE}")
+
+        conditions: list[str] = list(conditions)
+        params: dict = dict(params)
+
+        if self.after:
+            cursor: Cursor = Cursor.decode(self.after)
+            conditions.append("(n.created_at > $after_created_at OR "
+                              "(n.created_at = $after_created_at AND n.uid > $after_uid))")
+            params.update({"after_created_at": cursor.created_at, "after_uid": cursor.uid})
+
+        where: str = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        return where, params, "ORDER BY n.created_at, n.uid", self.first + 1
+
@@ -0,0 +1,178 @@
+import re
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Iterator, List, Type
+
+from neomodel import adb, AsyncStructuredNode
+from strawberry import Info
+from strawberry.types.nodes import Selection, SelectedField
+
+from src.infra.db.node_record import NodeRecord
+from src.infra.db.relationship_loader import build_relationship_pattern
+
+
+@dataclass
+class PlannedNodes:
+    """
+    Result of a planned query: the root records and every related record that was requested in the selection set, keyed
+    by (node class, relationship, parent uid)
+    """
+    nodes: List[NodeRecord]
+    prefetched: dict[tuple[Type[AsyncStructuredNode], str, str], List[NodeRecord]] = field(default_factory=dict)
+
+
+def _selected_fields(selections: List[Selection]) -> List[SelectedField]:
+    """Flatten fragment spreads and inline fragments into the fields they select"""
+    selected_fields: List[SelectedField] = []
+    for selection in selections:
+        if isinstance(selection, SelectedField):
+            selected_fields.append(selection)
+        else:
+            selected_fields.extend(_selected_fields(selection.selections))
+    return selected_fields
+
+
+def _derived_relationships(node_class: Type[AsyncStructuredNode]) -> dict[str, tuple[str, tuple[str, ...]]]:
+    """
+    Fields a node class declares as 'derived_relationships': resolved from a relationship and the listed properties of
+    its nodes, e.g. {"accepted_answers": ("answered_by", ("preferred_label", "acceptability_score"))}
+    """
+    return getattr(node_class, "derived_relationships", {})
+
+
+@dataclass
+class _PlanNode:
+    node_class: Type[AsyncStructuredNode]
+    # uid and created_at are always projected, they identify the node and back the pagination cursor
+    properties: set[str] = field(default_factory=lambda: {"uid", "created_at"})
+    relationships: dict[str, "_PlanNode"] = field(default_factory=dict)
+
+
+class QueryPlanner:
+    """
+    Compile a GraphQL selection set into a single Cypher query.
+
+    Selected fields that match a neomodel relationship of the current node class are turned into nested pattern
+    comprehensions; every other field with a sub-selection (e.g. 'relationships' or 'meta') is treated as a view on the
+    same node. Fields declared in 'derived_relationships' are planned as their relationship with the properties they
+    need. The root node is bound to the Cypher variable 'n'.
+
+    Only the selected properties are projected and returned as NodeRecords, nodes are never fully inflated. Private
+    properties such as password hashes are not part of any selection and are therefore never read.
+    """
+
+    def __init__(self, node_class: Type[AsyncStructuredNode]):
+        self.node_class: Type[AsyncStructuredNode] = node_class
+
+    @staticmethod
+    def selections(info: Info, *path: str) -> List[Selection]:
+        """
+        Return the sub-selections of the field that is currently being resolved, optionally descending into nested
+        fields first, e.g. selections(info, "edges", "node") for a connection
+        """
+        selections: List[Selection] = [selection for selected_field in info.selected_fields
+                                       for selection in selected_field.selections]
+        for name in path:
+            selections = [child for selected_field in _selected_fields(selections) if selected_field.name == name
+                          for child in selected_field.selections]
+        return selections
+
+    async def fetch(self, selections: List[Selection], where: str = "", params: dict | None = None,
+                    order_by: str = "", limit: int | None = None) -> PlannedNodes:
+        """
+        Run the compiled query in one round trip
+
+        :param selections: the GraphQL selections below the root node
+        :param where: an optional WHERE clause on the root node 'n'
+        :param params: the parameters referenced by the WHERE clause
+        :param order_by: an optional ORDER BY clause on the root node 'n'
+        :param limit: the maximum number of root nodes
+        :return: PlannedNodes
+        """
+        plan: _PlanNode = self.__plan(self.node_class, selections)
+        self.__merge(plan)
+        params: dict = dict(params or {})
+
+        query = f"MATCH (n:{self.node_class.__label__}) {where} WITH n {order_by} "
+        if limit is not None:
+            query += "LIMIT $limit "
+            params["limit"] = limit
+        query += f"RETURN {self.__compile(plan, 'n', 0)} {order_by}"
+
+        results, meta = await adb.cypher_query(query, params)
+
+        planned: PlannedNodes = PlannedNodes(nodes=[])
+        for (record,) in results:
+            planned.nodes.append(self.__unpack(plan, record, planned.prefetched))
+        return planned
+
+    def __plan(self, node_class: Type[AsyncStructuredNode], selections: List[Selection],
+               plan: _PlanNode | None = None) -> _PlanNode:
+        plan: _PlanNode = plan or _PlanNode(node_class=node_class)
+        relationship_names: set[str] = {name for name, _ in node_class.__all_relationships__}
+        property_names: set[str] = set(node_class.defined_properties(aliases=False, rels=False))
+        derived_relationships: dict[str, tuple[str, tuple[str, ...]]] = _derived_relationships(node_class)
+
+        for selection in _selected_fields(selections):
+            name: str = self.__to_snake_case(selection.name)
+            required_properties: tuple[str, ...] = ()
+            if name in derived_relationships:
+                name, required_properties = derived_relationships[name]
+            if name in relationship_names:
+                if name not in plan.relationships:
+                    _, target_class = build_relationship_pattern(node_class, name)
+                    plan.relationships[name] = _PlanNode(node_class=target_class)
+                related_plan: _PlanNode = plan.relationships[name]
+                related_plan.properties.update(required_properties)
+                self.__plan(related_plan.node_class, selection.selections, related_plan)
+            elif selection.selections:
+                self.__plan(node_class, selection.selections, plan)
+            elif name in property_names:
+                plan.properties.add(name)
+
+        return plan
+
+    def __merge(self, plan: _PlanNode) -> None:
+        """
+        Project the same properties on every path that follows a relationship of a node class. Prefetched records are
+        keyed by (node class, relationship, parent uid), so a relationship selected on two paths would otherwise resolve
+        to the records of whichever path is primed first, without the properties only the other path selected.
+        """
+        related_plans: List[tuple[_PlanNode, str, _PlanNode]] = list(self.__related_plans(plan))
+        properties: dict[tuple[Type[AsyncStructuredNode], str], set[str]] = defaultdict(set)
+
+        for parent_plan, name, related_plan in related_plans:
+            properties[(parent_plan.node_class, name)] |= related_plan.properties
+        for parent_plan, name, related_plan in related_plans:
+            related_plan.properties = properties[(parent_plan.node_class, name)]
+
+    def __related_plans(self, plan: _PlanNode) -> Iterator[tuple[_PlanNode, str, _PlanNode]]:
+        for name, related_plan in plan.relationships.items():
+            yield plan, name, related_plan
+            yield from self.__related_plans(related_plan)
+
+    def __compile(self, plan: _PlanNode, variable: str, depth: int) -> str:
+        relationships: List[str] = []
+
+        for name, related_plan in plan.relationships.items():
+            target: str = f"n{depth + 1}"
+            pattern, _ = build_relationship_pattern(plan.node_class, name, source=variable, target=target)
+            relationships.append(f"{name}: [{pattern} | {self.__compile(related_plan, target, depth + 1)}]")
+
+        properties: str = ", ".join(f".{name}" for name in sorted(plan.properties))
+        return f"{{node: {variable} {{{properties}}}, relationships: {{{', '.join(relationships)}}}}}"
+
+    def __unpack(self, plan: _PlanNode, record: dict, prefetched: dict) -> NodeRecord:
+        node: NodeRecord = NodeRecord.from_projection(plan.node_class, record["node"])
+
+        for name, related_plan in plan.relationships.items():
+            prefetched[(plan.node_class, name, node.uid)] = [
+                self.__unpack(related_plan, related_record, prefetched)
+                for related_record in record["relationships"][name]
+            ]
+
+        return node
+
+    @staticmethod
+    def __to_snake_case(name: str) -> str:
+        return re.sub(r"(?<!^)(?=[A-Z])", "_", name).lower()
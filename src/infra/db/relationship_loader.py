@@ -0,0 +1,91 @@
+from functools import partial
+from typing import List, Type, TYPE_CHECKING
+
+from neomodel import adb, AsyncStructuredNode
+from neomodel.util import OUTGOING, INCOMING
+from strawberry.dataloader import DataLoader
+
+from src.infra.db.node_record import NodeRecord
+
+if TYPE_CHECKING:
+    from src.infra.db.query_planner import PlannedNodes
+
+
+def build_relationship_pattern(node_class: Type[AsyncStructuredNode], relationship: str, source: str = "n",
+                               target: str = "m", labelled: bool = True) -> tuple[str, Type[AsyncStructuredNode]]:
+    """
+    Build the Cypher pattern of a neomodel relationship definition, e.g. '(n)-[:ATTACKS]->(m:Claim)'
+
+    :param node_class: the neomodel class that declares the relationship
+    :param relationship: the attribute name of the relationship on the node class
+    :param source: the Cypher variable of the source node
+    :param target: the Cypher variable of the target node
+    :param labelled: label the target node, must be disabled if the target variable is already bound (e.g. in MERGE)
+    :raises AttributeError
+    :return: the pattern and the neomodel class of the target node
+    """
+    definition = getattr(node_class, relationship)
+    definition.lookup_node_class()
+
+    relation_type: str = definition.definition["relation_type"]
+    direction: int = definition.definition["direction"]
+    target_class: Type[AsyncStructuredNode] = definition.definition["node_class"]
+
+    if direction == OUTGOING:
+        edge = f"-[:{relation_type}]->"
+    elif direction == INCOMING:
+        edge = f"<-[:{relation_type}]-"
+    else:
+        edge = f"-[:{relation_type}]-"
+
+    target_node: str = f"{target}:{target_class.__label__}" if labelled else target
+    return f"({source}){edge}({target_node})", target_class
+
+
+class RelationshipLoader:
+    """
+    Request-scoped batching of relationship traversals.
+
+    One DataLoader is kept per (node label, relationship). Every parent uid requested during the same tick of the event
+    loop is resolved with a single UNWIND query instead of one query per parent node.
+    """
+
+    def __init__(self):
+        self.__loaders: dict[tuple[str, str], DataLoader] = {}
+
+    async def load(self, node: AsyncStructuredNode | NodeRecord, relationship: str) -> List[AsyncStructuredNode]:
+        node_class: Type[AsyncStructuredNode] = node.node_class if isinstance(node, NodeRecord) else type(node)
+        return await self.__get_loader(node_class, relationship).load(node.uid)
+
+    async def load_single(self, node: AsyncStructuredNode | NodeRecord,
+                          relationship: str) -> AsyncStructuredNode | None:
+        related_nodes: List[AsyncStructuredNode] = await self.load(node, relationship)
+        return related_nodes[0] if related_nodes else None
+
+    def prime(self, planned: "PlannedNodes") -> List[NodeRecord]:
+        """Seed the loaders with the relationships prefetched by the query planner and return the planned root nodes"""
+        for (node_class, relationship, uid), related_nodes in planned.prefetched.items():
+            self.__get_loader(node_class, relationship).prime(uid, related_nodes)
+        return planned.nodes
+
+    def __get_loader(self, node_class: Type[AsyncStructuredNode], relationship: str) -> DataLoader:
+        key: tuple[str, str] = (node_class.__label__, relationship)
+
+        if key not in self.__loaders:
+            pattern, target_class = build_relationship_pattern(node_class, relationship)
+            query = (f"UNWIND $uids AS uid "
+                     f"MATCH (n:{node_class.__label__} {{uid: uid}}) "
+                     f"OPTIONAL MATCH {pattern} "
+                     f"RETURN uid, collect(m)")
+            self.__loaders[key] = DataLoader(load_fn=partial(self.__batch_load, query, target_class))
+
+        return self.__loaders[key]
+
+    @staticmethod
+    async def __batch_load(query: str, target_class: Type[AsyncStructuredNode],
+                           uids: List[str]) -> List[List[AsyncStructuredNode]]:
+        results, meta = await adb.cypher_query(query, {"uids": list(uids)})
+        related_nodes: dict[str, List[AsyncStructuredNode]] = {
+            uid: [target_class.inflate(node) for node in nodes] for uid, nodes in results
+        }
+        return [related_nodes.get(uid, []) for uid in uids]
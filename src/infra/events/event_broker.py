@@ -0,0 +1,83 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
+
+DEFAULT_QUEUE_SIZE: int = 100
+
+
+class EventStream:
+    """
+    The bounded queue of a single subscriber.
+
+    Publishing never waits: when the queue is full the oldest event is dropped, so a slow consumer only loses its own
+    backlog and never holds up the publisher or the other subscribers.
+    """
+
+    def __init__(self, topic: str, max_size: int):
+        self.topic: str = topic
+        self.dropped: int = 0
+        self.__queue: asyncio.Queue = asyncio.Queue(maxsize=max_size)
+
+    def offer(self, event: Any) -> None:
+        if self.__queue.full():
+            self.__queue.get_nowait()
+            self.dropped += 1
+            if self.dropped == 1:
+                logging.warning(f"Subscriber of '{self.topic}' is too slow, dropping its oldest events")
+        self.__queue.put_nowait(event)
+
+    def __aiter__(self) -> "EventStream":
+        return self
+
+    async def __anext__(self) -> Any:
+        return await self.__queue.get()
+
+
+class EventBroker:
+    """
+    In-process publish/subscribe of events by topic.
+
+    Events are only delivered to subscribers of the same process, the API has to run as a single worker for every
+    subscriber to see every event.
+    """
+
+    def __init__(self, queue_size: int = DEFAULT_QUEUE_SIZE):
+        self.queue_size: int = queue_size
+        self.__streams: dict[str, set[EventStream]] = {}
+
+    def publish(self, topic: str, event: Any) -> int:
+        """
+        Hand an event to every subscriber of the topic without waiting for any of them
+
+        :return: the number of subscribers
+        """
+        streams: set[EventStream] = self.__streams.get(topic, set())
+        for stream in streams:
+            stream.offer(event)
+        return len(streams)
+
+    @asynccontextmanager
+    async def subscribe(self, topic: str) -> AsyncIterator[EventStream]:
+        """Receive the events published to a topic until the context is left, e.g. when the client disconnects"""
+        stream: EventStream = EventStream(topic, self.queue_size)
+        self.__streams.setdefault(topic, set()).add(stream)
+        try:
+            yield stream
+        finally:
+            self.__streams[topic].discard(stream)
+            if not self.__streams[topic]:
+                del self.__streams[topic]
+
+    def subscriber_count(self, topic: str | None = None) -> int:
+        """:param topic: count the subscribers of one topic instead of all"""
+        if topic is None:
+            return sum(len(streams) for streams in self.__streams.values())
+        return len(self.__streams.get(topic, ()))
+
+
+event_broker: EventBroker = EventBroker()
+
+
+def get_event_broker() -> EventBroker:
+    return event_broker